@@ -0,0 +1,174 @@
+"""Benchmark fixtures and baseline handling.
+
+Every benchmark measures wall time and peak memory of its hot path and compares
+them against `baselines.json`. Regressions beyond the tolerance fail the test.
+Times are stored relative to a fixed calibration workload measured in the same
+session, so the baselines stay comparable across machines (and when running
+instrumented with `--codspeed`).
+
+    # run the default sizes (1k and 10k nodes)
+    pytest benchmarks/
+    # include the 100k node trees
+    pytest benchmarks/ --bench-sizes 1000,10000,100000
+    # record new baselines after an intended change
+    pytest benchmarks/ --update-baselines
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import pathlib
+import platform
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+BASELINE_FILE = pathlib.Path(__file__).parent / "baselines.json"
+DEFAULT_SIZES = "1000,10000"
+DEFAULT_TIME_TOLERANCE = 2.0
+MEMORY_TOLERANCE = 1.2
+CALIBRATION_RUNS = 5
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("mknodes-benchmarks")
+    group.addoption(
+        "--bench-sizes",
+        default=DEFAULT_SIZES,
+        help="Comma-separated node counts of the synthetic trees.",
+    )
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="Write the measured values to baselines.json instead of comparing.",
+    )
+    group.addoption(
+        "--bench-tolerance",
+        type=float,
+        default=DEFAULT_TIME_TOLERANCE,
+        help="Allowed slowdown factor compared to the baseline (relative to calibration).",
+    )
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "node_count" in metafunc.fixturenames:
+        sizes = [int(i) for i in metafunc.config.getoption("bench_sizes").split(",")]
+        metafunc.parametrize("node_count", sizes, scope="module")
+
+
+@dataclasses.dataclass
+class Measurement:
+    """Wall time and peak memory of a benchmarked operation."""
+
+    time: float = 0.0
+    """Wall time in seconds (without memory tracing)."""
+    peak_memory: int = 0
+    """Peak of newly allocated memory in bytes."""
+
+
+class Baselines:
+    """Compares measurements against stored baselines."""
+
+    def __init__(self, config: pytest.Config, calibration: float) -> None:
+        self.update = config.getoption("update_baselines")
+        self.tolerance = config.getoption("bench_tolerance")
+        self.calibration = calibration
+        """Wall time of the calibration workload in seconds."""
+        data = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        self.results: dict[str, dict[str, Any]] = data.get("results", {})
+
+    def check(self, name: str, measurement: Measurement) -> None:
+        relative_time = measurement.time / self.calibration
+        if self.update:
+            self.results[name] = {
+                "relative_time": round(relative_time, 3),
+                "peak_memory": measurement.peak_memory,
+            }
+            return
+        if (baseline := self.results.get(name)) is None:
+            pytest.fail(f"No baseline for {name!r}, run with --update-baselines")
+        max_time = baseline["relative_time"] * self.tolerance
+        max_memory = baseline["peak_memory"] * MEMORY_TOLERANCE
+        assert relative_time <= max_time, (
+            f"{name}: {relative_time:.2f}x calibration time exceeds "
+            f"baseline {baseline['relative_time']:.2f}x"
+        )
+        assert measurement.peak_memory <= max_memory, (
+            f"{name}: peak memory {measurement.peak_memory} B exceeds "
+            f"baseline {baseline['peak_memory']} B"
+        )
+
+    def save(self) -> None:
+        meta = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "calibration": round(self.calibration, 4),
+        }
+        data = {"meta": meta, "results": dict(sorted(self.results.items()))}
+        BASELINE_FILE.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def calibrate() -> float:
+    """Return the fastest wall time of a fixed pure-Python workload in seconds."""
+
+    def workload() -> None:
+        items = {f"key-{i}": [str(i)] * 3 for i in range(100_000)}
+        sorted(items.items(), key=lambda kv: kv[1][0])
+
+    timings = []
+    for _ in range(CALIBRATION_RUNS):
+        start = time.perf_counter()
+        workload()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure[T](fn: Callable[[], T]) -> tuple[T, Measurement]:
+    """Measure wall time and peak memory of given function.
+
+    The function gets called twice: once with tracemalloc running (which also
+    warms up caches and imports) and once for the wall time, since tracing
+    would distort the timing.
+
+    Args:
+        fn: Function to measure.
+    """
+    measurement = Measurement()
+    tracemalloc.start()
+    try:
+        fn()
+        measurement.peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    start = time.perf_counter()
+    result = fn()
+    measurement.time = time.perf_counter() - start
+    return result, measurement
+
+
+@pytest.fixture(scope="session")
+def baselines(request: pytest.FixtureRequest) -> Iterator[Baselines]:
+    baselines = Baselines(request.config, calibrate())
+    yield baselines
+    if baselines.update:
+        baselines.save()
+
+
+@pytest.fixture
+def measured(baselines: Baselines, request: pytest.FixtureRequest):
+    """Measure given function and check it against the baseline of the test."""
+
+    def run[T](fn: Callable[[], T]) -> T:
+        result, measurement = measure(fn)
+        baselines.check(request.node.name, measurement)
+        return result
+
+    return run
@@ -1,8 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+from typing import TYPE_CHECKING
+
 import pytest
 
 import mknodes as mk
+from mknodes.build import DocBuilder, MarkdownExporter
+
+from . import trees
+
+
+if TYPE_CHECKING:
+    from mknodes.build import BuildOutput
+    from mknodes.utils import resources
+
+
+@pytest.fixture(scope="module")
+def tree(node_count: int) -> mk.MkNav:
+    return trees.build_tree(node_count)
+
+
+@pytest.fixture(scope="module")
+def build_output(tree: mk.MkNav) -> BuildOutput:
+    return asyncio.run(DocBuilder().build(tree))
 
 
 @pytest.mark.benchmark
@@ -12,7 +33,41 @@ def test_build_duration():
     nav = mk.MkNav()
     bld = root.Build()
     bld.on_root(nav)
-    # for node in proj.root.descendants:
-    #     if not isinstance(node, mk.MkPage):
-    #         continue
-    #     node.to_markdown()
+
+
+@pytest.mark.benchmark
+def test_construction(node_count: int, measured):
+    tree = measured(lambda: trees.build_tree(node_count))
+    assert trees.count_nodes(tree) >= node_count
+
+
+@pytest.mark.benchmark
+def test_to_markdown(tree: mk.MkNav, measured):
+    async def render() -> list[str]:
+        return [await page.to_markdown() for page in trees.get_pages(tree)]
+
+    results = measured(lambda: asyncio.run(render()))
+    assert all(results)
+
+
+@pytest.mark.benchmark
+def test_get_resources(tree: mk.MkNav, measured):
+    async def collect() -> list[resources.Resources]:
+        return [await page.get_resources() for page in trees.get_pages(tree)]
+
+    results = measured(lambda: asyncio.run(collect()))
+    assert all(r.markdown_extensions for r in results)
+
+
+@pytest.mark.benchmark
+def test_docbuilder_build(tree: mk.MkNav, measured):
+    output = measured(lambda: asyncio.run(DocBuilder().build(tree)))
+    assert output.page_count == len(trees.get_pages(tree))
+
+
+@pytest.mark.benchmark
+def test_markdown_export(build_output: BuildOutput, tmp_path, measured):
+    # every run exports into a fresh folder, unchanged files would get skipped otherwise
+    folders = iter([tmp_path / "traced", tmp_path / "timed"])
+    measured(lambda: asyncio.run(MarkdownExporter().export(build_output, next(folders))))
+    assert (tmp_path / "timed" / "SUMMARY.md").exists()
@@ -0,0 +1,71 @@
+"""Synthetic node trees for the benchmark suite."""
+
+from __future__ import annotations
+
+import mknodes as mk
+
+
+PAGES_PER_SECTION = 50
+
+
+def build_tree(node_count: int) -> mk.MkNav:
+    """Build a nav with mixed node types containing at least `node_count` nodes.
+
+    Pages are grouped into sections of `PAGES_PER_SECTION` pages. Every page
+    contains the same mix of leaf nodes, containers and tables, so the amount of
+    work per node stays the same across tree sizes.
+
+    Args:
+        node_count: Minimum number of nodes the tree should contain.
+    """
+    root = mk.MkNav()
+    section = root
+    count = 1
+    i = 0
+    while count < node_count:
+        if i % PAGES_PER_SECTION == 0:
+            section = root.add_nav(f"Section {i // PAGES_PER_SECTION}")
+            count += 1
+        page = section.add_page(f"Page {i}")
+        fill_page(page, i)
+        count += count_nodes(page)
+        i += 1
+    return root
+
+
+def fill_page(page: mk.MkPage, i: int) -> None:
+    """Add the benchmark node mix to given page.
+
+    Args:
+        page: Page to fill.
+        i: Index of the page, used to make the content unique.
+    """
+    page += mk.MkHeader(f"Header {i}", level=2)
+    page += mk.MkText(f"Some **markdown** text for page {i}.\n\nWith a second paragraph.")
+    page += mk.MkAdmonition(f"Admonition content {i}", typ="warning", title="Note")
+    page += mk.MkCode(f"def function_{i}():\n    return {i}\n", language="python")
+    page += mk.MkList([f"Item {j}" for j in range(5)])
+    data = {"Name": [f"Row {j}" for j in range(4)], "Value": [str(i * j) for j in range(4)]}
+    page += mk.MkTable(data)
+    page += mk.MkTabbed({"Tab 1": f"First tab {i}", "Tab 2": mk.MkText(f"Second tab {i}")})
+    page += mk.MkProgressBar(i % 100)
+
+
+def count_nodes(node: mk.MkNode) -> int:
+    """Return the number of nodes in the subtree of given node (including itself).
+
+    Args:
+        node: Root of the subtree.
+    """
+    return 1 + sum(count_nodes(child) for child in node.get_children())
+
+
+def get_pages(node: mk.MkNode) -> list[mk.MkPage]:
+    """Return all pages in the subtree of given node.
+
+    Args:
+        node: Root of the subtree.
+    """
+    if isinstance(node, mk.MkPage):
+        return [node]
+    return [page for child in node.get_children() for page in get_pages(child)]
@@ -99,11 +99,11 @@ class MkAdmonition(mkcontainer.MkContainer):
         md = f"{self.title_line}\n{indented}\n{annotations}"
 
         # Aggregate resources
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child_content in child_contents:
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     async def to_md_unprocessed(self) -> str:
         content = await self.get_content()
@@ -55,11 +55,11 @@ class MkAnnotation(mkcontainer.MkContainer):
         md = f"{prefix:<4}{filters.do_indent(item_str)}\n"
 
         # Aggregate resources
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child_content in child_contents:
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     async def to_md_unprocessed(self) -> str:
         content = await self.get_content()
@@ -149,6 +149,7 @@ class MkAnnotations(mkcontainer.MkContainer):
             items[pos] = node
         else:
             items.append(node)
+        self._notify_changed()
 
     async def get_content(self) -> resources.NodeContent:
         """Single-pass: get content from sorted annotations and resources."""
@@ -175,11 +176,11 @@ class MkAnnotations(mkcontainer.MkContainer):
         md = "".join(child_markdowns)
 
         # Aggregate resources
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child_content in child_contents:
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     async def to_md_unprocessed(self) -> str:
         content = await self.get_content()
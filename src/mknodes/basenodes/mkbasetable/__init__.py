@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any, Self
 
@@ -104,6 +105,7 @@ class MkBaseTable(mkcontainer.MkContainer):
             case _:
                 for i, key in enumerate(self.data.keys()):
                     self.data[key].append(self.to_child_node(row[i]))
+        self._notify_changed()
 
     def iter_rows(self) -> Iterator[list[mk.MkNode]]:
         data = self.data  # property
@@ -116,14 +118,32 @@ class MkBaseTable(mkcontainer.MkContainer):
         ls = [{k: v(item) for k, v in columns.items()} for item in items]
         return cls(ls)
 
-    def width_for_column(self, column: str | int) -> int:
+    async def render_columns(self) -> dict[str, list[str]]:
+        """Render all cells concurrently and return them grouped by column.
+
+        Every cell gets rendered exactly once.
+        """
+        data = self.data  # property
+        cells = [cell for col in data.values() for cell in col]
+        rendered = await asyncio.gather(*(cell.to_markdown() for cell in cells))
+        result: dict[str, list[str]] = {}
+        start = 0
+        for col_name, col in data.items():
+            result[col_name] = list(rendered[start : start + len(col)])
+            start += len(col)
+        return result
+
+    def width_for_column(self, column: str | int, cells: Sequence[str] | None = None) -> int:
         """Returns the minimum width needed for given column.
 
         Args:
             column: Name or index of the column
+            cells: Already rendered cells of the column (see `render_columns`).
+                   If None, the cells get rendered synchronously.
         """
         data = self.data  # property
         col_name = list(data.keys())[column] if isinstance(column, int) else column
-        col = data[col_name]
-        max_len = max((len(str(i).replace("\n", "<br>")) for i in col), default=0)
+        if cells is None:
+            cells = [str(i) for i in data[col_name]]
+        max_len = max((len(i.replace("\n", "<br>")) for i in cells), default=0)
         return max(len(col_name), max_len)
@@ -57,11 +57,11 @@ class MkContainerBase(mknode.MkNode):
         md = self.block_separator.join(child_markdowns)
 
         # Aggregate resources: own + all children
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child_content in child_contents:
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     @abstractmethod
     def get_items(self) -> list[mknode.MkNode]:
@@ -86,6 +86,7 @@ class MkContainerBase(mknode.MkNode):
         node = self.to_child_node(other)
         items = self.get_items()
         items.append(node)
+        self._notify_changed()
 
 
 class MkContainer(MkContainerBase):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Mapping
 import textwrap
 
@@ -44,7 +45,7 @@ class MkFootNote(mkcontainer.MkContainer):
         items = self.get_items()
 
         # Collect content from children
-        child_contents = [await item.get_content() for item in items]
+        child_contents = await asyncio.gather(*(item.get_content() for item in items))
 
         # Build markdown with footnote formatting
         child_markdowns = []
@@ -59,11 +60,11 @@ class MkFootNote(mkcontainer.MkContainer):
         md = f"[^{self.num}]:\n{indented}\n"
 
         # Aggregate resources
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child_content in child_contents:
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     async def to_md_unprocessed(self) -> str:
         content = await self.get_content()
@@ -151,6 +152,7 @@ class MkFootNotes(mkcontainer.MkContainer):
             items[pos] = node
         else:
             items.append(node)
+        self._notify_changed()
 
     async def get_content(self) -> resources.NodeContent:
         """Single-pass: get content from sorted footnotes and resources."""
@@ -164,7 +166,7 @@ class MkFootNotes(mkcontainer.MkContainer):
         items = sorted(items, key=lambda x: x.num)
 
         # Collect content from children
-        child_contents = [await item.get_content() for item in items]
+        child_contents = await asyncio.gather(*(item.get_content() for item in items))
 
         # Build markdown - children already formatted
         child_markdowns = []
@@ -177,11 +179,11 @@ class MkFootNotes(mkcontainer.MkContainer):
         md = "".join(child_markdowns)
 
         # Aggregate resources
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child_content in child_contents:
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     async def to_md_unprocessed(self) -> str:
         content = await self.get_content()
@@ -21,7 +21,9 @@ class MkHtmlTable(mkbasetable.MkBaseTable):
         if not any(table_data[k] for k in table_data):
             return None
         root = xml.Table(markdown=True)
-        data = [[str(k) for k in row] for row in self.iter_rows()]
+        columns = list((await self.render_columns()).values())
+        length = min(len(i) for i in columns)
+        data = [[col[j] for col in columns] for j in range(length)]
         headers = list(table_data.keys())
         data.insert(0, headers)
         for items in data:
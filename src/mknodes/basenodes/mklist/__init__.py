@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, TYPE_CHECKING
 
 from mknodes.basenodes import mkcontainer
@@ -49,13 +50,18 @@ class MkList(mkcontainer.MkContainer):
     def _prep(self, item: mknode.MkNode) -> str:
         return linkprovider.linked(str(item)) if self.as_links else str(item)
 
+    async def _render_items(self, items: Sequence[mknode.MkNode]) -> list[str]:
+        """Render given items concurrently, linking them if requested."""
+        texts = await asyncio.gather(*(item.to_markdown() for item in items))
+        return [linkprovider.linked(t) if self.as_links else t for t in texts]
+
     async def to_md_unprocessed(self) -> str:
         items = self.get_items()
         if not items:
             return ""
+        texts = await self._render_items(items[: self.shorten_after])
         lines = [
-            f"  {f'{i}.' if self.ordered else '*'} {self._prep(item)}"
-            for i, item in enumerate(items[: self.shorten_after], start=1)
+            f"  {f'{i}.' if self.ordered else '*'} {text}" for i, text in enumerate(texts, start=1)
         ]
         if self.shorten_after and len(items) > self.shorten_after:
             prefix = f"{self.shorten_after + 1}." if self.ordered else "*"
@@ -71,7 +77,8 @@ class MkList(mkcontainer.MkContainer):
         if not items:
             return ""
         tag_name = "ol" if self.ordered else "ul"
-        li_items = [f"<li>{self._prep(i)}</li>" for i in items[: self.shorten_after]]
+        texts = await self._render_items(items[: self.shorten_after])
+        li_items = [f"<li>{text}</li>" for text in texts]
         item_str = "".join(li_items)
         if self.shorten_after and len(items) > self.shorten_after:
             item_str += "<li>...</li>"
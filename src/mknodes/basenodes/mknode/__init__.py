@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import contextlib
 import copy
 import functools
 import re
+import threading
+import weakref
 from typing import TYPE_CHECKING, Any, Self
 
 from mknodes.basenodes import processors
@@ -10,11 +13,11 @@ from mknodes.data import treestyles
 from mknodes.info import contexts, nodefile
 from mknodes.jinja import nodeenvironment
 from mknodes.nodemods.modmanager import ModManager
-from mknodes.utils import icons, log, mdconverter, reprhelpers, resources, coroutines
+from mknodes.utils import coroutines, fingerprints, icons, log, mdconverter, reprhelpers, resources
 
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Iterator
+    from collections.abc import Awaitable, Callable, Coroutine, Iterable, Iterator
     import types
 
     from mknodes.data import datatypes
@@ -25,11 +28,94 @@ logger = log.get_logger(__name__)
 HEADER_REGEX = re.compile(r"^(#{1,6}) (.*)")
 
 
+# context id -> (node class, template name, theme fingerprint, mods fingerprint) -> rendered text
+_rendered_resources: dict[int, dict[tuple[type, str, str, str], str]] = {}
+_rendered_resources_lock = threading.Lock()
+
+
 @functools.lru_cache
 def get_fallback_ctx() -> contexts.ProjectContext:
     return contexts.ProjectContext()
 
 
+def _get_resource_cache(
+    ctx: contexts.ProjectContext,
+) -> dict[tuple[type, str, str, str], str]:
+    """Return the rendered-resource cache for given context.
+
+    Contexts are unhashable dataclasses, so the cache is keyed by id and
+    gets dropped once the context is garbage collected.
+    """
+    with _rendered_resources_lock:
+        if (cache := _rendered_resources.get(id(ctx))) is None:
+            cache = _rendered_resources[id(ctx)] = {}
+            weakref.finalize(ctx, _rendered_resources.pop, id(ctx), None)
+        return cache
+
+
+def _get_theme_key(theme: contexts.ThemeContext) -> str:
+    # all fields count, templates also use non-str ones (like admonitions / status icons)
+    return fingerprints.fingerprint(theme)
+
+
+def clear_resource_cache() -> None:
+    """Drop all cached renderings of local CSS / JS resources."""
+    with _rendered_resources_lock:
+        _rendered_resources.clear()
+
+
+_RENDER_STATE_ATTRS = frozenset({"_render_cache", "_render_version", "_fingerprint"})
+_CACHED_RENDER_METHODS = ("to_markdown", "get_content")
+# set once a node with RENDER_CACHE got rendered, before that no ancestor can cache anything
+_render_cache_used = False
+
+
+def _uses_render_cache(node: MkNode) -> bool:
+    """Whether the renderings of a node (or of one of its ancestors) get cached."""
+    global _render_cache_used
+    if node.RENDER_CACHE:
+        _render_cache_used = True
+        return True
+    return _render_cache_used and any(ancestor.RENDER_CACHE for ancestor in node.ancestors)
+
+
+def _copy_rendered[R](result: R) -> R:
+    """Copy mutable render results, so that callers cannot change the cached ones."""
+    if isinstance(result, resources.NodeContent):
+        return resources.NodeContent(result.markdown, result.resources.copy())  # type: ignore[return-value]
+    return result
+
+
+def _cache_render[**P, R](
+    method: Callable[P, Awaitable[R]],
+) -> Callable[P, Coroutine[Any, Any, R]]:
+    """Memoize the result of a render method if the render cache is enabled.
+
+    A result only gets stored if the node did not change while rendering.
+    """
+    key = method.__qualname__
+
+    @functools.wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        node: Any = args[0]
+        if not _uses_render_cache(node):
+            return await method(*args, **kwargs)
+        dct = node.__dict__
+        # nodes get tracked once rendered, so that changes invalidate the cached ancestors
+        version = dct.setdefault("_render_version", 0)
+        if len(args) > 1 or kwargs or not node.RENDER_CACHE:
+            return await method(*args, **kwargs)
+        cache = dct.setdefault("_render_cache", {})
+        if key in cache:
+            return _copy_rendered(cache[key])
+        result = await method(*args, **kwargs)
+        if dct["_render_version"] == version:
+            cache[key] = _copy_rendered(result)
+        return result
+
+    return wrapper
+
+
 class IllegalArgumentError(ValueError):
     def __init__(self, node: mk.MkNode, kwargs: Any) -> None:
         msg = f"Invalid keyword arguments for {type(node)!r}: {kwargs}"
@@ -58,6 +144,13 @@ class MkNode:
     STATUS: datatypes.PageStatusStr | str | None = None
     CSS: list[resources.CSSFile | resources.CSSText] = []
     JS_FILES: list[resources.JSFile | resources.JSText] = []
+    RENDER_CACHE: bool = False
+    """Keep the last rendered markdown / content until the node (or a child) changes.
+
+    Changes are detected for attribute writes, `append`, `set_items`, re-parenting,
+    CSS classes and mods. In-place changes of mutable attributes (like lists)
+    require a call to `mark_dirty`. Cached content gets returned as a copy.
+    """
 
     _name_registry: dict[str, MkNode] = dict()
 
@@ -94,7 +187,7 @@ class MkNode:
         self.indent = indent
         self.shift_header_levels = shift_header_levels
         self._files: dict[str, str | bytes] = {}
-        self.mods = ModManager()
+        self.mods = ModManager(on_change=self._notify_changed)
         self._ctx = context
         self._node_name = name
         self.variables = variables or {}
@@ -105,6 +198,44 @@ class MkNode:
     def __post_init__(self) -> None:
         pass
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in _CACHED_RENDER_METHODS:
+            if name in cls.__dict__:
+                setattr(cls, name, _cache_render(cls.__dict__[name]))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _RENDER_STATE_ATTRS or "_render_version" not in self.__dict__:
+            super().__setattr__(name, value)
+            return
+        if name == "_parent":
+            # the old ancestors change as well
+            self.mark_dirty()
+        super().__setattr__(name, value)
+        self.mark_dirty()
+        if name == "_ctx":
+            for node in self.descendants:
+                node._reset_render_cache()
+
+    def mark_dirty(self) -> None:
+        """Invalidate the cached renderings of this node and all its ancestors."""
+        node: MkNode | None = self
+        while node is not None:
+            node._reset_render_cache()
+            node = node.__dict__.get("_parent")
+
+    def _reset_render_cache(self) -> None:
+        dct = self.__dict__
+        dct["_render_version"] = dct.get("_render_version", 0) + 1
+        dct.pop("_fingerprint", None)
+        if cache := dct.get("_render_cache"):
+            cache.clear()
+
+    def _notify_changed(self) -> None:
+        """Mark the node dirty if it was rendered before."""
+        if "_render_version" in self.__dict__:
+            self.mark_dirty()
+
     # -------------------------------------------------------------------------
     # Tree node methods
     # -------------------------------------------------------------------------
@@ -127,12 +258,17 @@ class MkNode:
     @parent.setter
     def parent(self, value: MkNode | None) -> None:
         self._parent = value
+        if value is not None and "_render_version" not in self.__dict__:
+            # the new ancestors change even if this node is not tracked yet
+            value._notify_changed()
 
     def __copy__(self, **kwargs: Any) -> Self:
         """Shallow copy self."""
         obj = type(self).__new__(self.__class__)
         obj.__dict__.update(self.__dict__)
         obj.__dict__.update(kwargs)
+        for attr in _RENDER_STATE_ATTRS:
+            obj.__dict__.pop(attr, None)
         return obj
 
     def __deepcopy__(self, memo: Any):
@@ -140,7 +276,8 @@ class MkNode:
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            setattr(result, k, copy.deepcopy(v, memo))
+            if k not in _RENDER_STATE_ATTRS:
+                setattr(result, k, copy.deepcopy(v, memo))
         return result
 
     @property
@@ -154,7 +291,7 @@ class MkNode:
     @property
     def descendants(self) -> Iterable[MkNode]:
         """Get iterator to yield all descendants of self, does not include self."""
-        yield from self._preorder_iter(filter_condition=lambda _node: _node != self)
+        yield from self._preorder_iter(filter_condition=lambda _node: _node is not self)
 
     def is_descendant_of(self, kls: type | types.UnionType) -> bool:
         """Returns True if any ancestor is of given type.
@@ -366,20 +503,48 @@ class MkNode:
         return coroutines.run_sync(self.to_markdown())
 
     def __hash__(self):
-        return hash(coroutines.run_sync(self.to_markdown()))
+        try:
+            return hash(self.get_fingerprint())
+        except fingerprints.UnstableFingerprintError:
+            return hash(type(self))
 
     def __eq__(self, other: object):
+        if other is self:
+            return True
         if type(other) is not type(self):
             return False
+        with contextlib.suppress(fingerprints.UnstableFingerprintError):
+            if self.get_fingerprint() != other.get_fingerprint():
+                return False
         dct_1 = self.__dict__.copy()
         dct_2 = other.__dict__.copy()
-        for attr in ["_parent", "env"]:  # , "_annotations"]
+        for attr in ["_parent", "env", *_RENDER_STATE_ATTRS]:  # , "_annotations"]
             if attr in dct_1:
                 dct_1.pop(attr)
             if attr in dct_2:
                 dct_2.pop(attr)
         return dct_1 == dct_2
 
+    def get_fingerprint(self, _seen: set[int] | None = None) -> str:
+        """Return a structural fingerprint of this node and its subtree.
+
+        The fingerprint is computed from the class, the node attributes and the
+        fingerprints of all child nodes (Merkle-style), parent and context are not
+        taken into account. Identical subtrees share the same fingerprint, which makes
+        it usable as a cache key or for finding duplicated content.
+        It is cached until the node (or a descendant) changes, see `RENDER_CACHE`
+        for the detected changes.
+
+        Raises:
+            UnstableFingerprintError: An attribute has no stable representation.
+        """
+        dct = self.__dict__
+        if (value := dct.get("_fingerprint")) is None:
+            # get tracked so that changes invalidate the fingerprint
+            dct.setdefault("_render_version", 0)
+            value = dct["_fingerprint"] = fingerprints.get_node_fingerprint(self, _seen)
+        return value
+
     @property
     def ctx(self) -> contexts.ProjectContext:
         """The tree context.
@@ -451,6 +616,7 @@ class MkNode:
         """Return raw markdown for this node. Override in subclasses for custom markdown."""
         return ""
 
+    @_cache_render
     async def get_content(self) -> resources.NodeContent:
         """Return markdown and resources for this node in a single pass.
 
@@ -475,7 +641,7 @@ class MkNode:
         css_resources: list[resources.CSSType] = []
         for css in self.CSS + mod_resources.css:
             if isinstance(css, resources.CSSFile) and css.is_local():
-                text = await self.env.render_template_async(css.link)
+                text = await self._render_local_resource(css.link)
                 css_resource = resources.CSSText(text, css.link)
                 css_resources.append(css_resource)
             else:
@@ -483,7 +649,7 @@ class MkNode:
         js_resources: list[resources.JSType] = []
         for js_file in self.JS_FILES + mod_resources.js:
             if isinstance(js_file, resources.JSFile) and js_file.is_local():
-                text = await self.env.render_template_async(js_file.link)
+                text = await self._render_local_resource(js_file.link)
                 js_resource = resources.JSText(
                     text,
                     js_file.link,
@@ -503,6 +669,30 @@ class MkNode:
             css=css_resources,
         )
 
+    async def _render_local_resource(self, template: str) -> str:
+        """Render a local CSS / JS template, at most once per class and context.
+
+        Resource templates get looked up via the class loaders and depend on
+        the project context (mostly `theme`) and the node mods, so the result can be
+        shared between all instances of a class with equal mods. This also avoids
+        creating a node environment for every node.
+
+        Args:
+            template: Name of the template to render.
+        """
+        ctx = self.ctx
+        cache = _get_resource_cache(ctx)
+        try:
+            mods_key = fingerprints.fingerprint(self.mods)
+            key = (type(self), template, _get_theme_key(ctx.theme), mods_key)
+        except fingerprints.UnstableFingerprintError:
+            return await self.env.render_template_async(template)
+        if (text := cache.get(key)) is None:
+            text = await self.env.render_template_async(template)
+            cache[key] = text
+        return text
+
+    @_cache_render
     async def to_markdown(self) -> str:
         """Outputs markdown for self and all children."""
         text = await self.to_md_unprocessed()
@@ -573,6 +763,7 @@ class MkNode:
             data: Data of the file
         """
         self._files[filename] = data
+        self._notify_changed()
 
     def add_css_class(self, class_name: str) -> None:
         """Wrap node markdown with given css class.
@@ -580,7 +771,7 @@ class MkNode:
         Args:
             class_name: CSS class to wrap the node with
         """
-        self.mods._css_classes.append(class_name)
+        self.mods.append(class_name)
 
     async def get_node_resources(self) -> resources.Resources:
         """Return the resources specific for this node.
@@ -607,11 +798,10 @@ class MkNode:
             ),
         }
 
-        req = resources.Resources(markdown_extensions=extensions)
+        req = resources.ResourceAccumulator(resources.Resources(markdown_extensions=extensions))
         for node in nodes:
-            node_req = await node.get_node_resources()
-            req.merge(node_req)
-        return req
+            req.add(await node.get_node_resources())
+        return req.to_resources()
 
     @classmethod
     def with_context(
@@ -110,6 +110,7 @@ class MkTabContainer(mkcontainer.MkContainer):
             items[pos] = tab
         else:
             items.append(tab)
+        self._notify_changed()
 
     def __repr__(self) -> str:
         return reprhelpers.get_repr(
@@ -146,11 +147,11 @@ class MkTabContainer(mkcontainer.MkContainer):
         md = self.block_separator.join(child_markdowns)
 
         # Aggregate resources
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child_content in child_contents:
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     async def to_md_unprocessed(self) -> str:
         content = await self.get_content()
@@ -16,13 +16,16 @@ class MkTable(mkbasetable.MkBaseTable):
         table_data = self.data  # property
         if not any(table_data[k] for k in table_data):
             return ""
-        widths = [self.width_for_column(c) for c in table_data]
+        columns = await self.render_columns()
+        widths = [self.width_for_column(k, cells) for k, cells in columns.items()]
         formatters = [f"{{:<{width}}}" for width in widths]
-        headers = [formatters[i].format(k) for i, k in enumerate(table_data.keys())]
+        headers = [formatters[i].format(k) for i, k in enumerate(columns.keys())]
         divider = [width * "-" for width in widths]
+        length = min(len(i) for i in columns.values())
+        cols = list(columns.values())
         data = [
-            [formatters[i].format(str(k).replace("\n", "<br>")) for i, k in enumerate(row)]
-            for row in self.iter_rows()
+            [formatters[i].format(col[j].replace("\n", "<br>")) for i, col in enumerate(cols)]
+            for j in range(length)
         ]
         header_txt = "| " + " | ".join(headers) + " |"
         divider_text = "| " + " | ".join(divider) + " |"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import textwrap
 
 from typing import Any, TYPE_CHECKING
@@ -130,7 +131,7 @@ class MkTab(mkcontainer.MkContainer):
         items = self.get_items()
 
         # Collect content from children
-        child_contents = [await item.get_content() for item in items]
+        child_contents = await asyncio.gather(*(item.get_content() for item in items))
 
         # Build markdown with tab formatting
         child_markdowns = []
@@ -143,7 +144,7 @@ class MkTab(mkcontainer.MkContainer):
         text = "\n\n".join(child_markdowns)
         text = text.rstrip("\n")
         if self.annotations:
-            annotates = str(self.annotations)
+            annotates = await self.annotations.to_markdown()
             text = f"{text}\n{{ .annotate }}\n\n{annotates}"
         text = textwrap.indent(text, prefix="    ")
         if self.new:
@@ -156,11 +157,11 @@ class MkTab(mkcontainer.MkContainer):
         md = "\n".join(lines) + "\n"
 
         # Aggregate resources
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child_content in child_contents:
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     async def to_md_unprocessed(self) -> str:
         content = await self.get_content()
@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
+from mknodes.build.archive import ArchiveExporter
 from mknodes.build.builder import DocBuilder
-from mknodes.build.exporter import Exporter, MarkdownExporter
+from mknodes.build.cache import BuildCache, CacheStats
+from mknodes.build.exporter import Exporter, ExportStats, MarkdownExporter
+from mknodes.build.metadataindex import MetadataIndex
 from mknodes.build.output import BuildOutput
+from mknodes.build.profiler import BuildProfiler
 
 
-__all__ = ["BuildOutput", "DocBuilder", "Exporter", "MarkdownExporter"]
+__all__ = [
+    "ArchiveExporter",
+    "BuildCache",
+    "BuildOutput",
+    "BuildProfiler",
+    "CacheStats",
+    "DocBuilder",
+    "ExportStats",
+    "Exporter",
+    "MarkdownExporter",
+    "MetadataIndex",
+]
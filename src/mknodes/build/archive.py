@@ -0,0 +1,245 @@
+"""Exporter writing the build output into a single zip / tar.gz archive."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import gzip
+import io
+import os
+import pathlib
+import tarfile
+import time
+from typing import TYPE_CHECKING, Any, Literal
+import zipfile
+
+from mknodes.build import exporter
+from mknodes.utils import log
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator
+
+    from mknodes.build.builder import PageResult
+    from mknodes.build.output import BuildOutput
+
+
+logger = log.get_logger(__name__)
+
+ArchiveFormatStr = Literal["zip", "tar.gz"]
+ARCHIVE_SUFFIXES: dict[str, ArchiveFormatStr] = {
+    ".zip": "zip",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz",
+}
+DEFAULT_TIMESTAMP = 315532800
+"""1980-01-01 00:00:00 UTC, the earliest timestamp zip files can store."""
+FILE_MODE = 0o644
+
+
+def get_archive_format(path: str | os.PathLike[str]) -> ArchiveFormatStr | None:
+    """Return the archive format for given path based on its suffix (or None).
+
+    Args:
+        path: Path of the archive.
+    """
+    name = os.fspath(path).lower()
+    return next((fmt for sfx, fmt in ARCHIVE_SUFFIXES.items() if name.endswith(sfx)), None)
+
+
+class ArchiveExporter(exporter.MarkdownExporter):
+    """Writes the build output straight into a zip or tar.gz archive.
+
+    Archives are reproducible: entries are written in path order, and all entries
+    share the same timestamp, permissions and owner. The timestamp is taken from
+    the `SOURCE_DATE_EPOCH` environment variable if set.
+    The archive gets written to a temporary file which replaces the target once
+    it is complete.
+
+    Examples:
+        ``` py
+        output = await DocBuilder().build(root)
+        await ArchiveExporter().export(output, Path("site.tar.gz"))
+        ```
+    """
+
+    def __init__(
+        self,
+        archive_format: ArchiveFormatStr | None = None,
+        metadata_format: exporter.MetadataFormatStr = "index",
+        metadata_suffix: str = ".meta.yaml",
+        timestamp: int | None = None,
+        compresslevel: int | None = None,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            archive_format: Format of the archive. If None, it gets derived from the
+                            suffix of the export target.
+            metadata_format: Write a YAML sidecar per file (`sidecar`)
+                             or a consolidated JSON index (`index`).
+            metadata_suffix: Suffix for metadata sidecar files.
+            timestamp: Modification time (seconds since epoch) of all entries.
+                       Defaults to `SOURCE_DATE_EPOCH` or 1980-01-01.
+            compresslevel: Compression level (zlib levels, 0-9).
+        """
+        super().__init__(metadata_suffix=metadata_suffix, metadata_format=metadata_format)
+        self.archive_format = archive_format
+        if timestamp is None:
+            timestamp = int(os.environ.get("SOURCE_DATE_EPOCH", DEFAULT_TIMESTAMP))
+        self.timestamp = max(timestamp, DEFAULT_TIMESTAMP)
+        self.compresslevel = compresslevel
+
+    async def export(self, output: BuildOutput, target: pathlib.Path) -> None:
+        """Export build output into an archive.
+
+        Args:
+            output: Build output to export.
+            target: Path of the archive file.
+        """
+        ordered = dataclasses.replace(
+            output,
+            files=dict(sorted(output.files.items())),
+            file_resources=dict(sorted(output.file_resources.items())),
+        )
+        await super().export(ordered, target)
+
+    async def export_stream(
+        self,
+        results: AsyncIterable[PageResult],
+        target: pathlib.Path,
+        nav_structure: dict[str, Any] | None = None,
+    ) -> int:
+        """Write results into an archive.
+
+        Results arrive in order of completion, so they get collected and sorted
+        before writing to keep the archive reproducible.
+
+        Args:
+            results: Results to write (usually from `DocBuilder.iter_build`).
+            target: Path of the archive file.
+            nav_structure: Navigation structure for the metadata.
+
+        Returns:
+            The number of written files.
+        """
+        collected = sorted([result async for result in results], key=lambda r: r.path)
+
+        async def iter_sorted() -> AsyncIterator[PageResult]:
+            for result in collected:
+                yield result
+
+        return await super().export_stream(iter_sorted(), target, nav_structure)
+
+    @contextlib.asynccontextmanager
+    async def _get_writer(self, target: pathlib.Path) -> AsyncIterator[exporter.Writer]:
+        archive_format = self.archive_format or get_archive_format(target)
+        if archive_format is None:
+            msg = f"Cannot derive archive format from {target}. Use .zip, .tar.gz or .tgz"
+            raise ValueError(msg)
+        writer = ArchiveWriter(
+            pathlib.Path(target),
+            archive_format,
+            timestamp=self.timestamp,
+            compresslevel=self.compresslevel,
+        )
+        try:
+            yield writer
+            writer.finish()
+        finally:
+            writer.close()
+        self.stats = writer.stats
+        logger.info("Exported %d files to %s", writer.stats.written, target)
+
+
+class ArchiveWriter:
+    """Writes files as entries of a zip / tar.gz archive."""
+
+    def __init__(
+        self,
+        target: pathlib.Path,
+        archive_format: ArchiveFormatStr,
+        timestamp: int = DEFAULT_TIMESTAMP,
+        compresslevel: int | None = None,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            target: Path of the archive file.
+            archive_format: Format of the archive.
+            timestamp: Modification time of all entries.
+            compresslevel: Compression level (zlib levels, 0-9).
+        """
+        self.target = target
+        self.archive_format = archive_format
+        self.timestamp = timestamp
+        self.stats = exporter.ExportStats()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        self._file = self._tmp_path.open("wb")
+        self._zip: zipfile.ZipFile | None = None
+        self._gzip: gzip.GzipFile | None = None
+        self._tar: tarfile.TarFile | None = None
+        level = 9 if compresslevel is None else compresslevel
+        if archive_format == "zip":
+            self._zip = zipfile.ZipFile(
+                self._file, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=level
+            )
+        else:
+            # empty filename and mtime 0 keep the gzip header reproducible
+            self._gzip = gzip.GzipFile(
+                filename="", mode="wb", fileobj=self._file, mtime=0, compresslevel=level
+            )
+            self._tar = tarfile.open(fileobj=self._gzip, mode="w", format=tarfile.PAX_FORMAT)  # noqa: SIM115
+        self._finished = False
+
+    async def write(self, path: str, content: str | bytes) -> None:
+        """Add a file to the archive.
+
+        Args:
+            path: Path of the entry inside the archive.
+            content: File content.
+        """
+        data = content.encode() if isinstance(content, str) else content
+        # compression is CPU-bound, keep the event loop responsive
+        await asyncio.to_thread(self._add, path, data)
+        self.stats.written += 1
+
+    def _add(self, path: str, data: bytes) -> None:
+        if self._zip is not None:
+            date_time = _get_zip_date_time(self.timestamp)
+            info = zipfile.ZipInfo(path, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (0o100000 | FILE_MODE) << 16
+            self._zip.writestr(info, data)
+        elif self._tar is not None:
+            tar_info = tarfile.TarInfo(path)
+            tar_info.size = len(data)
+            tar_info.mtime = self.timestamp
+            tar_info.mode = FILE_MODE
+            tar_info.uid = tar_info.gid = 0
+            tar_info.uname = tar_info.gname = ""
+            self._tar.addfile(tar_info, io.BytesIO(data))
+
+    def finish(self) -> None:
+        """Finalize the archive and move it to the target path."""
+        self._close_archive()
+        self._tmp_path.replace(self.target)
+        self._finished = True
+
+    def close(self) -> None:
+        """Close the archive, discarding it if it was not finished."""
+        if self._finished:
+            return
+        self._close_archive()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def _close_archive(self) -> None:
+        for closable in (self._zip, self._tar, self._gzip, self._file):
+            if closable is not None:
+                closable.close()
+
+
+def _get_zip_date_time(timestamp: int) -> tuple[int, int, int, int, int, int]:
+    return time.gmtime(timestamp)[:6]
@@ -3,45 +3,90 @@
 from __future__ import annotations
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import contextlib
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
+import functools
+import itertools
+import os
+import pickle
+from typing import TYPE_CHECKING, Any, Literal
 
 import logfire
 
-from mknodes.utils import icons, log, resources
+from mknodes.build import cache
+from mknodes.info import griffecache, grifferegistry
+from mknodes.jinja import bytecodecache, nodeenvironment
+from mknodes.navs import navigation
+from mknodes.utils import coroutines, icons, log, resources
 
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+
     import mknodes as mk
 
     from .output import BuildOutput
 
+    type Job = Callable[[], Awaitable[PageResult | None]]
+
 
 @dataclass
 class PageResult:
     """Result of processing a single page."""
 
     path: str
-    content: str
+    content: str | bytes
     resources: resources.Resources
 
 
 logger = log.get_logger(__name__)
 
+ExecutorStr = Literal["thread", "process", "async"]
+EXECUTORS: tuple[ExecutorStr, ...] = ("thread", "process", "async")
+DEFAULT_CONCURRENCY = 32
+
 
 class DocBuilder:
     """Traverses node tree, renders markdown, collects resources."""
 
-    def __init__(self, render_jinja: bool = True, max_workers: int | None = None) -> None:
+    def __init__(
+        self,
+        render_jinja: bool = True,
+        max_workers: int | None = None,
+        cache_dir: str | os.PathLike[str] | None = None,
+        executor: ExecutorStr = "thread",
+        tree_factory: Callable[[], mk.MkNav] | None = None,
+        io_concurrency: int = 8,
+    ) -> None:
         """Constructor.
 
         Args:
             render_jinja: Whether to render Jinja templates in pages.
-            max_workers: Maximum number of worker threads for parallel processing.
+            max_workers: Maximum number of worker threads / processes / concurrently
+                         rendered pages, depending on the executor.
+            cache_dir: Directory for the incremental build cache.
+                       If None, every page gets rendered on each build.
+            executor: How pages get scheduled:
+                      `thread`: each page gets its own event loop in a thread pool.
+                      `process`: pages get rendered in a process pool. Bypasses the GIL,
+                      but needs a picklable tree or a `tree_factory`.
+                      `async`: all pages are tasks on the running event loop.
+            tree_factory: Picklable callable which rebuilds the node tree.
+                          Used by worker processes to rebuild the tree instead of
+                          receiving a pickled copy of it.
+            io_concurrency: Maximum number of concurrent I/O operations per node type
+                            when using the `async` executor.
         """
+        if executor not in EXECUTORS:
+            msg = f"Invalid executor {executor!r}. Allowed values: {EXECUTORS}"
+            raise ValueError(msg)
         self.render_jinja = render_jinja
         self.max_workers = max_workers
+        self.executor = executor
+        self.tree_factory = tree_factory
+        self.io_concurrency = io_concurrency
+        self.cache = cache.BuildCache(cache_dir) if cache_dir is not None else None
         self._files: dict[str, str | bytes] = {}
         self._file_resources: dict[str, resources.Resources] = {}
 
@@ -54,50 +99,167 @@ class DocBuilder:
         Returns:
             BuildOutput containing all files and collected resources.
         """
-        import mknodes as mk
         from mknodes.build.output import BuildOutput
 
         logger.info("Starting documentation build...")
+        with self._use_caches():
+            pages, files = self._collect_nodes(root)
+            nav_tree = navigation.build_nav_tree(root)
+            self._files |= files
+            # pages and navs share one scheduler, results get stored in tree order
+            results = {
+                index: result async for index, result in self._iter_results(root, pages, nav_tree)
+            }
+        for _index, result in sorted(results.items()):
+            self._files[result.path] = result.content
+            self._file_resources[result.path] = result.resources
+        if self.cache:
+            self.cache.prune()
+            logger.info("Build cache: %s", self.cache.stats)
+        logger.debug("Resolved context fields: %s", root.ctx.get_access_trace())
+        return BuildOutput(
+            files=self._files,
+            file_resources=self._file_resources,
+            nav_structure=nav_tree.nav_dict,
+            page_count=len(results) - len(nav_tree.navs),
+            cache_stats=self.cache.stats if self.cache else None,
+        )
+
+    async def iter_build(
+        self,
+        root: mk.MkNav,
+        nav_tree: navigation.NavTree | None = None,
+    ) -> AsyncIterator[PageResult]:
+        """Build documentation from a navigation tree, yielding results as they finish.
+
+        In contrast to `build`, results are not retained by the builder, so memory usage
+        is bounded by the number of pages in flight instead of by the size of the site.
+        Static files are yielded first (with empty resources).
+
+        Args:
+            root: Root navigation node to build from.
+            nav_tree: Nav tree of root (see `navigation.build_nav_tree`), pass it
+                      if it is needed elsewhere, too (like for the nav structure).
+        """
+        logger.info("Starting streaming documentation build...")
+        with self._use_caches():
+            pages, files = self._collect_nodes(root)
+            nav_tree = nav_tree or navigation.build_nav_tree(root)
+            for path, data in files.items():
+                yield PageResult(path=path, content=data, resources=resources.Resources())
+            async for _index, result in self._iter_results(root, pages, nav_tree):
+                yield result
+        if self.cache:
+            self.cache.prune()
+            logger.info("Build cache: %s", self.cache.stats)
+        logger.debug("Resolved context fields: %s", root.ctx.get_access_trace())
+
+    @contextlib.contextmanager
+    def _use_caches(self) -> Iterator[None]:
+        """Install the template and Griffe caches of the build cache while building.
+
+        Both are process-wide, so the previous ones get restored afterwards.
+        """
+        if not self.cache:
+            yield
+            return
+        bytecode_cache = nodeenvironment.get_bytecode_cache()
+        module_cache = grifferegistry.registry.cache
+        nodeenvironment.set_bytecode_cache(self.cache.bytecode_cache)
+        grifferegistry.registry.set_cache(self.cache.module_cache)
+        try:
+            yield
+        finally:
+            nodeenvironment.set_bytecode_cache(bytecode_cache)
+            grifferegistry.registry.set_cache(module_cache)
+
+    def _collect_nodes(self, root: mk.MkNav) -> tuple[list[mk.MkPage], dict[str, str | bytes]]:
+        """Collect all pages and static files of the tree.
+
+        Args:
+            root: Root navigation node.
+        """
+        import mknodes as mk
 
-        # Collect all nodes, separate pages and navs
         pages: list[mk.MkPage] = []
-        navs: list[mk.MkNav] = []
+        files: dict[str, str | bytes] = {}
         for _level, node in root.iter_nodes():
-            self._files |= node.files
-            match node:
-                case mk.MkPage() as page:
-                    pages.append(page)
-                case mk.MkNav() as nav:
-                    navs.append(nav)
-
-        # Process pages in parallel
+            files |= node.files
+            if isinstance(node, mk.MkPage):
+                pages.append(node)
+        return pages, files
+
+    async def _iter_results(
+        self, root: mk.MkNav, pages: Sequence[mk.MkPage], nav_tree: navigation.NavTree
+    ) -> AsyncIterator[tuple[int, PageResult]]:
+        """Process pages and navs, yielding (index, result) tuples in order of completion.
+
+        Pages and navs are scheduled as one job list (pages first, navs afterwards),
+        the index is the position of the job in that list.
+        At most `max_workers` (or DEFAULT_CONCURRENCY) jobs are in flight at a time.
+
+        Args:
+            root: Root navigation node.
+            pages: Pages to process.
+            nav_tree: Nav tree containing the navs to process.
+        """
+        nav_jobs: list[Job] = [
+            functools.partial(self._process_nav, nav, path, markdown)
+            for nav, path, markdown in nav_tree.navs
+        ]
+        limiter = coroutines.IOLimiter(self.io_concurrency)
+        if self.executor == "process":
+            # navs are cheap, they get processed on the event loop while workers render
+            with limiter.activate():
+                nav_tasks = [asyncio.ensure_future(job()) for job in nav_jobs]
+            try:
+                async for item in self._iter_pages_in_processes(root, pages):
+                    yield item
+                for index, result in enumerate(await asyncio.gather(*nav_tasks), len(pages)):
+                    if result:
+                        yield index, result
+            finally:
+                for task in nav_tasks:
+                    task.cancel()
+            return
+        jobs: list[Job] = [functools.partial(self._process_page, page) for page in pages]
+        jobs += nav_jobs
         loop = asyncio.get_running_loop()
-        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
-            futures = [loop.run_in_executor(pool, self._process_page_sync, page) for page in pages]
-            page_results = list(await asyncio.gather(*futures))
+        pool = ThreadPoolExecutor(self.max_workers) if self.executor == "thread" else None
 
-        for result in page_results:
-            if result:
-                self._files[result.path] = result.content
-                self._file_resources[result.path] = result.resources
+        def schedule(job: Job) -> asyncio.Future[PageResult | None]:
+            if pool:
+                return loop.run_in_executor(pool, self._run_job_sync, job)
+            with limiter.activate():
+                return asyncio.ensure_future(job())
 
-        # Process navs (fast, no parallelization needed)
-        for nav in navs:
-            await self._process_nav(nav)
+        remaining = enumerate(jobs)
+        in_flight = {schedule(j): i for i, j in itertools.islice(remaining, self._window_size)}
+        try:
+            while in_flight:
+                done, _pending = await asyncio.wait(
+                    set(in_flight), return_when=asyncio.FIRST_COMPLETED
+                )
+                finished = [(in_flight.pop(future), future) for future in done]
+                in_flight |= {schedule(j): i for i, j in itertools.islice(remaining, len(done))}
+                for index, future in finished:
+                    if result := future.result():
+                        yield index, result
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
 
-        nav_structure = root.nav.to_nav_dict()
-        return BuildOutput(
-            files=self._files,
-            file_resources=self._file_resources,
-            nav_structure=nav_structure,
-            page_count=len([r for r in page_results if r]),
-        )
+    @property
+    def _window_size(self) -> int:
+        return self.max_workers or DEFAULT_CONCURRENCY
 
-    def _process_page_sync(self, page: mk.MkPage) -> PageResult | None:
-        """Process a page synchronously (for thread pool).
+    def _run_job_sync(self, job: Job) -> PageResult | None:
+        """Run a page / nav job in a fresh event loop (for thread pool).
 
         Args:
-            page: Page to process.
+            job: Job to run.
 
         Returns:
             PageResult or None if skipped.
@@ -105,10 +267,92 @@ class DocBuilder:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
-            return loop.run_until_complete(self._process_page(page))
+            return loop.run_until_complete(job())
         finally:
             loop.close()
 
+    async def _process_pages_async(self, pages: Sequence[mk.MkPage]) -> list[PageResult | None]:
+        """Render all pages as tasks on the running event loop.
+
+        A semaphore bounds the number of pages in flight, and an IOLimiter makes sure
+        that I/O-heavy nodes of one type cannot occupy all I/O slots.
+
+        Args:
+            pages: Pages to process.
+        """
+        semaphore = asyncio.Semaphore(self._window_size)
+        limiter = coroutines.IOLimiter(self.io_concurrency)
+
+        async def process(page: mk.MkPage) -> PageResult | None:
+            async with semaphore:
+                return await self._process_page(page)
+
+        # tasks copy the current context on creation, so they all see the limiter
+        with limiter.activate():
+            tasks = [asyncio.create_task(process(page)) for page in pages]
+        return list(await asyncio.gather(*tasks))
+
+    async def _iter_pages_in_processes(
+        self, root: mk.MkNav, pages: Sequence[mk.MkPage]
+    ) -> AsyncIterator[tuple[int, PageResult]]:
+        """Render pages in a process pool, yielding each partition once it is finished.
+
+        Cached pages are resolved in this process, only the remaining pages
+        get distributed to the workers. Yields (page index, result) tuples.
+
+        Args:
+            root: Root navigation node (sent to workers if there is no tree factory).
+            pages: Pages to process.
+        """
+        keys: dict[str, str] = {}
+        indexes: dict[str, int] = {}
+        todo: list[mk.MkPage] = []
+        for index, page in enumerate(pages):
+            if page.resolved_metadata.inclusion_level is False:
+                continue
+            path = page.resolved_file_path
+            if self.cache and (key := self.cache.get_key(page, render_jinja=self.render_jinja)):
+                keys[path] = key
+                if cached := self.cache.load(key, path):
+                    yield index, cached
+                    continue
+            indexes[path] = index
+            todo.append(page)
+        if not todo:
+            return
+        source: bytes | Callable[[], mk.MkNav]
+        if self.tree_factory:
+            source = self.tree_factory
+        else:
+            try:
+                source = pickle.dumps(root)
+            except Exception as e:
+                msg = "Node tree is not picklable. Pass a tree_factory to use processes."
+                raise RuntimeError(msg) from e
+        num_workers = self.max_workers or os.cpu_count() or 1
+        partitions = partition_pages(todo, num_workers)
+        template_dir = self.cache.bytecode_cache.directory if self.cache else None
+        griffe_dir = os.fspath(self.cache.module_cache.cache_dir) if self.cache else None
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=len(partitions)) as pool:
+            futures = [
+                loop.run_in_executor(
+                    pool,
+                    render_partition,
+                    source,
+                    paths,
+                    self.render_jinja,
+                    template_dir,
+                    griffe_dir,
+                )
+                for paths in partitions
+            ]
+            for future in asyncio.as_completed(futures):
+                for result in await future:
+                    if self.cache and result.path in keys:
+                        self.cache.store(keys[result.path], result)
+                    yield indexes[result.path], result
+
     @logfire.instrument("Processing page {page.title}")
     async def _process_page(self, page: mk.MkPage) -> PageResult | None:
         """Process a single page: render and collect resources.
@@ -122,6 +366,22 @@ class DocBuilder:
         if page.resolved_metadata.inclusion_level is False:
             return None
 
+        path = page.resolved_file_path
+        key = self.cache.get_key(page, render_jinja=self.render_jinja) if self.cache else None
+        if self.cache and key and (cached := self.cache.load(key, path)):
+            logger.debug("Using cached page: %s", path)
+            return cached
+        result = await self._render_page(page)
+        if self.cache and key:
+            self.cache.store(key, result)
+        return result
+
+    async def _render_page(self, page: mk.MkPage) -> PageResult:
+        """Render a page and collect its resources.
+
+        Args:
+            page: Page to render.
+        """
         path = page.resolved_file_path
         logger.debug("Processing page: %s", path)
         # Single-pass: get markdown and aggregated resources together
@@ -138,22 +398,21 @@ class DocBuilder:
         return PageResult(path=path, content=md, resources=req)
 
     @logfire.instrument("Processing nav {nav.title}")
-    async def _process_nav(self, nav: mk.MkNav) -> None:
+    async def _process_nav(self, nav: mk.MkNav, path: str, markdown: str) -> PageResult:
         """Process a navigation section.
 
         Args:
             nav: Navigation to process.
+            path: Resolved file path of the nav.
+            markdown: Literate nav of the nav (see `navigation.build_nav_tree`).
         """
-        path = nav.resolved_file_path
         logger.debug("Processing nav: %s", nav.title or "[ROOT]")
-        # Single-pass: get markdown and aggregated resources together
-        content = await nav.get_content()
-        self._file_resources[path] = self._with_base_extensions(content.resources, nav)
-        md = content.markdown
+        req = self._with_base_extensions(await nav.get_node_resources(), nav)
+        md = markdown
         # Apply nav's processors
         for proc in nav.get_processors():
             md = proc.run(md)
-        self._files[path] = md
+        return PageResult(path=path, content=md, resources=req)
 
     def _with_base_extensions(
         self, req: resources.Resources, node: mk.MkNode
@@ -175,3 +434,72 @@ class DocBuilder:
         result = resources.Resources(markdown_extensions=base_extensions)
         result.merge(req)
         return result
+
+
+def partition_pages(pages: Sequence[mk.MkPage], num_partitions: int) -> list[list[str]]:
+    """Split pages into balanced partitions, keeping nav sections together.
+
+    Pages are grouped by their top-level section, the groups then get distributed
+    greedily (largest first) to the partition with the fewest pages.
+    Sections larger than a fair share get split up.
+
+    Args:
+        pages: Pages to partition.
+        num_partitions: Maximum number of partitions.
+
+    Returns:
+        A list of partitions, each containing the resolved file paths of its pages.
+    """
+    groups: dict[str, list[str]] = {}
+    for page in pages:
+        path = page.resolved_file_path
+        groups.setdefault(path.split("/", 1)[0] if "/" in path else "", []).append(path)
+    fair_share = max(1, -(-len(pages) // max(num_partitions, 1)))
+    chunks = [
+        paths[i : i + fair_share]
+        for paths in groups.values()
+        for i in range(0, len(paths), fair_share)
+    ]
+    partitions: list[list[str]] = [[] for _ in range(min(num_partitions, len(chunks)))]
+    for chunk in sorted(chunks, key=len, reverse=True):
+        min(partitions, key=len).extend(chunk)
+    return partitions
+
+
+def render_partition(
+    source: bytes | Callable[[], mk.MkNav],
+    paths: Sequence[str],
+    render_jinja: bool = True,
+    template_dir: str | None = None,
+    griffe_dir: str | None = None,
+) -> list[PageResult]:
+    """Render the pages with given paths. Entry point for worker processes.
+
+    Args:
+        source: Either a pickled node tree or a callable which rebuilds the tree.
+        paths: Resolved file paths of the pages to render.
+        render_jinja: Whether to render Jinja templates in pages.
+        template_dir: Directory of the template bytecode cache to share.
+        griffe_dir: Directory of the Griffe module cache to share.
+    """
+    import mknodes as mk
+
+    if template_dir is not None:
+        cache = bytecodecache.TemplateBytecodeCache(template_dir)
+        nodeenvironment.set_bytecode_cache(cache)
+    if griffe_dir is not None:
+        grifferegistry.registry.set_cache(griffecache.ModuleCache(griffe_dir))
+
+    root = pickle.loads(source) if isinstance(source, bytes) else source()
+    wanted = set(paths)
+    pages = [
+        node
+        for _level, node in root.iter_nodes()
+        if isinstance(node, mk.MkPage) and node.resolved_file_path in wanted
+    ]
+    if len(pages) != len(wanted):
+        found = {page.resolved_file_path for page in pages}
+        logger.warning("Pages not found in worker tree: %s", sorted(wanted - found))
+    builder = DocBuilder(render_jinja=render_jinja, executor="async")
+    results = asyncio.run(builder._process_pages_async(pages))
+    return [result for result in results if result]
@@ -0,0 +1,196 @@
+"""Persistent on-disk cache for incremental builds."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Any
+
+import mknodes
+from mknodes.info import griffecache
+from mknodes.jinja import bytecodecache
+from mknodes.utils import fingerprints, log
+
+
+if TYPE_CHECKING:
+    import mknodes as mk
+    from mknodes.build.builder import PageResult
+    from mknodes.info import contexts
+
+
+logger = log.get_logger(__name__)
+
+CACHE_VERSION = 2
+"""Bump this to invalidate all existing cache entries."""
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Hit / miss report of a build cache."""
+
+    hits: list[str] = dataclasses.field(default_factory=list)
+    """Paths of pages which were taken from the cache."""
+    misses: list[str] = dataclasses.field(default_factory=list)
+    """Paths of pages which had to be rendered."""
+    pruned: int = 0
+    """Number of stale cache entries which were removed."""
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of cache hits to total lookups."""
+        total = len(self.hits) + len(self.misses)
+        return len(self.hits) / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "hits": len(self.hits),
+            "misses": len(self.misses),
+            "pruned": self.pruned,
+            "hit_ratio": round(self.hit_ratio, 4),
+            "missed_pages": sorted(self.misses),
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.hits)} hits, {len(self.misses)} misses "
+            f"({self.hit_ratio:.1%} hit ratio), {self.pruned} stale entries pruned"
+        )
+
+
+class BuildCache:
+    """Stores rendered page results on disk, keyed by page fingerprint.
+
+    The key of a page is derived from a structural hash of the page subtree,
+    its resolved metadata, its output path and the context fields which
+    usually end up in rendered pages. Output of nodes fetching external data
+    (command output, network requests, ...) is cached like everything else,
+    so clear the cache directory if that data is expected to change.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike[str]) -> None:
+        """Constructor.
+
+        Args:
+            cache_dir: Directory to store the cache entries in.
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.page_dir = self.cache_dir / "pages"
+        self.page_dir.mkdir(parents=True, exist_ok=True)
+        self.bytecode_cache = bytecodecache.TemplateBytecodeCache(self.cache_dir / "templates")
+        """Compiled Jinja templates, shared by all builds using this directory."""
+        self.module_cache = griffecache.ModuleCache(self.cache_dir / "griffe")
+        """Serialized Griffe modules, shared by all builds using this directory."""
+        self.stats = CacheStats()
+        self._used_keys: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({os.fspath(self.cache_dir)!r})"
+
+    def get_key(self, page: mk.MkPage, render_jinja: bool = True) -> str | None:
+        """Return the cache key for given page.
+
+        Returns None if the page cannot be cached because some of its state
+        has no stable fingerprint.
+
+        Args:
+            page: Page to compute the key for.
+            render_jinja: Whether the page gets rendered with Jinja.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}:{mknodes.__version__}:{render_jinja}".encode())
+        digest.update(page.resolved_file_path.encode())
+        try:
+            digest.update(fingerprints.fingerprint(dict(page.resolved_metadata)).encode())
+            digest.update(get_context_fingerprint(page.ctx).encode())
+            digest.update(page.get_fingerprint().encode())
+        except fingerprints.UnstableFingerprintError as e:
+            logger.debug("Not caching %s: %s", page.resolved_file_path, e)
+            return None
+        return digest.hexdigest()
+
+    def load(self, key: str, path: str) -> PageResult | None:
+        """Load a cached page result, recording a hit or a miss.
+
+        Args:
+            key: Cache key of the page.
+            path: Output path of the page (used for the report).
+        """
+        file = self.page_dir / f"{key}.pickle"
+        result: PageResult | None = None
+        if file.exists():
+            try:
+                result = pickle.loads(file.read_bytes())
+            except Exception:  # noqa: BLE001
+                logger.warning("Could not load cache entry for %s", path)
+        with self._lock:
+            self._used_keys.add(key)
+            (self.stats.hits if result else self.stats.misses).append(path)
+        return result
+
+    def store(self, key: str, result: PageResult) -> None:
+        """Store a page result in the cache.
+
+        Args:
+            key: Cache key of the page.
+            result: Rendered page result.
+        """
+        try:
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: BLE001
+            logger.warning("Could not serialize cache entry for %s", result.path)
+            return
+        # write to a temporary file first so that parallel builds never see partial files
+        fd, tmp_name = tempfile.mkstemp(dir=self.page_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        pathlib.Path(tmp_name).replace(self.page_dir / f"{key}.pickle")
+
+    def prune(self) -> int:
+        """Remove all entries which were not used since this cache was created."""
+        count = 0
+        for file in self.page_dir.glob("*.pickle"):
+            if file.stem not in self._used_keys:
+                file.unlink(missing_ok=True)
+                count += 1
+        self.stats.pruned = count
+        return count
+
+    def clear(self) -> None:
+        """Remove all cache entries (including compiled templates and Griffe modules)."""
+        for file in self.page_dir.glob("*.pickle"):
+            file.unlink(missing_ok=True)
+        self.bytecode_cache.clear()
+        self.module_cache.clear()
+
+
+def get_context_fingerprint(ctx: contexts.ProjectContext) -> str:
+    """Return a fingerprint of the context fields which commonly end up in pages.
+
+    Fields which change with every commit (like the HEAD sha) are left out,
+    otherwise each commit would invalidate all cached pages.
+
+    Args:
+        ctx: Project context to fingerprint.
+    """
+    meta, git, theme = ctx.metadata, ctx.git, ctx.theme
+    values = (
+        meta.distribution_name,
+        meta.version,
+        meta.pretty_name,
+        meta.repository_url,
+        meta.repository_username,
+        meta.repository_name,
+        git.last_version,
+        git.main_branch,
+        theme.name,
+        theme.primary_color,
+        ctx.links.base_url,
+        ctx.links.use_directory_urls,
+    )
+    return repr(values)
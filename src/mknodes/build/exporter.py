@@ -2,17 +2,42 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Protocol
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from typing import TYPE_CHECKING, Any, Literal, Protocol
 
 import upath
 import yamling
 
+from mknodes.build import metadataindex
+from mknodes.utils import log, resources
+
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator
     from pathlib import Path
 
+    from mknodes.build.builder import PageResult
     from mknodes.build.output import BuildOutput
-    from mknodes.utils.resources import Resources
+
+
+logger = log.get_logger(__name__)
+
+MANIFEST_FILE = ".mknodes.manifest.json"
+"""Name of the manifest file used for incremental exports."""
+INDEX_FILE = ".mknodes.index.json"
+"""Name of the consolidated metadata index (`index` metadata format)."""
+MAX_PENDING_WRITES = 64
+
+MetadataFormatStr = Literal["sidecar", "index"]
+METADATA_FORMATS: tuple[MetadataFormatStr, ...] = ("sidecar", "index")
 
 
 class Exporter(Protocol):
@@ -23,16 +48,69 @@ class Exporter(Protocol):
         ...
 
 
+class Writer(Protocol):
+    """Protocol for the file writers used by the exporters."""
+
+    stats: ExportStats
+
+    async def write(self, path: str, content: str | bytes) -> None:
+        """Write a file to given path (relative to the export target)."""
+        ...
+
+
+@dataclasses.dataclass
+class ExportStats:
+    """Report of an export run."""
+
+    written: int = 0
+    """Number of files which were (re)written."""
+    skipped: int = 0
+    """Number of files which were unchanged and therefore skipped."""
+    deleted: int = 0
+    """Number of stale files which were removed."""
+
+    def __str__(self) -> str:
+        return f"{self.written} written, {self.skipped} unchanged, {self.deleted} deleted"
+
+
 class MarkdownExporter:
-    """Writes markdown files with per-file metadata sidecars."""
+    """Writes markdown files together with their metadata.
 
-    def __init__(self, metadata_suffix: str = ".meta.yaml") -> None:
+    Metadata gets written either as a YAML sidecar per file plus a combined metadata
+    file (`sidecar`), or as one consolidated JSON index (`index`, see `MetadataIndex`).
+
+    Files get written through a thread pool, local files atomically via a temporary
+    file which gets renamed. In incremental mode, the content hashes of all written
+    files are kept in a manifest in the target directory. Files whose content did not
+    change are not touched (keeping their mtime), and files which were written by the
+    previous export but are not part of the current one get deleted.
+    """
+
+    def __init__(
+        self,
+        metadata_suffix: str = ".meta.yaml",
+        incremental: bool = False,
+        max_workers: int | None = None,
+        metadata_format: MetadataFormatStr = "sidecar",
+    ) -> None:
         """Constructor.
 
         Args:
             metadata_suffix: Suffix for metadata sidecar files.
+            incremental: Only write changed files and remove stale ones.
+            max_workers: Maximum number of writer threads.
+            metadata_format: Write a YAML sidecar per file (`sidecar`)
+                             or a consolidated JSON index (`index`).
         """
+        if metadata_format not in METADATA_FORMATS:
+            msg = f"Invalid metadata format {metadata_format!r}. Allowed: {METADATA_FORMATS}"
+            raise ValueError(msg)
         self.metadata_suffix = metadata_suffix
+        self.metadata_format = metadata_format
+        self.incremental = incremental
+        self.max_workers = max_workers
+        self.stats = ExportStats()
+        """Report of the last export."""
 
     async def export(self, output: BuildOutput, target: Path) -> None:
         """Export build output to target directory.
@@ -41,41 +119,109 @@ class MarkdownExporter:
             output: Build output to export.
             target: Target directory for output files.
         """
+        index = self._get_index()
+        async with self._get_writer(target) as writer:
+            for file_path, content in output.files.items():
+                file_resources = output.file_resources.get(file_path)
+                await self._write_file(writer, index, file_path, content, file_resources)
+            await self._write_combined_metadata(
+                writer, index, output.merged_resources, output.nav_structure
+            )
+
+    async def export_stream(
+        self,
+        results: AsyncIterable[PageResult],
+        target: Path,
+        nav_structure: dict[str, Any] | None = None,
+    ) -> int:
+        """Write results to the target directory as soon as they arrive.
+
+        Streaming counterpart of `export`, meant to be used with `DocBuilder.iter_build`.
+        Only the merged resources are kept in memory.
+
+        Args:
+            results: Results to write (usually from `DocBuilder.iter_build`).
+            target: Target directory for output files.
+            nav_structure: Navigation structure for the combined metadata file.
+
+        Returns:
+            The number of written files.
+        """
+        merged = resources.ResourceAccumulator()
+        index = self._get_index()
+        count = 0
+        async with self._get_writer(target) as writer:
+            async for result in results:
+                await self._write_file(writer, index, result.path, result.content, result.resources)
+                merged.add(result.resources)
+                count += 1
+            await self._write_combined_metadata(writer, index, merged.to_resources(), nav_structure)
+        return count
+
+    def _get_index(self) -> metadataindex.MetadataIndex | None:
+        return metadataindex.MetadataIndex() if self.metadata_format == "index" else None
+
+    @contextlib.asynccontextmanager
+    async def _get_writer(self, target: Path) -> AsyncIterator[Writer]:
         target_path = upath.UPath(target)
         target_path.mkdir(parents=True, exist_ok=True)
+        writer = FileWriter(target_path, incremental=self.incremental, max_workers=self.max_workers)
+        try:
+            yield writer
+            await writer.finish()
+        finally:
+            writer.close()
+        self.stats = writer.stats
+        logger.info("Exported to %s: %s", target, writer.stats)
 
-        for file_path, content in output.files.items():
-            full_path = target_path / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            if isinstance(content, bytes):
-                full_path.write_bytes(content)
-            else:
-                full_path.write_text(content, encoding="utf-8")
-            # Write metadata sidecar with per-file resources
-            metadata: dict[str, Any] = {"generated_by": "mknodes", "path": file_path}
-            if file_resources := output.file_resources.get(file_path):
-                metadata["resources"] = self._serialize_resources(file_resources)
-            meta_path = full_path.with_suffix(full_path.suffix + self.metadata_suffix)
-            meta_path.write_text(yamling.dump_yaml(metadata, indent=2), encoding="utf-8")
-
-        # Write combined metadata file
+    async def _write_file(
+        self,
+        writer: Writer,
+        index: metadataindex.MetadataIndex | None,
+        file_path: str,
+        content: str | bytes,
+        file_resources: resources.Resources | None,
+    ) -> None:
+        """Write a file together with its metadata sidecar (or add it to the index)."""
+        await writer.write(file_path, content)
+        if index is not None:
+            index.add(file_path, file_resources)
+            return
+        # Write metadata sidecar with per-file resources
+        metadata: dict[str, Any] = {"generated_by": "mknodes", "path": file_path}
+        if file_resources and self._has_resources(file_resources):
+            metadata["resources"] = self._serialize_resources(file_resources)
+        await writer.write(file_path + self.metadata_suffix, yamling.dump_yaml(metadata, indent=2))
+
+    async def _write_combined_metadata(
+        self,
+        writer: Writer,
+        index: metadataindex.MetadataIndex | None,
+        merged: resources.Resources,
+        nav_structure: dict[str, Any] | None,
+    ) -> None:
+        """Write the combined metadata file (or the metadata index)."""
+        if index is not None:
+            await writer.write(INDEX_FILE, index.dumps(merged, nav_structure))
+            return
         meta: dict[str, Any] = {}
-        merged = output.merged_resources
-        if any([
-            merged.markdown_extensions,
-            merged.css,
-            merged.js,
-            merged.plugins,
-            merged.packages,
-        ]):
+        if self._has_resources(merged):
             meta["resources"] = self._serialize_resources(merged)
-        if output.nav_structure:
-            meta["nav"] = output.nav_structure
+        if nav_structure:
+            meta["nav"] = nav_structure
         if meta:
-            meta_path = target_path / ".mknodes.meta.yaml"
-            meta_path.write_text(yamling.dump_yaml(meta, indent=2), encoding="utf-8")
+            await writer.write(".mknodes.meta.yaml", yamling.dump_yaml(meta, indent=2))
+
+    def _has_resources(self, res: resources.Resources) -> bool:
+        return any([
+            res.markdown_extensions,
+            res.css,
+            res.js,
+            res.plugins,
+            res.packages,
+        ])
 
-    def _serialize_resources(self, res: Resources) -> dict[str, Any]:
+    def _serialize_resources(self, res: resources.Resources) -> dict[str, Any]:
         """Serialize a Resources object to a dict."""
         return {
             "markdown_extensions": res.markdown_extensions,
@@ -84,3 +230,101 @@ class MarkdownExporter:
             "plugins": res.plugins,
             "packages": res.packages,
         }
+
+
+class FileWriter:
+    """Writes files below a target directory through a thread pool.
+
+    In incremental mode, unchanged files (according to the manifest of the previous
+    run) are skipped and files missing from the current run get deleted on `finish`.
+    """
+
+    def __init__(
+        self,
+        target: upath.UPath,
+        incremental: bool = False,
+        max_workers: int | None = None,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            target: Directory to write to.
+            incremental: Skip unchanged files and delete stale ones.
+            max_workers: Maximum number of writer threads.
+        """
+        self.target = target
+        self.incremental = incremental
+        self.stats = ExportStats()
+        self.manifest: dict[str, str] = {}
+        """Mapping of relative file path -> content hash of the current run."""
+        self._previous = self._load_manifest() if incremental else {}
+        self._is_local = target.protocol in ("", "file", "local")
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="mknodes-export")
+        self._max_in_flight = 2 * max_workers if max_workers else MAX_PENDING_WRITES
+        self._in_flight: set[asyncio.Future[None]] = set()
+
+    async def write(self, path: str, content: str | bytes) -> None:
+        """Schedule writing a file, waiting if too many writes are pending.
+
+        Args:
+            path: Path relative to the target directory.
+            content: File content.
+        """
+        data = content.encode() if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        self.manifest[path] = digest
+        if self._previous.get(path) == digest and (self.target / path).exists():
+            self.stats.skipped += 1
+            return
+        loop = asyncio.get_running_loop()
+        self._in_flight.add(loop.run_in_executor(self._pool, self._write, path, data))
+        self.stats.written += 1
+        if len(self._in_flight) >= self._max_in_flight:
+            done, self._in_flight = await asyncio.wait(
+                self._in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                future.result()
+
+    async def finish(self) -> None:
+        """Wait for pending writes, remove stale files and store the manifest."""
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+        self._in_flight.clear()
+        if not self.incremental:
+            return
+        for path in self._previous.keys() - self.manifest.keys():
+            (self.target / path).unlink(missing_ok=True)
+            self.stats.deleted += 1
+        manifest = json.dumps(dict(sorted(self.manifest.items())), indent=0)
+        self._write(MANIFEST_FILE, manifest.encode())
+
+    def close(self) -> None:
+        for future in self._in_flight:
+            future.cancel()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _load_manifest(self) -> dict[str, str]:
+        path = self.target / MANIFEST_FILE
+        try:
+            return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        except (OSError, ValueError):
+            logger.warning("Could not read export manifest %s, writing all files", path)
+            return {}
+
+    def _write(self, path: str, data: bytes) -> None:
+        full_path = self.target / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._is_local:
+            full_path.write_bytes(data)
+            return
+        # rename a fully written temporary file so that readers never see partial files
+        local_path = pathlib.Path(full_path)
+        tmp_name = f".{local_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_path = local_path.with_name(tmp_name)
+        try:
+            tmp_path.write_bytes(data)
+            tmp_path.replace(local_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
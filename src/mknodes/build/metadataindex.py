@@ -0,0 +1,134 @@
+"""Consolidated metadata index for exported files."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from mknodes.utils import resources
+
+
+INDEX_VERSION = 1
+
+
+class MetadataIndex:
+    """Maps file paths to their resources, storing every distinct resource only once.
+
+    Resource entries (a markdown extension with its config, a CSS file, a plugin, ...)
+    get interned into a shared entry list, files only reference entry indexes.
+    Since most pages require the same extensions and stylesheets, this is a lot
+    smaller than a sidecar file per page.
+
+    Format:
+        ``` json
+        {
+          "version": 1,
+          "generated_by": "mknodes",
+          "entries": [{"kind": "markdown_extensions", "name": "tables", "config": {}}],
+          "files": {"index.md": {"markdown_extensions": [0]}, "SUMMARY.md": {}},
+          "resources": {"markdown_extensions": [0]},
+          "nav": {}
+        }
+        ```
+    """
+
+    def __init__(self) -> None:
+        self.entries: list[dict[str, Any]] = []
+        """Interned resource entries."""
+        self.files: dict[str, dict[str, list[int]]] = {}
+        """Mapping of file path -> resource kind -> entry indexes."""
+        self._ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(files={len(self.files)}, entries={len(self.entries)})"
+
+    def add(self, path: str, res: resources.Resources | None = None) -> None:
+        """Add a file to the index.
+
+        Args:
+            path: Path of the file.
+            res: Resources of the file.
+        """
+        self.files[path] = self.intern(res) if res else {}
+
+    def intern(self, res: resources.Resources) -> dict[str, list[int]]:
+        """Intern all entries of given resources, returning their indexes per kind.
+
+        Args:
+            res: Resources to intern.
+        """
+        refs: dict[str, list[int]] = {}
+        for kind, entry in _iter_entries(res):
+            key = json.dumps(entry, sort_keys=True, default=_to_jsonable)
+            if (index := self._ids.get(key)) is None:
+                index = self._ids[key] = len(self.entries)
+                self.entries.append(entry)
+            refs.setdefault(kind, []).append(index)
+        return refs
+
+    def to_dict(
+        self,
+        merged: resources.Resources | None = None,
+        nav_structure: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Return the index as a JSON-serializable dictionary.
+
+        Args:
+            merged: Merged resources of the whole build.
+            nav_structure: Navigation structure of the build.
+        """
+        # intern first, merged resources may contain entries no single file has
+        merged_refs = self.intern(merged) if merged else {}
+        return {
+            "version": INDEX_VERSION,
+            "generated_by": "mknodes",
+            "entries": self.entries,
+            "files": dict(sorted(self.files.items())),
+            "resources": merged_refs,
+            "nav": nav_structure or {},
+        }
+
+    def dumps(
+        self,
+        merged: resources.Resources | None = None,
+        nav_structure: dict[str, Any] | None = None,
+    ) -> str:
+        """Return the index serialized as compact JSON.
+
+        Args:
+            merged: Merged resources of the whole build.
+            nav_structure: Navigation structure of the build.
+        """
+        data = self.to_dict(merged, nav_structure)
+        return json.dumps(data, separators=(",", ":"), default=_to_jsonable)
+
+
+def _iter_entries(res: resources.Resources) -> Iterator[tuple[str, dict[str, Any]]]:
+    for name, config in res.markdown_extensions.items():
+        yield "markdown_extensions", {"kind": "markdown_extensions", "name": name, "config": config}
+    for css in res.css:
+        yield "css", {"kind": "css", "type": type(css).__name__, **dataclasses.asdict(css)}
+    for js in res.js:
+        yield "js", {"kind": "js", "type": type(js).__name__, **dataclasses.asdict(js)}
+    for plugin in res.plugins:
+        yield "plugins", {"kind": "plugins", "name": plugin.plugin_name, "config": dict(plugin)}
+    for package in res.packages:
+        yield "packages", {"kind": "packages", **dataclasses.asdict(package)}
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """Fallback for objects json cannot handle (like the emoji functions in configs)."""
+    match obj:
+        case set() | frozenset():
+            return sorted(obj, key=str)
+        case _ if callable(obj) and hasattr(obj, "__qualname__"):
+            return f"{obj.__module__}.{obj.__qualname__}"
+    return str(obj)
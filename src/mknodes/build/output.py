@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from mknodes.utils import resources
 
 
+if TYPE_CHECKING:
+    from mknodes.build.cache import CacheStats
+
+
 @dataclasses.dataclass
 class BuildOutput:
     """Result of building a documentation tree."""
@@ -24,13 +28,13 @@ class BuildOutput:
     page_count: int = 0
     """Number of pages built."""
 
+    cache_stats: CacheStats | None = None
+    """Hit / miss report of the build cache (if caching was enabled)."""
+
     @property
     def merged_resources(self) -> resources.Resources:
         """Return all resources merged into one."""
-        merged = resources.Resources()
-        for res in self.file_resources.values():
-            merged.merge(res)
-        return merged
+        return resources.ResourceAccumulator(*self.file_resources.values()).to_resources()
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}(files={len(self.files)}, pages={self.page_count})"
@@ -0,0 +1,287 @@
+"""Per-node profiling of documentation builds."""
+
+from __future__ import annotations
+
+import collections
+import contextvars
+import dataclasses
+import functools
+import inspect
+import json
+import pathlib
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Self
+
+from mknodes.utils import log
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    import os
+
+    type LabelFn = Callable[[Any, str, tuple[Any, ...]], str]
+
+
+logger = log.get_logger(__name__)
+
+NODE_METHODS = ("get_content", "to_md_unprocessed", "_build_node_resources")
+"""MkNode methods which get timed per node class."""
+JINJA_METHODS = ("render_string", "render_string_async", "render_template", "render_template_async")
+"""NodeEnvironment methods which get timed."""
+
+_stack: contextvars.ContextVar[tuple[str, ...]] = contextvars.ContextVar(
+    "profiler_stack", default=()
+)
+_owner: contextvars.ContextVar[int] = contextvars.ContextVar("profiler_owner", default=0)
+_active_profiler: BuildProfiler | None = None
+
+
+@dataclasses.dataclass
+class ProfileStat:
+    """Aggregated measurements for one profiled operation."""
+
+    calls: int = 0
+    """Number of calls."""
+    total_time: float = 0.0
+    """Accumulated wall time in seconds (including nested operations)."""
+    output_size: int = 0
+    """Accumulated size of the produced markdown / text."""
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "total_time": round(self.total_time, 6),
+            "output_size": self.output_size,
+        }
+
+
+class BuildProfiler:
+    """Records wall time, call counts and output size per node class and per page.
+
+    While active, the profiler wraps the relevant methods of MkNode (and all
+    subclasses overriding them), the text processors, the NodeEnvironment render
+    methods and the page rendering of the DocBuilder. The wrappers are removed
+    again on exit, so there is no overhead at all while profiling is disabled.
+
+    Times are wall times. With concurrent page rendering, the time of a node
+    also contains the time other tasks ran on the same event loop.
+
+    Examples:
+        ``` py
+        with BuildProfiler() as profiler:
+            await DocBuilder().build(root)
+        profiler.write("build_profile")
+        ```
+    """
+
+    def __init__(self) -> None:
+        self.node_stats: dict[str, ProfileStat] = collections.defaultdict(ProfileStat)
+        """Stats per `NodeClass.method` / processor / jinja operation."""
+        self.page_stats: dict[str, ProfileStat] = collections.defaultdict(ProfileStat)
+        """Stats per page path."""
+        self._stack_times: collections.Counter[tuple[str, ...]] = collections.Counter()
+        self._child_times: collections.Counter[tuple[str, ...]] = collections.Counter()
+        self._originals: list[tuple[type, str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(operations={len(self.node_stats)})"
+
+    def __enter__(self) -> Self:
+        self.install()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.uninstall()
+
+    def install(self) -> None:
+        """Wrap all profiled methods."""
+        global _active_profiler
+        from mknodes.basenodes import mknode, processors
+        from mknodes.build import builder
+        from mknodes.jinja import nodeenvironment
+
+        if _active_profiler is not None:
+            msg = "Another BuildProfiler is already active"
+            raise RuntimeError(msg)
+        _active_profiler = self
+        for kls in _iter_subclasses(mknode.MkNode):
+            for name in NODE_METHODS:
+                self._patch(kls, name)
+        for kls in _iter_subclasses(processors.TextProcessor):
+            self._patch(kls, "run", label_fn=_processor_label)
+        for name in JINJA_METHODS:
+            self._patch(nodeenvironment.NodeEnvironment, name, label_fn=_jinja_label)
+        self._patch(builder.DocBuilder, "_render_page", label_fn=_page_label)
+
+    def uninstall(self) -> None:
+        """Restore all wrapped methods."""
+        global _active_profiler
+        for kls, name, original in reversed(self._originals):
+            setattr(kls, name, original)
+        self._originals.clear()
+        if _active_profiler is self:
+            _active_profiler = None
+
+    def _patch(
+        self,
+        kls: type,
+        name: str,
+        label_fn: LabelFn | None = None,
+    ) -> None:
+        if name not in vars(kls):
+            return
+        original = vars(kls)[name]
+        label_fn = label_fn or _node_label
+        wrapper = (
+            self._wrap_async(original, name, label_fn)
+            if inspect.iscoroutinefunction(original)
+            else self._wrap_sync(original, name, label_fn)
+        )
+        self._originals.append((kls, name, original))
+        setattr(kls, name, wrapper)
+
+    def _wrap_async(
+        self,
+        fn: Callable[..., Any],
+        name: str,
+        label_fn: LabelFn,
+    ) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        async def wrapper(obj: Any, *args: Any, **kwargs: Any) -> Any:
+            label = label_fn(obj, name, args)
+            stack = _stack.get()
+            # super() calls of the same operation count as one frame
+            if stack and stack[-1] == label and _owner.get() == id(obj):
+                return await fn(obj, *args, **kwargs)
+            token = _stack.set((*stack, label))
+            owner_token = _owner.set(id(obj))
+            start = time.perf_counter()
+            result = None
+            try:
+                result = await fn(obj, *args, **kwargs)
+            finally:
+                _owner.reset(owner_token)
+                _stack.reset(token)
+                self._record(label, (*stack, label), time.perf_counter() - start, result)
+            return result
+
+        return wrapper
+
+    def _wrap_sync(
+        self,
+        fn: Callable[..., Any],
+        name: str,
+        label_fn: LabelFn,
+    ) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(obj: Any, *args: Any, **kwargs: Any) -> Any:
+            label = label_fn(obj, name, args)
+            stack = _stack.get()
+            if stack and stack[-1] == label and _owner.get() == id(obj):
+                return fn(obj, *args, **kwargs)
+            token = _stack.set((*stack, label))
+            owner_token = _owner.set(id(obj))
+            start = time.perf_counter()
+            result = None
+            try:
+                result = fn(obj, *args, **kwargs)
+            finally:
+                _owner.reset(owner_token)
+                _stack.reset(token)
+                self._record(label, (*stack, label), time.perf_counter() - start, result)
+            return result
+
+        return wrapper
+
+    def _record(self, label: str, stack: tuple[str, ...], elapsed: float, result: Any) -> None:
+        size = _get_size(result)
+        with self._lock:
+            stats = self.page_stats if label.startswith("page:") else self.node_stats
+            stat = stats[label.removeprefix("page:")]
+            stat.calls += 1
+            stat.total_time += elapsed
+            stat.output_size += size
+            self._stack_times[stack] += elapsed
+            if len(stack) > 1:
+                self._child_times[stack[:-1]] += elapsed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable report, sorted by total time."""
+
+        def sort(stats: dict[str, ProfileStat]) -> dict[str, Any]:
+            items = sorted(stats.items(), key=lambda kv: kv[1].total_time, reverse=True)
+            return {k: v.as_dict() for k, v in items}
+
+        return {"nodes": sort(self.node_stats), "pages": sort(self.page_stats)}
+
+    def to_collapsed_stacks(self) -> str:
+        """Return the self times in collapsed-stack format (flamegraph.pl, speedscope).
+
+        Each line contains the `;`-separated stack and the self time in microseconds.
+        """
+        lines = []
+        for stack, total in sorted(self._stack_times.items()):
+            self_time = max(total - self._child_times[stack], 0.0)
+            if micros := round(self_time * 1_000_000):
+                frames = ";".join(frame.replace(";", ",").replace(" ", "_") for frame in stack)
+                lines.append(f"{frames} {micros}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path: str | os.PathLike[str]) -> tuple[pathlib.Path, pathlib.Path]:
+        """Write the JSON report and the collapsed-stack file.
+
+        Args:
+            path: Path prefix. `.json` and `.collapsed` get appended.
+
+        Returns:
+            The paths of the JSON report and of the collapsed-stack file.
+        """
+        base = pathlib.Path(path)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        json_path = base.with_name(base.name + ".json")
+        stack_path = base.with_name(base.name + ".collapsed")
+        json_path.write_text(json.dumps(self.as_dict(), indent=2), encoding="utf-8")
+        stack_path.write_text(self.to_collapsed_stacks(), encoding="utf-8")
+        logger.info("Wrote build profile to %s and %s", json_path, stack_path)
+        return json_path, stack_path
+
+
+def _node_label(obj: Any, name: str, _args: tuple[Any, ...]) -> str:
+    return f"{type(obj).__name__}.{name}"
+
+
+def _processor_label(obj: Any, _name: str, _args: tuple[Any, ...]) -> str:
+    return f"processor:{type(obj).__name__}"
+
+
+def _jinja_label(_obj: Any, name: str, _args: tuple[Any, ...]) -> str:
+    return f"jinja:{name}"
+
+
+def _page_label(_obj: Any, _name: str, args: tuple[Any, ...]) -> str:
+    return f"page:{args[0].resolved_file_path}"
+
+
+def _get_size(result: Any) -> int:
+    match result:
+        case str() | bytes():
+            return len(result)
+        case _ if isinstance(md := getattr(result, "markdown", None), str):
+            return len(md)
+        case _ if isinstance(content := getattr(result, "content", None), str | bytes):
+            return len(content)
+    return 0
+
+
+def _iter_subclasses(kls: type) -> Iterator[type]:
+    seen: set[type] = set()
+    todo = [kls]
+    while todo:
+        klass = todo.pop()
+        if klass in seen:
+            continue
+        seen.add(klass)
+        yield klass
+        todo.extend(klass.__subclasses__())
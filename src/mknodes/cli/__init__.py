@@ -3,17 +3,19 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import logging
 import sys
 from pathlib import Path
 
-import jinjarope
 import typer as t
 import logfire
 from mknodes.utils import classhelpers, log
 import mknodes as mk
-from mknodes.info import contexts, folderinfo, reporegistry
-from mknodes.info.linkprovider import LinkProvider
+from mknodes.build.builder import EXECUTORS, ExecutorStr
+from mknodes.build.exporter import METADATA_FORMATS, MetadataFormatStr
+from mknodes.info import bootstrap, griffecache, grifferegistry
 
 
 logger = log.get_logger(__name__)
@@ -26,7 +28,7 @@ cli = t.Typer(
 
 
 SCRIPT_HELP = "Path to build script (format: `path.to.module:function`)."
-OUTPUT_HELP = "Output directory for generated markdown files."
+OUTPUT_HELP = "Output directory for generated markdown files (or a .zip / .tar.gz archive)."
 REPO_HELP = "Repository URL or local path for context."
 RENDER_JINJA_HELP = "Render Jinja templates in pages."
 VERBOSE_HELP = "Enable verbose output (DEBUG level)."
@@ -37,6 +39,11 @@ OUTPUT_FILE_HELP = "Output file (use - for stdout, default)."
 OUTPUT_DIR_HELP = "Output directory for rendered files."
 GLOB_HELP = "Glob pattern for files to render as Jinja templates."
 COPY_OTHER_HELP = "Copy files not matching the glob pattern as-is."
+INCREMENTAL_HELP = "Reuse cached pages whose subtree did not change and only write changed files."
+CACHE_DIR_HELP = "Directory for the incremental build cache."
+PROFILE_HELP = "Profile the build and write `<PATH>.json` and `<PATH>.collapsed` reports."
+METADATA_FORMAT_HELP = "Write metadata as YAML `sidecar` files or as one JSON `index`."
+EXECUTOR_HELP = "Schedule pages in a `thread` pool, a `process` pool or as `async` tasks."
 WORKERS_HELP = "Number of parallel workers for page processing. Set PYTHON_GIL=0 for best performance with Python 3.14t."
 
 SCRIPT_CMDS = "-s", "--script"
@@ -48,6 +55,7 @@ INPUT_CMDS = "-i", "--input"
 OUTPUT_FILE_CMDS = "-o", "--output"
 GLOB_CMDS = "-g", "--glob"
 WORKERS_CMDS = "-w", "--workers"
+EXECUTOR_CMDS = "-e", "--executor"
 
 
 def verbose_callback(ctx: t.Context, _param: t.CallbackParam, value: bool) -> None:
@@ -67,6 +75,11 @@ def build(
     repo_url: str | None = t.Option(None, *REPO_CMDS, help=REPO_HELP, show_default=False),
     render_jinja: bool = t.Option(True, "--render-jinja/--no-render-jinja", help=RENDER_JINJA_HELP),
     workers: int | None = t.Option(None, *WORKERS_CMDS, help=WORKERS_HELP),
+    incremental: bool = t.Option(False, "--incremental/--no-incremental", help=INCREMENTAL_HELP),
+    cache_dir: Path = t.Option(Path(".mknodes_cache"), "--cache-dir", help=CACHE_DIR_HELP),  # noqa: B008
+    executor: str = t.Option("thread", *EXECUTOR_CMDS, help=EXECUTOR_HELP),
+    metadata_format: str = t.Option("sidecar", "--metadata-format", help=METADATA_FORMAT_HELP),
+    profile: Path | None = t.Option(None, "--profile", help=PROFILE_HELP, show_default=False),  # noqa: B008
     _verbose: bool = t.Option(False, *VERBOSE_CMDS, help=VERBOSE_HELP, callback=verbose_callback),
     _quiet: bool = t.Option(False, *QUIET_CMDS, help=QUIET_HELP, callback=quiet_callback),
 ) -> None:
@@ -77,64 +90,126 @@ def build(
     For best parallel performance with Python 3.14t (free-threaded), run with:
         PYTHON_GIL=0 mknodes build -s mypackage.docs:build
 
+    For CPU-bound builds on regular CPython, render in worker processes:
+        mknodes build -s mypackage.docs:build --workers 8 --executor process
+
+    To find out which nodes dominate the build time (not supported for processes):
+        mknodes build -s mypackage.docs:build --profile build_profile
+
     Example:
         mknodes build -s mypackage.docs:build -o ./docs
+        mknodes build -s mypackage.docs:build -o ./docs --incremental
+        mknodes build -s mypackage.docs:build -o ./site.tar.gz
     """
+    if executor not in EXECUTORS:
+        logger.error("Invalid executor %r. Allowed values: %s", executor, ", ".join(EXECUTORS))
+        raise SystemExit(1)
+    if metadata_format not in METADATA_FORMATS:
+        msg = "Invalid metadata format %r. Allowed values: %s"
+        logger.error(msg, metadata_format, ", ".join(METADATA_FORMATS))
+        raise SystemExit(1)
     logfire.configure()
-    asyncio.run(_build_async(script, output, repo_url, render_jinja, workers))
+    coro = _build_async(
+        script,
+        output,
+        repo_url,
+        render_jinja,
+        workers,
+        cache_dir=cache_dir if incremental else None,
+        executor=executor,  # type: ignore[arg-type]
+        profile_path=profile,
+        incremental=incremental,
+        metadata_format=metadata_format,  # type: ignore[arg-type]
+    )
+    asyncio.run(coro)
 
 
-async def _build_async(
-    script: str,
-    output: Path,
-    repo_url: str | None,
-    render_jinja: bool,
-    max_workers: int | None,
-) -> None:
-    """Async implementation of build command."""
-    from mknodes.build import DocBuilder, MarkdownExporter
+def _get_context_bootstrap(cache_dir: Path | None = None) -> bootstrap.ContextBootstrap:
+    return bootstrap.ContextBootstrap(
+        clone_depth=50,
+        theme="material",
+        snapshot_dir=cache_dir / "metadata" if cache_dir else None,
+    )
+
 
+def create_root(
+    script: str,
+    cache_dir: Path | None = None,
+    context_bootstrap: bootstrap.ContextBootstrap | None = None,
+) -> mk.MkNav:
+    """Create a root nav with project context and populate it using the build script.
+
+    Module-level (and therefore picklable) so that worker processes can use it
+    to rebuild the tree.
+
+    Args:
+        script: Path to build script (format: `path.to.module:function`).
+        cache_dir: Build cache directory. If set, project metadata and Griffe modules
+                   get reused from snapshots stored in there.
+        context_bootstrap: Bootstrap to create the context with. Defaults to one
+                           using the cache dir for metadata snapshots.
+    """
     logger.info("Loading build script: %s", script)
     build_fn = classhelpers.to_callable(script)
+    if cache_dir:
+        grifferegistry.registry.set_cache(griffecache.ModuleCache(cache_dir / "griffe"))
 
-    linkprovider = LinkProvider(
-        base_url="",
-        use_directory_urls=True,
-        include_stdlib=True,
-    )
-    theme = mk.Theme.get_theme(theme_name="material")
-    git_repo = reporegistry.get_repo(".", clone_depth=50)
-    assert theme
-    info = folderinfo.FolderInfo(git_repo.working_dir)
-    context = contexts.ProjectContext(
-        metadata=info.context,
-        git=info.git.context,
-        theme=theme.context,
-        links=linkprovider,
-        env_config=jinjarope.EnvConfig(loader=contexts.DEFAULT_LOADER),
-    )
+    context_bootstrap = context_bootstrap or _get_context_bootstrap(cache_dir)
+    context = context_bootstrap.run()
+    logger.info("Created project context (%s)", context_bootstrap.get_report())
     root = mk.MkNav(context=context)
 
     logger.info("Executing build script...")
     result = build_fn(root)
 
     # Handle both styles: function modifies root in-place, or returns new nav
-    if result is not None:
-        root = result
+    return root if result is None else result
 
-    logger.info("Building documentation tree...")
-    builder = DocBuilder(render_jinja=render_jinja, max_workers=max_workers)
-    build_output = await builder.build(root)
 
-    logger.info("Exporting to %s...", output)
-    exporter = MarkdownExporter()
-    await exporter.export(build_output, output)
+async def _build_async(
+    script: str,
+    output: Path,
+    repo_url: str | None,
+    render_jinja: bool,
+    max_workers: int | None,
+    cache_dir: Path | None = None,
+    executor: ExecutorStr = "thread",
+    profile_path: Path | None = None,
+    incremental: bool = False,
+    metadata_format: MetadataFormatStr = "sidecar",
+) -> None:
+    """Async implementation of build command."""
+    from mknodes.build import ArchiveExporter, BuildProfiler, DocBuilder, MarkdownExporter
+    from mknodes.build.archive import get_archive_format
+    from mknodes.navs import navigation
 
-    logger.info(
-        "Build complete: %d files, %d pages",
-        len(build_output.files),
-        build_output.page_count,
+    context_bootstrap = _get_context_bootstrap(cache_dir)
+    root = create_root(script, cache_dir, context_bootstrap)
+    logger.info("Building documentation tree...")
+    builder = DocBuilder(
+        render_jinja=render_jinja,
+        max_workers=max_workers,
+        cache_dir=cache_dir,
+        executor=executor,
+        tree_factory=functools.partial(create_root, script, cache_dir),
+    )
+    logger.info("Exporting to %s...", output)
+    exporter = (
+        ArchiveExporter(metadata_format=metadata_format)
+        if get_archive_format(output)
+        else MarkdownExporter(incremental=incremental, metadata_format=metadata_format)
     )
+    # stream results to disk so that memory usage does not grow with the site size
+    nav_tree = navigation.build_nav_tree(root)
+    results = builder.iter_build(root, nav_tree=nav_tree)
+    profiler = BuildProfiler() if profile_path else None
+    with profiler or contextlib.nullcontext():
+        count = await exporter.export_stream(results, output, nav_structure=nav_tree.nav_dict)
+    logger.info("Build complete: %d files", count)
+    # only now all metadata used by the build is resolved
+    context_bootstrap.store_snapshot()
+    if profiler and profile_path:
+        profiler.write(profile_path)
 
 
 @cli.command()
@@ -73,6 +73,16 @@ class Tool:
         return cls(**dct)
 
 
+def get_config_filenames() -> list[str]:
+    """Return the names of all config files which tools get detected by."""
+    return [
+        cfg["filename"]
+        for file in (paths.RESOURCES / "toolfiles").iterdir()
+        for cfg in Tool.from_file(file).configs
+        if "filename" in cfg
+    ]
+
+
 def get_tools_for_folder(folder: FolderInfo) -> list[Tool]:
     tools = []
     for file in (paths.RESOURCES / "toolfiles").iterdir():
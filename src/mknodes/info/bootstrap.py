@@ -0,0 +1,184 @@
+"""Concurrent creation of project contexts."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import dataclasses
+import time
+from typing import TYPE_CHECKING, Any
+
+import jinjarope
+
+from mknodes.info import contexts, folderinfo, linkprovider, reporegistry
+from mknodes.utils import log
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    import os
+
+    from mknodes.info import gitrepository
+
+
+logger = log.get_logger(__name__)
+
+PREFETCH_CONTEXTS = {"metadata": contexts.PackageContext, "git": contexts.GitContext}
+
+
+class ContextBootstrap:
+    """Creates a ProjectContext, running independent parts concurrently on threads.
+
+    The parts are:
+
+    - `repository`: opening (or cloning) the git repository
+    - `folder`: reading the project metadata (see `FolderInfo`)
+    - `theme`: creating the theme context
+    - `links`: creating the link provider (loads the stdlib inventory)
+    - `inventories` (optional): downloading the inventories of the project
+    - `metadata.<field>` / `git.<field>` (optional): resolving (lazy) context fields
+      ahead of time, for example the ones listed by `ProjectContext.get_access_trace`
+      of a previous build
+
+    Theme and links get created while repository and folder get loaded,
+    inventories and prefetched fields get resolved concurrently afterwards.
+    The wall time of each part (and the `total`) is recorded in `timings`.
+
+    Examples:
+        ``` py
+        bootstrap = ContextBootstrap(theme="material", prefetch=["metadata.griffe_module"])
+        context = bootstrap.run()
+        print(bootstrap.get_report())
+        ```
+    """
+
+    def __init__(
+        self,
+        repo_url: str | os.PathLike[str] = ".",
+        clone_depth: int = 100,
+        base_url: str = "",
+        use_directory_urls: bool = True,
+        theme: contexts.ThemeContext | str | None = None,
+        env_config: jinjarope.EnvConfig | None = None,
+        snapshot_dir: str | os.PathLike[str] | None = None,
+        prefetch: Iterable[str] = (),
+        load_inventories: bool = False,
+        max_workers: int | None = None,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            repo_url: URL / path of the repository
+            clone_depth: Amount of commits to fetch if the repository is remote
+            base_url: Base URL of the website
+            use_directory_urls: Use directory-style URLs
+            theme: Theme context or name of the theme to create the context for
+            env_config: Jinja environment config
+            snapshot_dir: Directory for metadata snapshots (see `FolderInfo`)
+            prefetch: Context fields to resolve ahead of time (like `metadata.version`)
+            load_inventories: Whether to download the inventories of the project
+            max_workers: Maximum number of threads
+        """
+        self.prefetch = list(prefetch)
+        for path in self.prefetch:
+            name, _, field = path.partition(".")
+            klass = PREFETCH_CONTEXTS.get(name)
+            if klass is None or field not in {f.name for f in dataclasses.fields(klass)}:
+                msg = f"Invalid field {path!r}. Use metadata.<field> or git.<field>"
+                raise ValueError(msg)
+        self.repo_url = repo_url
+        self.clone_depth = clone_depth
+        self.base_url = base_url
+        self.use_directory_urls = use_directory_urls
+        self.theme = theme
+        self.env_config = env_config or jinjarope.EnvConfig(loader=contexts.DEFAULT_LOADER)
+        self.snapshot_dir = snapshot_dir
+        self.load_inventories = load_inventories
+        self.max_workers = max_workers
+        self.timings: dict[str, float] = {}
+        """Part name -> wall time in seconds."""
+        self.folder_info: folderinfo.FolderInfo | None = None
+        """The folder info of the last run."""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.repo_url!r})"
+
+    def run(self) -> contexts.ProjectContext:
+        """Create the project context."""
+        self.timings.clear()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            theme = pool.submit(self._timed, "theme", self._get_theme)
+            links = pool.submit(self._timed, "links", self._get_links)
+            repo = self._timed("repository", self._get_repository)
+            path = repo.working_dir if repo else "."
+            info = self._timed("folder", folderinfo.FolderInfo, path, self.snapshot_dir)
+            self.folder_info = info
+            context = contexts.ProjectContext(
+                metadata=info.context,
+                git=info.git.context,
+                theme=theme.result(),
+                links=links.result(),
+                env_config=self.env_config,
+            )
+            jobs = {
+                name: pool.submit(self._timed, name, self._resolve, context, name)
+                for name in self.prefetch
+            }
+            if self.load_inventories:
+                coro = context.populate_linkprovider()
+                jobs["inventories"] = pool.submit(self._timed, "inventories", asyncio.run, coro)
+            for name, job in jobs.items():
+                try:
+                    job.result()
+                except Exception as e:  # noqa: BLE001
+                    logger.warning("Could not resolve %s: %s", name, e)
+        self.timings["total"] = time.perf_counter() - start
+        logger.debug("Context bootstrap: %s", self.get_report())
+        return context
+
+    def store_snapshot(self) -> None:
+        """Store the metadata snapshot of the last run (see `FolderInfo.store_snapshot`)."""
+        if self.folder_info:
+            self.folder_info.store_snapshot()
+
+    def get_report(self) -> str:
+        """Return the timings as a human-readable string."""
+        return ", ".join(f"{name}: {t * 1000:.1f} ms" for name, t in self.timings.items())
+
+    def _timed(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def _get_repository(self) -> gitrepository.GitRepository | None:
+        try:
+            return reporegistry.get_repo(self.repo_url, clone_depth=self.clone_depth)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Error fetching repository: %s", e)
+            return None
+
+    def _get_theme(self) -> contexts.ThemeContext:
+        match self.theme:
+            case contexts.ThemeContext():
+                return self.theme
+            case str():
+                from mknodes.theme import theme
+
+                return theme.Theme.get_theme(theme_name=self.theme).context
+            case _:
+                return contexts.ThemeContext()
+
+    def _get_links(self) -> linkprovider.LinkProvider:
+        return linkprovider.LinkProvider(
+            base_url=self.base_url,
+            use_directory_urls=self.use_directory_urls,
+            include_stdlib=True,
+        )
+
+    @staticmethod
+    def _resolve(context: contexts.ProjectContext, path: str) -> Any:
+        name, _, field = path.partition(".")
+        return getattr(getattr(context, name), field)
@@ -0,0 +1,283 @@
+"""Compact, persisted commit history of a git repository."""
+
+from __future__ import annotations
+
+import array
+from collections.abc import Sequence
+import dataclasses
+import datetime as dt
+import os
+import pathlib
+import pickle
+import tempfile
+from typing import TYPE_CHECKING, Any, overload
+
+import git
+
+from mknodes.utils import log
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+logger = log.get_logger(__name__)
+
+STORE_VERSION = 1
+"""Bump this to invalidate all persisted stores."""
+FIELD_SEP = "\x1f"
+RECORD_SEP = "\x1e"
+LOG_FORMAT = f"%H{FIELD_SEP}%an{FIELD_SEP}%ae{FIELD_SEP}%at{FIELD_SEP}%ct{FIELD_SEP}%s{RECORD_SEP}"
+SHA_SIZE = 20
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CommitInfo:
+    """Lightweight commit record (field names follow GitPython's Commit)."""
+
+    hexsha: str
+    """SHA of the commit."""
+    author_name: str
+    """Name of the author."""
+    author_email: str
+    """Email of the author."""
+    authored_date: int
+    """Author timestamp (seconds since epoch)."""
+    committed_date: int
+    """Committer timestamp (seconds since epoch)."""
+    summary: str
+    """First line of the commit message."""
+    tags: tuple[str, ...] = ()
+    """Tags pointing to the commit."""
+
+    @property
+    def authored_datetime(self) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.authored_date, tz=dt.UTC)
+
+    @property
+    def committed_datetime(self) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.committed_date, tz=dt.UTC)
+
+
+class CommitStore(Sequence[CommitInfo]):
+    """Commit history of a revision, newest commit first.
+
+    Commits are stored column-wise: SHAs as raw bytes, timestamps in integer
+    arrays and authors interned. That is a fraction of the memory of GitPython
+    Commit objects, and accessing commits does not need any further git calls.
+
+    The store gets persisted in the git directory, keyed by the revision.
+    When loading, only the commits added since the persisted head get parsed
+    (the whole history is parsed again if the persisted head is no ancestor
+    anymore). Tags are read on each load, since they can change without
+    the history changing.
+    """
+
+    def __init__(self) -> None:
+        self.tags: dict[str, tuple[str, ...]] = {}
+        """Mapping of commit SHA -> tag names."""
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all commits."""
+        self.head: str | None = None
+        """SHA of the newest commit in the store."""
+        # columns, oldest commit first so that new commits can get appended
+        self._shas = bytearray()
+        self._authors: list[tuple[str, str]] = []
+        self._author_ids: dict[tuple[str, str], int] = {}
+        self._author_column = array.array("I")
+        self._authored = array.array("q")
+        self._committed = array.array("q")
+        self._summaries: list[str] = []
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(head={self.head!r}, commits={len(self)})"
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    @overload
+    def __getitem__(self, index: int) -> CommitInfo: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[CommitInfo]: ...
+
+    def __getitem__(self, index: int | slice) -> CommitInfo | list[CommitInfo]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            msg = f"Commit index {index} out of range"
+            raise IndexError(msg)
+        pos = count - 1 - index
+        sha = self._shas[pos * SHA_SIZE : (pos + 1) * SHA_SIZE].hex()
+        name, email = self._authors[self._author_column[pos]]
+        return CommitInfo(
+            hexsha=sha,
+            author_name=name,
+            author_email=email,
+            authored_date=self._authored[pos],
+            committed_date=self._committed[pos],
+            summary=self._summaries[pos],
+            tags=self.tags.get(sha, ()),
+        )
+
+    def __iter__(self) -> Iterator[CommitInfo]:
+        return (self[i] for i in range(len(self)))
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(self.__dict__)
+        del state["_author_ids"], state["tags"]
+        state["version"] = STORE_VERSION
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        if state.pop("version", None) != STORE_VERSION:
+            msg = "Incompatible commit store version"
+            raise ValueError(msg)
+        self.__dict__.update(state)
+        self.tags = {}
+        self._author_ids = {author: i for i, author in enumerate(self._authors)}
+
+    @property
+    def shas(self) -> list[str]:
+        """SHAs of all commits, newest first."""
+        count = len(self)
+        data = self._shas
+        return [data[i * SHA_SIZE : (i + 1) * SHA_SIZE].hex() for i in reversed(range(count))]
+
+    @classmethod
+    def load(
+        cls,
+        repo: git.Repo,
+        rev: str = "HEAD",
+        path: str | os.PathLike[str] | None = None,
+    ) -> CommitStore:
+        """Load the persisted store for given revision and add new commits.
+
+        Args:
+            repo: Repository to get the history from.
+            rev: Revision to get the history for.
+            path: File to persist the store in. Defaults to a file in the git directory.
+        """
+        file = pathlib.Path(path) if path else get_store_path(repo, rev)
+        store: CommitStore | None = None
+        try:
+            store = pickle.loads(file.read_bytes())
+        except FileNotFoundError:
+            pass
+        except Exception:  # noqa: BLE001
+            logger.warning("Could not load commit store %s", file)
+        if store is None:
+            store = cls()
+        if store.update(repo, rev):
+            try:
+                store.save(file)
+            except OSError as e:
+                logger.warning("Could not save commit store %s: %s", file, e)
+        store.tags = get_tags(repo)
+        return store
+
+    def update(self, repo: git.Repo, rev: str = "HEAD") -> int:
+        """Parse the commits added since the last update and return their count.
+
+        Args:
+            repo: Repository to get the history from.
+            rev: Revision to get the history for.
+        """
+        try:
+            head = repo.git.rev_parse(rev)
+        except git.GitCommandError:
+            logger.warning("Could not resolve %r", rev)
+            return 0
+        if head == self.head:
+            return 0
+        revision = head
+        if self.head:
+            try:
+                is_ancestor = repo.is_ancestor(self.head, head)
+            except git.GitCommandError:
+                is_ancestor = False
+            if is_ancestor:
+                revision = f"{self.head}..{head}"
+            else:
+                logger.debug("History of %r changed, parsing all commits", rev)
+                self.clear()
+        output = repo.git.log("--reverse", f"--format={LOG_FORMAT}", revision)
+        count = 0
+        for record in output.split(RECORD_SEP):
+            if record := record.strip("\n"):
+                self._append(*record.split(FIELD_SEP, 5))
+                count += 1
+        self.head = head
+        logger.debug("Added %d commits to commit store of %r", count, rev)
+        return count
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Persist the store.
+
+        Args:
+            path: File to write to.
+        """
+        file = pathlib.Path(path)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        data = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        # write to a temporary file first so that parallel runs never see partial files
+        fd, tmp_name = tempfile.mkstemp(dir=file.parent, suffix=".tmp")
+        tmp_path = pathlib.Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            tmp_path.replace(file)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _append(
+        self,
+        sha: str,
+        name: str,
+        email: str,
+        authored: str,
+        committed: str,
+        summary: str,
+    ) -> None:
+        author = (name, email)
+        if (author_id := self._author_ids.get(author)) is None:
+            author_id = self._author_ids[author] = len(self._authors)
+            self._authors.append(author)
+        self._shas += bytes.fromhex(sha)
+        self._author_column.append(author_id)
+        self._authored.append(int(authored))
+        self._committed.append(int(committed))
+        self._summaries.append(summary)
+
+
+def get_store_path(repo: git.Repo, rev: str) -> pathlib.Path:
+    """Return the default file for persisting the store of given revision.
+
+    Args:
+        repo: The repository.
+        rev: The revision.
+    """
+    name = "".join(c if c.isalnum() else "_" for c in rev)
+    return pathlib.Path(repo.git_dir) / "mknodes" / f"commits-{name}.pickle"
+
+
+def get_tags(repo: git.Repo) -> dict[str, tuple[str, ...]]:
+    """Return a mapping of commit SHA -> names of the tags pointing to it.
+
+    Args:
+        repo: The repository.
+    """
+    fmt = "%(objectname) %(*objectname) %(refname:short)"
+    tags: dict[str, tuple[str, ...]] = {}
+    for line in repo.git.for_each_ref("refs/tags", f"--format={fmt}").splitlines():
+        # annotated tags: the second column is the tagged commit
+        *shas, name = line.split(" ")
+        sha = shas[-1] or shas[0]
+        tags[sha] = (*tags.get(sha, ()), name)
+    return tags
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Self
 
 import yamling
 
@@ -28,6 +28,20 @@ class ConfigFile(superdict.SuperDict[Any]):
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self.path!r})"
 
+    @classmethod
+    def from_data(cls, data: dict[str, Any], path: JoinablePathLike | None = None) -> Self:
+        """Create a config file object from already loaded data without reading the file.
+
+        Args:
+            data: The loaded config data
+            path: Path the data was loaded from
+        """
+        instance = cls.__new__(cls)
+        ConfigFile.__init__(instance)
+        instance._data = data
+        instance.path = str(path or "")
+        return instance
+
     def __bool__(self) -> bool:
         return bool(self._data or self.path)
 
@@ -72,6 +86,24 @@ class TomlFile(ConfigFile):
         self._raw_text = upath.read_text(encoding="utf-8")
         self._data = yamling.load(self._raw_text, mode="toml")
 
+    @classmethod
+    def from_data(
+        cls,
+        data: dict[str, Any],
+        path: JoinablePathLike | None = None,
+        raw_text: str = "",
+    ) -> Self:
+        """Create a config file object from already loaded data without reading the file.
+
+        Args:
+            data: The loaded config data
+            path: Path the data was loaded from
+            raw_text: The raw TOML text
+        """
+        instance = super().from_data(data, path)
+        instance._raw_text = raw_text
+        return instance
+
     @property
     def raw_text(self) -> str:
         """Return raw TOML text (preserves comments)."""
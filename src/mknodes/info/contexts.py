@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import dataclasses
 import pathlib
-from typing import TYPE_CHECKING, Any
+import threading
+import time
+from typing import TYPE_CHECKING, Any, ClassVar, Self
 
 import epregistry
 import githarbor
@@ -15,7 +18,7 @@ from mknodes.utils import log, superdict
 
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Mapping, Sequence
     import datetime
     import types
 
@@ -33,10 +36,98 @@ logger = log.get_logger(__name__)
 DEFAULT_LOADER = jinjarope.FileSystemLoader("docs")
 
 
+class LazyField:
+    """Descriptor resolving a context field on first access.
+
+    Only has an effect for contexts created via `Context.lazy`. Once resolved,
+    the value is stored in the instance dict, which takes precedence over
+    this descriptor, so further lookups have no overhead.
+    """
+
+    def __init__(self, field: dataclasses.Field[Any]) -> None:
+        self.field = field
+
+    def __get__(self, instance: Context | None, owner: type[Context]) -> Any:
+        if instance is None:
+            return self.field.default
+        name = self.field.name
+        if (resolver := instance.__dict__.get("_resolvers", {}).get(name)) is None:
+            return instance.__dict__.setdefault(name, self.get_default())
+        # one lock per field, so that different fields can be resolved concurrently
+        with instance.__dict__["_locks"][name]:
+            if name in instance.__dict__:
+                return instance.__dict__[name]
+            start = time.perf_counter()
+            value = resolver()
+            elapsed = time.perf_counter() - start
+            instance.__dict__["_trace"][name] = elapsed
+            logger.debug("Resolved %s.%s in %.1f ms", owner.__name__, name, elapsed * 1000)
+            instance.__dict__[name] = value
+        return value
+
+    def get_default(self) -> Any:
+        if self.field.default_factory is not dataclasses.MISSING:
+            return self.field.default_factory()
+        return self.field.default
+
+
+def lazy_fields[T: type[Context]](klass: T) -> T:
+    """Class decorator allowing the fields of a context dataclass to be resolved lazily.
+
+    Needs to be applied on top of the dataclass decorator.
+
+    Args:
+        klass: The context dataclass.
+    """
+    for field in dataclasses.fields(klass):
+        setattr(klass, field.name, LazyField(field))
+    klass.supports_lazy_fields = True
+    return klass
+
+
 @dataclasses.dataclass
 class Context:
     """Base class for contexts."""
 
+    supports_lazy_fields: ClassVar[bool] = False
+    """Whether the context can be created via `lazy` (see `lazy_fields`)."""
+
+    @classmethod
+    def lazy(cls, **resolvers: Callable[[], Any]) -> Self:
+        """Create a context resolving its fields on first access.
+
+        Fields without a resolver keep their default value.
+        Which fields were resolved (and how long it took) is available via
+        `resolved_fields`.
+
+        Args:
+            resolvers: Mapping of field name -> callable returning the field value.
+        """
+        if not cls.supports_lazy_fields:
+            msg = f"{cls.__name__} does not support lazy fields"
+            raise TypeError(msg)
+        names = {field.name for field in dataclasses.fields(cls)}
+        if unknown := set(resolvers) - names:
+            msg = f"Unknown fields for {cls.__name__}: {sorted(unknown)}"
+            raise ValueError(msg)
+        instance = cls.__new__(cls)
+        locks = {name: threading.RLock() for name in resolvers}
+        instance.__dict__.update(_resolvers=resolvers, _trace={}, _locks=locks)
+        return instance
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if k != "_locks"}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if "_resolvers" in state:
+            self.__dict__["_locks"] = {name: threading.RLock() for name in state["_resolvers"]}
+
+    @property
+    def resolved_fields(self) -> dict[str, float]:
+        """Lazily resolved fields, mapped to the time it took to resolve them (in s)."""
+        return dict(self.__dict__.get("_trace", {}))
+
     def as_dict(self):
         return {field.name: getattr(self, field.name) for field in dataclasses.fields(self)}
 
@@ -45,6 +136,7 @@ class Context:
         return [i.name for i in dataclasses.fields(self)]
 
 
+@lazy_fields
 @dataclasses.dataclass
 class GitContext(Context):
     """Local repository information."""
@@ -55,6 +147,8 @@ class GitContext(Context):
     """Name of the git folder."""
     commits: list[Any] = dataclasses.field(default_factory=list)
     """List of last commits (Commit objects from `GitPython`)."""
+    commit_store: Sequence[Any] = dataclasses.field(default_factory=list)
+    """Compact commit history, newest first (a `CommitStore` of `CommitInfo` records)."""
     repo_hoster: str = ""
     """Name of the code hoster (for example `GitHub`)"""
     edit_uri: str | None = None
@@ -126,6 +220,7 @@ class ThemeContext(Context):
 #     """Defined in pyproject mknodes section *[pyproject]*"""
 
 
+@lazy_fields
 @dataclasses.dataclass
 class PackageContext(Context):
     """Information about a package."""
@@ -343,41 +438,41 @@ class ProjectContext(Context):
             theme_context: Optional theme context
             kwargs: Keyword arguments to override config values
         """
-        from mknodes.info import folderinfo as fi, linkprovider, reporegistry
+        from mknodes.info import bootstrap
 
         cfg = {k: v for d in args for k, v in d.items()}
         cfg.update(kwargs)
-        links = linkprovider.LinkProvider(
+        context_bootstrap = bootstrap.ContextBootstrap(
+            repo_url=cfg.get("repo_url") or ".",
+            clone_depth=cfg.get("clone_depth", 100),
             base_url=cfg.get("base_url", ""),
             use_directory_urls=cfg.get("use_directory_urls", True),
-            include_stdlib=True,
-        )
-        repo_url = cfg.get("repo_url") or "."
-        clone_depth = cfg.get("clone_depth", 100)
-        try:
-            git_repo = reporegistry.get_repo(repo_url, clone_depth=clone_depth)
-        except Exception as e:  # noqa: BLE001
-            print(f"Error fetching repository: {e}")
-            git_repo = None
-        folderinfo = fi.FolderInfo(git_repo.working_dir if git_repo else ".")
-        return cls(
-            metadata=folderinfo.context,
-            git=folderinfo.git.context,
-            theme=theme_context or ThemeContext(),
-            links=links,
-            env_config=cfg.get("env_config", jinjarope.EnvConfig(loader=DEFAULT_LOADER)),
+            theme=theme_context,
+            env_config=cfg.get("env_config"),
         )
+        return context_bootstrap.run()
 
     async def populate_linkprovider(self) -> None:
         if self.metadata.mkdocs_config is None:
             return
         invs = self.metadata.mkdocs_config.get_inventory_infos()
-        mk_urls = {i["url"]: i.get("base_url") for i in invs if "url" in i}
-        for url, base_url in mk_urls.items():
-            self.links.add_inv_file(url, base_url=base_url)
+        urls: dict[str, str | None] = {i["url"]: i.get("base_url") for i in invs if "url" in i}
         for url in packageregistry.registry.inventory_urls:
-            if url not in mk_urls:
-                self.links.add_inv_file(url)
+            urls.setdefault(url, None)
+        await asyncio.to_thread(self.links.add_inv_files, urls)
+
+    def get_access_trace(self) -> dict[str, float]:
+        """Return the lazily resolved fields of all sub-contexts with their resolve times.
+
+        Keys are dotted paths like `metadata.version`. Useful to find out which
+        (possibly expensive) fields a build actually needed.
+        """
+        return {
+            f"{name}.{field}": elapsed
+            for name in self.fields
+            if isinstance(context := getattr(self, name), Context)
+            for field, elapsed in context.resolved_fields.items()
+        }
 
     def as_dict(self):
         return dict(
@@ -4,6 +4,7 @@ import contextlib
 import dataclasses
 import functools
 import importlib
+import operator
 import pathlib
 import re
 from typing import TYPE_CHECKING
@@ -17,7 +18,9 @@ from mknodes.info import (
     contexts,
     grifferegistry,
     license as lic,
+    metadatasnapshot,
     mkdocsconfigfile,
+    packageinfo,
     packageregistry,
     pyproject,
     reporegistry,
@@ -33,7 +36,6 @@ if TYPE_CHECKING:
     from griffe import Alias
 
     from mknodes.data import commitconventions
-    from mknodes.info import packageinfo
 
 logger = log.get_logger(__name__)
 
@@ -49,6 +51,49 @@ GITHUB_REGEX = re.compile(
 )
 
 
+# PackageContext field -> FolderInfo attribute to resolve it from
+CONTEXT_FIELDS = {
+    "distribution_name": "info.name",
+    "version": "info.version",
+    "author_name": "info.author_name",
+    "author_email": "info.author_email",
+    "docstring_style": "docstring_style",
+    "description": "info.description",
+    "summary": "info.summary",
+    "authors": "info.authors",
+    "module": "module",
+    "griffe_module": "griffe_module",
+    "urls": "info.urls",
+    "classifiers": "info.classifiers",
+    "classifier_map": "info.classifier_map",
+    "keywords": "info.keywords",
+    "license_name": "info.license_name",
+    "license_text": "license_text",
+    "required_python_version": "info.required_python_version",
+    "required_packages": "info.required_packages",
+    "required_package_names": "info.required_package_names",
+    "extras": "extras",
+    "tools": "tools",
+    "entry_points": "info.entry_points",
+    "cli": "info.cli",
+    "cli_info": "info.cli_info",
+    "mkdocs_config": "mkdocs_config",
+    "pyproject_file": "pyproject",
+    "social_info": "social_info",
+    "repository_path": "path",
+    "repository_url": "repository_url",
+    "repository_username": "repository_username",
+    "repository_name": "repository_name",
+    "inventory_url": "inventory_url",
+    "task_runners": "task_runners",
+    "build_system": "pyproject.build_system",
+    "configured_build_systems": "pyproject.configured_build_systems",
+    "tool_section": "pyproject.tool",
+    "commit_types": "pyproject.allowed_commit_types",
+    "package_repos": "package_repos",
+}
+
+
 @dataclasses.dataclass(frozen=True)
 class PackageExtra:
     """A class describing a package extra, used to define additional dependencies."""
@@ -67,37 +112,130 @@ class PackageExtra:
 class FolderInfo:
     """Aggregates information about a working dir."""
 
-    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        snapshot_dir: str | os.PathLike[str] | None = None,
+    ) -> None:
         """Constructor.
 
         Args:
             path: Path to the repo.
+            snapshot_dir: Directory for metadata snapshots. If set, the collected
+                          metadata gets reused on the next run as long as the
+                          involved files did not change. Snapshots get written
+                          by `store_snapshot`.
         """
         # packagehelpers.install_or_import(mod_name)
         self.git = reporegistry.get_repo(path or ".")
         self.path = pathlib.Path(self.git.working_dir)
+        self._temp_directory = None
+        cache = metadatasnapshot.SnapshotCache(snapshot_dir) if snapshot_dir else None
+        self._snapshot_cache: metadatasnapshot.SnapshotCache | None = None
+        if cache and (snapshot := cache.load(self.path)):
+            self._restore_snapshot(snapshot)
+            return
+        self._snapshot_cache = cache
         self.pyproject = pyproject.PyProject(self.path)
         self.mkdocs_config = mkdocsconfigfile.MkDocsConfigFile()
         if (mk_path := self.path / "mkdocs.yml").exists():
             with contextlib.suppress(yamling.YAMLError):
                 self.mkdocs_config = mkdocsconfigfile.MkDocsConfigFile(mk_path)
-        self._temp_directory = None
 
     def __fspath__(self):
         return str(self.path)
 
+    def store_snapshot(self) -> None:
+        """Store a metadata snapshot in the snapshot dir.
+
+        Does nothing if no snapshot dir was set or the metadata was restored
+        from a snapshot. Fields which were not accessed yet get resolved, so this
+        should be called once the metadata got used (like after a build).
+        """
+        if self._snapshot_cache is None:
+            return
+        try:
+            snapshot = self.get_snapshot()
+            dependencies = self._get_snapshot_dependencies()
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Could not create metadata snapshot for %s: %s", self.path, e)
+            return
+        self._snapshot_cache.store(self.path, snapshot, dependencies)
+        self._snapshot_cache = None
+
+    def get_snapshot(self) -> metadatasnapshot.FolderSnapshot:
+        """Return a snapshot of the metadata which is expensive to collect."""
+        return metadatasnapshot.FolderSnapshot(
+            pyproject_path=self.pyproject.path,
+            pyproject_data=dict(self.pyproject),
+            pyproject_text=self.pyproject.raw_text,
+            mkdocs_path=self.mkdocs_config.path,
+            mkdocs_data=dict(self.mkdocs_config),
+            module_name=self.module_name,
+            package_key=packageregistry.registry.get_key(self.info.package_name),
+            package_name=self.info.package_name,
+            package_metadata=self.info.metadata,
+            requires=self.info.requires,
+            tools=[dataclasses.asdict(tool) for tool in self.tools],
+            task_runners=[runner.identifier for runner in self.task_runners],
+        )
+
+    def _restore_snapshot(self, snapshot: metadatasnapshot.FolderSnapshot) -> None:
+        self.pyproject = pyproject.PyProject.from_data(
+            snapshot.pyproject_data,
+            snapshot.pyproject_path,
+            raw_text=snapshot.pyproject_text,
+        )
+        self.mkdocs_config = mkdocsconfigfile.MkDocsConfigFile.from_data(
+            snapshot.mkdocs_data,
+            snapshot.mkdocs_path,
+        )
+        self.module_name = snapshot.module_name
+        if (info := packageregistry.registry.get(snapshot.package_key)) is None:
+            info = packageinfo.PackageInfo.from_metadata(
+                snapshot.package_name,
+                snapshot.package_metadata,
+                snapshot.requires,
+            )
+            packageregistry.registry[snapshot.package_key] = info
+        self.info = info
+        self.tools = [tools.Tool(**dct) for dct in snapshot.tools]
+        self.task_runners = [taskrunners.TASK_RUNNERS[i] for i in snapshot.task_runners]
+
+    def _get_snapshot_dependencies(self) -> list[str | os.PathLike[str]]:
+        """Return the config files the metadata snapshot gets collected from.
+
+        Tool and task runner configs get looked up in the folder and its parents,
+        so every candidate location is included, no matter whether the file exists.
+        This way adding a config file invalidates the snapshot, too.
+        """
+        paths: list[str | os.PathLike[str]] = [
+            self.pyproject.path,
+            self.path / "mkdocs.yml",
+            pathlib.Path(self.git.git_dir) / "config",  # remotes, used for the module name
+        ]
+        filenames = tools.get_config_filenames()
+        filenames += [n for runner in taskrunners.TASK_RUNNERS.values() for n in runner.filenames]
+        folder = self.path.resolve()
+        for parent in [folder, *folder.parents]:
+            paths.extend(parent / name for name in filenames)
+        return paths
+
+    @functools.cached_property
+    def module_name(self) -> str:
+        """Return the name of the module belonging to the repository."""
+        return epregistry.distribution_to_package(self.git.repo_name, fallback=True)
+
     @functools.cached_property
     def module(self) -> types.ModuleType:
         """Return the module itself."""
-        mod_name = epregistry.distribution_to_package(self.git.repo_name, fallback=True)
-        return importlib.import_module(mod_name)
+        return importlib.import_module(self.module_name)
 
     @functools.cached_property
     def griffe_module(self) -> griffe.Module | Alias:
         """Return a griffe Module containing information about the module."""
         # Long-term ideally we would pull all information from here.
-        mod_name = epregistry.distribution_to_package(self.git.repo_name, fallback=True)
-        return grifferegistry.get_module(mod_name)
+        return grifferegistry.get_module(self.module_name)
 
     def __repr__(self) -> str:
         return reprhelpers.get_repr(self, path=self.path)
@@ -242,46 +380,14 @@ class FolderInfo:
 
     @functools.cached_property
     def context(self) -> contexts.PackageContext:
-        return contexts.PackageContext(
-            pretty_name=self.mkdocs_config.get("site_name") or self.info.name,
-            distribution_name=self.info.name,
-            version=self.info.version,
-            author_name=self.info.author_name,
-            author_email=self.info.author_email,
-            docstring_style=self.docstring_style,
-            description=self.info.description,
-            summary=self.info.summary,
-            authors=self.info.authors,
-            module=self.module,
-            griffe_module=self.griffe_module,
-            urls=self.info.urls,
-            classifiers=self.info.classifiers,
-            classifier_map=self.info.classifier_map,
-            keywords=self.info.keywords,
-            license_name=self.info.license_name,
-            license_text=self.license_text,
-            required_python_version=self.info.required_python_version,
-            required_packages=self.info.required_packages,
-            required_package_names=self.info.required_package_names,
-            extras=self.extras,
-            tools=self.tools,
-            entry_points=self.info.entry_points,
-            cli=self.info.cli,
-            cli_info=self.info.cli_info,
-            mkdocs_config=self.mkdocs_config,
-            pyproject_file=self.pyproject,
-            social_info=self.social_info,
-            repository_path=self.path,
-            repository_url=self.repository_url,
-            repository_username=self.repository_username,
-            repository_name=self.repository_name,
-            inventory_url=self.inventory_url,
-            task_runners=self.task_runners,
-            build_system=self.pyproject.build_system,
-            configured_build_systems=self.pyproject.configured_build_systems,
-            tool_section=self.pyproject.tool,
-            commit_types=self.pyproject.allowed_commit_types,
-            package_repos=self.package_repos,
+        """Return a PackageContext which resolves its fields on first access."""
+        resolvers = {
+            name: functools.partial(operator.attrgetter(attr), self)
+            for name, attr in CONTEXT_FIELDS.items()
+        }
+        return contexts.PackageContext.lazy(
+            pretty_name=lambda: self.mkdocs_config.get("site_name") or self.info.name,
+            **resolvers,
         )
 
 
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import functools
+import pathlib
 from typing import TYPE_CHECKING, Any, Self
 
 import git
 from jinjarope import iterfilters
 
-from mknodes.info import contexts
+from mknodes.info import commitstore, contexts
 from mknodes.utils import log, reprhelpers
 
 
@@ -39,7 +40,7 @@ class GitRepository(git.Repo):
             self.remote_repo = Repository(githarbor.BaseRepository())
 
     def __len__(self) -> int:
-        return len(list(self.iter_commits("HEAD")))
+        return int(self.git.rev_list("--count", "HEAD"))
 
     @functools.cached_property
     def main_branch(self) -> str:
@@ -69,7 +70,12 @@ class GitRepository(git.Repo):
 
     @functools.cached_property
     def repo_name(self) -> str:
-        """Name (aka the last part of the url) of the Git repository."""
+        """Name (aka the last part of the url) of the Git repository.
+
+        Falls back to the name of the working dir if there is no origin remote.
+        """
+        if "origin" not in self.remotes:
+            return pathlib.Path(self.working_dir).name
         return self.remotes.origin.url.split(".git")[0].split("/")[-1]
 
     @functools.cached_property
@@ -93,8 +99,40 @@ class GitRepository(git.Repo):
         except gitdb.exc.BadName:
             return None
 
+    @functools.cached_property
+    def version_index(self) -> dict[str, str | None]:
+        """Mapping of commit sha -> version the commit was released with.
+
+        The version of a commit is its own tag or the earliest tag of its descendants
+        (None for unreleased commits). Computed in a single walk over the commit graph
+        of the main branch and HEAD, children before parents.
+        """
+        tag_shas = {commit.hexsha: tag for commit, tag in self.commit_to_tag.items()}
+        ranks = {tag: i for i, tag in enumerate(tag_shas.values())}
+        revs = dict.fromkeys([self.main_branch, "HEAD"])
+        try:
+            output = self.git.rev_list("--topo-order", "--parents", *revs)
+        except git.GitCommandError:
+            logger.warning("Could not walk commits of %r", self.main_branch)
+            output = self.git.rev_list("--topo-order", "--parents", "HEAD")
+        index: dict[str, str | None] = {}
+        # versions handed down from already visited children
+        pending: dict[str, str] = {}
+        for line in output.splitlines():
+            sha, *parents = line.split()
+            inherited = pending.pop(sha, None)
+            version = tag_shas.get(sha, inherited)
+            index[sha] = version
+            if version is None:
+                continue
+            for parent in parents:
+                current = pending.get(parent)
+                if current is None or ranks[version] < ranks[current]:
+                    pending[parent] = version
+        return index
+
     def get_version_for_commit(self, commit: git.Commit | str) -> str | None:
-        """Iterate commit parents to find the associated version of the commit.
+        """Return the version the given commit was released with (see `version_index`).
 
         Args:
             commit: Commit to get a version for.
@@ -102,34 +140,38 @@ class GitRepository(git.Repo):
         commit_obj = self.get_commit(commit) if isinstance(commit, str) else commit
         if commit_obj is None:
             return None
-        mapping = self.commit_to_tag
-        if commit_obj in mapping:
-            return mapping[commit_obj]
-        try:
-            idx = self.all_commits.index(commit_obj)
-            all_commits = list(reversed(self.all_commits[:idx]))
-            return next((mapping[c] for c in all_commits if c in mapping), None)
-        except ValueError:
-            msg = f"Could not get version for {commit_obj}"
-            logger.exception(msg)
-            return None
+        if commit_obj.hexsha not in self.version_index:
+            logger.warning("Could not get version for %s", commit_obj)
+        return self.version_index.get(commit_obj.hexsha)
 
     @functools.cached_property
-    def version_changes(self) -> dict[str, dict[str, list[git.Commit]]]:
+    def version_changes(self) -> dict[str, dict[str, list[commitstore.CommitInfo]]]:
         """Returns a nested dictionary of commits, grouped by version and commit type.
 
+        The commits of the main branch are taken from `branch_commit_store`.
+
         Shape of retuned dict:
-        {"v0.x.x": {"feat": [git.Commit, ...], ...}, ...}
+        {"v0.x.x": {"feat": [CommitInfo, ...], ...}, ...}
         """
-        commits = [i for i in self.all_commits if i not in self.commit_to_tag]
-        groups = iterfilters.groupby(commits, self.get_version_for_commit, natural_sort=True)
+        index = self.version_index
+        commits = [i for i in self.branch_commit_store if not i.tags]
+        groups = iterfilters.groupby(commits, lambda c: index.get(c.hexsha), natural_sort=True)
 
-        def get_commit_group(commit: git.Commit) -> str:
-            assert isinstance(commit.message, str)
-            return commit.message.split(":")[0]
+        def get_commit_group(commit: commitstore.CommitInfo) -> str:
+            return commit.summary.split(":")[0]
 
         return {k: iterfilters.groupby(v, get_commit_group) for k, v in groups.items()}
 
+    @functools.cached_property
+    def commit_store(self) -> commitstore.CommitStore:
+        """Compact history of HEAD, persisted in the git directory and updated incrementally."""
+        return commitstore.CommitStore.load(self)
+
+    @functools.cached_property
+    def branch_commit_store(self) -> commitstore.CommitStore:
+        """Compact history of the main branch (see `commit_store`)."""
+        return commitstore.CommitStore.load(self, self.main_branch)
+
     @functools.cached_property
     def all_commits(self) -> list[git.Commit]:
         return self.get_commits()
@@ -161,28 +203,27 @@ class GitRepository(git.Repo):
 
     @functools.cached_property
     def context(self) -> contexts.GitContext:
-        """Return Git context."""
-        return contexts.GitContext(
-            main_branch=self.main_branch,
-            repo_hoster=self.code_repository,
-            commits=self.all_commits,
-            repo_name=self.repo_name,
-            edit_uri=self.edit_uri,
-            current_sha=self.head.object.hexsha,
-            current_committer=self.head.object.committer.name
-            if isinstance(self.head.object.committer.name, str)
-            else "",
-            # current_committer_mail=self.head.object.committer.email,
-            current_date_committed=self.head.object.committed_datetime,
-            current_author=self.head.object.author.name
-            if isinstance(self.head.object.author.name, str)
-            else "",
-            # current_author_email=self.head.object.author.email,
-            current_date_authored=self.head.object.authored_datetime,
-            last_version=self.get_version_for_commit("HEAD"),
+        """Return Git context, which resolves its fields on first access."""
+        return contexts.GitContext.lazy(
+            main_branch=lambda: self.main_branch,
+            repo_hoster=lambda: self.code_repository,
+            commits=lambda: self.all_commits,
+            commit_store=lambda: self.commit_store,
+            repo_name=lambda: self.repo_name,
+            edit_uri=lambda: self.edit_uri,
+            current_sha=lambda: self.head.object.hexsha,
+            current_committer=lambda: _get_name(self.head.object.committer),
+            current_date_committed=lambda: self.head.object.committed_datetime,
+            current_author=lambda: _get_name(self.head.object.author),
+            current_date_authored=lambda: self.head.object.authored_datetime,
+            last_version=lambda: self.get_version_for_commit("HEAD"),
         )
 
 
+def _get_name(actor: git.Actor) -> str:
+    return actor.name if isinstance(actor.name, str) else ""
+
+
 if __name__ == "__main__":
     repo = GitRepository(".")
     # for commit in repo.get_commits(100):
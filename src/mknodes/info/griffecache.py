@@ -0,0 +1,326 @@
+"""On-disk cache for the Griffe modules of the GriffeRegistry."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import pathlib
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+import epregistry
+import griffe
+
+import mknodes
+from mknodes.utils import log
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+logger = log.get_logger(__name__)
+
+CACHE_VERSION = 2
+"""Bump this to invalidate all existing cache entries."""
+
+MODULE_SUFFIXES = frozenset({".py", ".pyi", ".pyd", ".so"})
+
+
+class SourceLinesCollection(griffe.LinesCollection):
+    """Lines collection which reads source files on first access.
+
+    Modules restored from the cache are not parsed, so their source lines
+    only get read when they are actually needed.
+    """
+
+    def __getitem__(self, key: pathlib.Path) -> list[str]:
+        if key not in self:
+            try:
+                self[key] = key.read_text(encoding="utf-8").splitlines()
+            except (OSError, UnicodeDecodeError) as e:
+                raise KeyError(key) from e
+        return super().__getitem__(key)
+
+
+class ModuleCache:
+    """Stores serialized Griffe modules on disk.
+
+    An entry contains all top-level modules which were loaded for a module
+    (including the ones pulled in by expanding wildcard imports), serialized
+    with Griffe's JSON encoder. It stays valid as long as the distribution
+    versions of these modules, their source files and the module listings of
+    their package folders are unchanged (so added submodules invalidate it).
+    Source files are compared by modification time and size first and by
+    content hash if these differ, so fresh checkouts (CI) can use the cache too.
+
+    Entries get written to a temporary file first and renamed afterwards,
+    so the directory can be shared by parallel builds and worker processes.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike[str]) -> None:
+        """Constructor.
+
+        Args:
+            cache_dir: Directory to store the serialized modules in.
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({os.fspath(self.cache_dir)!r})"
+
+    def get_file(self, module_name: str, expand_wildcards: bool = True) -> pathlib.Path:
+        """Return the cache file for given module.
+
+        Args:
+            module_name: Name of the top-level module.
+            expand_wildcards: Whether wildcard imports got expanded.
+        """
+        griffe_version = get_versions(["griffe"])["griffe"]
+        key = (
+            f"{CACHE_VERSION}:{mknodes.__version__}:{griffe_version}:{sys.version}:"
+            f"{module_name}:{expand_wildcards}"
+        )
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def load(
+        self,
+        module_name: str,
+        docstring_style: griffe.Parser = griffe.Parser.auto,
+        expand_wildcards: bool = True,
+    ) -> griffe.Module | None:
+        """Load the cached module if the cache entry is still valid.
+
+        Args:
+            module_name: Name of the top-level module.
+            docstring_style: Docstring style to parse the docstrings with.
+            expand_wildcards: Whether wildcard imports should be expanded.
+        """
+        file = self.get_file(module_name, expand_wildcards)
+        try:
+            # first line: header with the signature, second line: the modules
+            header_text, _, body = file.read_text(encoding="utf-8").partition("\n")
+            header = json.loads(header_text)
+        except FileNotFoundError:
+            return None
+        except Exception:  # noqa: BLE001
+            logger.warning("Could not load griffe cache entry for %s", module_name)
+            return None
+        versions = header.get("versions", {})
+        if (
+            versions != get_versions(versions)
+            or not is_unchanged(header.get("files", {}))
+            or header.get("folders", {}) != get_folder_listings(header.get("folders", {}))
+        ):
+            logger.debug("Griffe cache entry for %s is outdated", module_name)
+            return None
+        try:
+            modules: list[griffe.Module] = json.loads(body, object_hook=griffe.json_decoder)
+        except Exception:  # noqa: BLE001
+            logger.warning("Could not decode griffe cache entry for %s", module_name)
+            return None
+        collection = griffe.ModulesCollection()
+        lines = SourceLinesCollection()
+        parser = griffe.Parser(docstring_style)
+        for module in modules:
+            collection.set_member(module.name, module)
+            # decoded modules are not attached to any collection, Griffe has no API for it
+            module._lines_collection = lines  # pyright: ignore[reportPrivateUsage]
+            restore_object(module, parser)
+        logger.debug("Using griffe cache entry for %s", module_name)
+        return collection.members.get(module_name)
+
+    def store(
+        self,
+        module_name: str,
+        collection: griffe.ModulesCollection,
+        expand_wildcards: bool = True,
+    ) -> None:
+        """Store all modules of given collection.
+
+        Args:
+            module_name: Name of the top-level module the collection was loaded for.
+            collection: The modules collection of the loader.
+            expand_wildcards: Whether wildcard imports got expanded.
+        """
+        modules = list(collection.members.values())
+        try:
+            body = json.dumps(modules, cls=griffe.JSONEncoder)
+        except Exception:  # noqa: BLE001
+            logger.warning("Could not serialize griffe module %s", module_name)
+            return
+        files = sorted({os.fspath(path) for m in modules for path in iter_source_paths(m)})
+        folders = sorted({os.fspath(path) for m in modules for path in iter_package_folders(m)})
+        header = {
+            "module": module_name,
+            "versions": get_versions(m.name for m in modules),
+            "files": get_file_states(files),
+            "folders": get_folder_listings(folders),
+        }
+        text = f"{json.dumps(header)}\n{body}"
+        # write to a temporary file first so that parallel runs never see partial files
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        pathlib.Path(tmp_name).replace(self.get_file(module_name, expand_wildcards))
+
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        for file in self.cache_dir.glob("*.json"):
+            file.unlink(missing_ok=True)
+
+
+def iter_source_paths(module: griffe.Module) -> Iterator[pathlib.Path]:
+    """Yield the source files / namespace folders of a module and its submodules.
+
+    Args:
+        module: The module.
+    """
+    try:
+        filepath = module.filepath
+    except griffe.BuiltinModuleError:
+        filepath = None
+    match filepath:
+        case list():
+            yield from filepath
+        case pathlib.Path():
+            yield filepath
+    for submodule in module.modules.values():
+        if not submodule.is_alias:
+            yield from iter_source_paths(submodule)  # pyright: ignore[reportArgumentType]
+
+
+def iter_package_folders(module: griffe.Module) -> Iterator[pathlib.Path]:
+    """Yield the folders of a package and its subpackages.
+
+    Args:
+        module: The module.
+    """
+    try:
+        filepath = module.filepath
+    except griffe.BuiltinModuleError:
+        return
+    match filepath:
+        case list():
+            yield from filepath
+        case pathlib.Path() if filepath.stem == "__init__":
+            yield filepath.parent
+        case _:
+            return
+    for submodule in module.modules.values():
+        if not submodule.is_alias:
+            yield from iter_package_folders(submodule)  # pyright: ignore[reportArgumentType]
+
+
+def get_folder_listings(paths: Iterable[str]) -> dict[str, list[str]]:
+    """Return the names of all possible modules / subpackages in given folders.
+
+    Folders which do not exist (anymore) are left out.
+
+    Args:
+        paths: Package folders to list.
+    """
+    listings: dict[str, list[str]] = {}
+    for path in paths:
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            continue
+        listings[path] = sorted(
+            entry.name
+            for entry in entries
+            if (entry.is_dir() and entry.name != "__pycache__")
+            or pathlib.Path(entry.name).suffix in MODULE_SUFFIXES
+        )
+    return listings
+
+
+def get_versions(module_names: Iterable[str]) -> dict[str, str]:
+    """Return a mapping of module name -> version of the distribution providing it.
+
+    Modules which do not belong to a distribution (like stdlib modules) get an empty string.
+
+    Args:
+        module_names: Names of top-level modules.
+    """
+    mapping = epregistry.get_packages_distributions()
+    versions: dict[str, str] = {}
+    for name in module_names:
+        try:
+            versions[name] = importlib.metadata.version(mapping[name][0])
+        except (KeyError, importlib.metadata.PackageNotFoundError):
+            versions[name] = ""
+    return versions
+
+
+def get_file_states(paths: Iterable[str]) -> dict[str, list[Any]]:
+    """Return modification time, size and content hash of given files.
+
+    Args:
+        paths: Files (or folders) to check.
+    """
+    states: dict[str, list[Any]] = {}
+    for path in paths:
+        file = pathlib.Path(path)
+        try:
+            stat = file.stat()
+            digest = hashlib.sha256(file.read_bytes()).hexdigest() if file.is_file() else ""
+        except OSError:
+            continue
+        states[path] = [stat.st_mtime_ns, stat.st_size, digest]
+    return states
+
+
+def is_unchanged(states: dict[str, list[Any]]) -> bool:
+    """Check whether given files are still in the recorded state.
+
+    Files are only hashed if modification time or size changed.
+
+    Args:
+        states: Mapping of path -> [mtime_ns, size, sha256] (see `get_file_states`).
+    """
+    for path, (mtime, size, digest) in states.items():
+        file = pathlib.Path(path)
+        try:
+            stat = file.stat()
+        except OSError:
+            return False
+        if stat.st_mtime_ns == mtime and stat.st_size == size:
+            continue
+        if stat.st_size != size or not file.is_file():
+            return False
+        if hashlib.sha256(file.read_bytes()).hexdigest() != digest:
+            return False
+    return True
+
+
+def restore_object(obj: griffe.Object, parser: griffe.Parser) -> None:
+    """Restore the state of a decoded object and its (non-alias) members.
+
+    The docstring parser is not part of the serialized data, and Griffe's decoder
+    does not attach the names in class bases to the scope they get resolved in.
+
+    Args:
+        obj: The decoded object.
+        parser: The docstring parser.
+    """
+    if obj.docstring:
+        obj.docstring.parser = parser
+    if isinstance(obj, griffe.Class) and obj.parent is not None:
+        for base in obj.bases:
+            if not isinstance(base, griffe.Expr):
+                continue
+            for elem in base:
+                if isinstance(elem, griffe.ExprName):
+                    elem.parent = obj.parent
+                elif isinstance(elem, griffe.ExprAttribute) and isinstance(
+                    elem.first, griffe.ExprName
+                ):
+                    elem.first.parent = obj.parent
+    for member in obj.members.values():
+        if not member.is_alias:
+            restore_object(member, parser)  # pyright: ignore[reportArgumentType]
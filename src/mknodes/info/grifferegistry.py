@@ -13,6 +13,8 @@ from mknodes.utils import log
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    from mknodes.info import griffecache
+
 
 logger = log.get_logger(__name__)
 
@@ -43,6 +45,10 @@ class GriffeRegistry(MutableMapping[str, griffe.Module], metaclass=ABCMeta):
     and then use griffe_module[submodule] or griffe_module[klass] to get the
     griffe instances. That should enable the best cache behaviour.
 
+    If a ModuleCache is set, loaded modules get serialized to disk and are
+    restored from there (instead of being parsed again) by later runs and
+    other processes, as long as their sources did not change.
+
     Examples:
         ``` py
         reg = GriffeRegistry()
@@ -51,13 +57,19 @@ class GriffeRegistry(MutableMapping[str, griffe.Module], metaclass=ABCMeta):
         ```
     """
 
-    def __init__(self, expand_wildcards: bool = True) -> None:
+    def __init__(
+        self,
+        expand_wildcards: bool = True,
+        cache: griffecache.ModuleCache | None = None,
+    ) -> None:
         """Instanciate the registry.
 
         Args:
             expand_wildcards: Whether to expand wildcard imports for the Modules
+            cache: On-disk cache for the loaded modules
         """
         self.expand_wildcards = expand_wildcards
+        self.cache = cache
         self._modules: dict[str, griffe.Module] = {}
 
     def __getitem__(self, value: str) -> griffe.Module:
@@ -78,6 +90,14 @@ class GriffeRegistry(MutableMapping[str, griffe.Module], metaclass=ABCMeta):
     def __len__(self) -> int:
         return len(self._modules)
 
+    def set_cache(self, cache: griffecache.ModuleCache | None) -> None:
+        """Set the on-disk cache for modules loaded from now on (None disables it).
+
+        Args:
+            cache: On-disk cache for the loaded modules
+        """
+        self.cache = cache
+
     def get_module(
         self,
         module: str | types.ModuleType,
@@ -96,17 +116,26 @@ class GriffeRegistry(MutableMapping[str, griffe.Module], metaclass=ABCMeta):
         else:
             module_name, sub_mod_path = module, ""
         if module_name not in self._modules:
-            parser = griffe.Parser(docstring_style)
-            loader = griffe.GriffeLoader(docstring_parser=parser)
-            griffe_mod = loader.load(module_name)
-            assert isinstance(griffe_mod, griffe.Object)
-            if self.expand_wildcards:
-                loader.expand_wildcards(griffe_mod, external=True)  # pyright: ignore[reportUnknownMemberType]
-            assert isinstance(griffe_mod, griffe.Module)
-            self._modules[module_name] = griffe_mod
+            self._modules[module_name] = self._load_module(module_name, docstring_style)
         griffe_mod = self._modules[module_name]
         return griffe_mod[sub_mod_path] if sub_mod_path else griffe_mod
 
+    def _load_module(self, module_name: str, docstring_style: griffe.Parser) -> griffe.Module:
+        if self.cache and (
+            cached := self.cache.load(module_name, docstring_style, self.expand_wildcards)
+        ):
+            return cached
+        parser = griffe.Parser(docstring_style)
+        loader = griffe.GriffeLoader(docstring_parser=parser)
+        griffe_mod = loader.load(module_name)
+        assert isinstance(griffe_mod, griffe.Object)
+        if self.expand_wildcards:
+            loader.expand_wildcards(griffe_mod, external=True)  # pyright: ignore[reportUnknownMemberType]
+        assert isinstance(griffe_mod, griffe.Module)
+        if self.cache:
+            self.cache.store(module_name, loader.modules_collection, self.expand_wildcards)
+        return griffe_mod
+
     def get_class(
         self,
         klass: str | type,
@@ -19,7 +19,7 @@ logger = log.get_logger(__name__)
 
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Mapping, Sequence
     import os
 
     import mknodes as mk
@@ -101,6 +101,14 @@ class LinkProvider:
         """
         self.inv_manager.add_inv_file(path, base_url=base_url)
 
+    def add_inv_files(self, paths: Mapping[str, str | None]) -> None:
+        """Add multiple inventory files, downloading them concurrently.
+
+        Args:
+            paths: Mapping of path / URL -> base URL
+        """
+        self.inv_manager.add_inv_files(paths)
+
     def url_for_module(
         self,
         mod: types.ModuleType | str | griffe.Module,
@@ -0,0 +1,171 @@
+"""Persistent snapshots of the project metadata collected by FolderInfo."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+import pathlib
+import pickle
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+import mknodes
+from mknodes.utils import log
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+logger = log.get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+"""Bump this to invalidate all existing snapshots."""
+
+
+@dataclasses.dataclass
+class FolderSnapshot:
+    """The inputs of a PackageContext which are expensive to collect on each run."""
+
+    pyproject_path: str
+    """Path of the pyproject file."""
+    pyproject_data: dict[str, Any]
+    """Parsed pyproject file."""
+    pyproject_text: str
+    """Raw text of the pyproject file."""
+    mkdocs_path: str
+    """Path of the MkDocs config file (empty if there is none)."""
+    mkdocs_data: dict[str, Any]
+    """Parsed MkDocs config file."""
+    module_name: str
+    """Name of the module belonging to the distribution."""
+    package_key: str
+    """Key of the PackageInfo in the package registry."""
+    package_name: str
+    """Name the PackageInfo was created for."""
+    package_metadata: dict[str, Any]
+    """Distribution metadata (in JSON-compatible form)."""
+    requires: list[str]
+    """Requirement strings of the distribution."""
+    tools: list[dict[str, Any]]
+    """Fields of the detected tools."""
+    task_runners: list[str]
+    """Identifiers of the detected task runners."""
+    signature: dict[str, str] = dataclasses.field(default_factory=dict)
+    """Path -> state of all files and folders the snapshot depends on."""
+
+
+class SnapshotCache:
+    """Stores metadata snapshots of project folders on disk.
+
+    A snapshot stays valid as long as the files it was created from are unchanged
+    (compared by modification time and size, config files also by content hash),
+    no config file got added to the project folder or its parents, and the set of
+    installed distributions did not change (checked via the modification times of
+    the `sys.path` folders).
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike[str]) -> None:
+        """Constructor.
+
+        Args:
+            cache_dir: Directory to store the snapshots in.
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({os.fspath(self.cache_dir)!r})"
+
+    def get_file(self, folder: str | os.PathLike[str]) -> pathlib.Path:
+        """Return the snapshot file for given project folder.
+
+        Args:
+            folder: The project folder.
+        """
+        key = f"{SNAPSHOT_VERSION}:{mknodes.__version__}:{sys.version}:{os.fspath(folder)}"
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.pickle"
+
+    def load(self, folder: str | os.PathLike[str]) -> FolderSnapshot | None:
+        """Load the snapshot for given folder if it is still valid.
+
+        Args:
+            folder: The project folder.
+        """
+        file = self.get_file(folder)
+        try:
+            snapshot: FolderSnapshot = pickle.loads(file.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception:  # noqa: BLE001
+            logger.warning("Could not load metadata snapshot for %s", folder)
+            return None
+        if get_signature(snapshot.signature) != snapshot.signature:
+            logger.debug("Metadata snapshot for %s is outdated", folder)
+            return None
+        logger.debug("Using metadata snapshot for %s", folder)
+        return snapshot
+
+    def store(
+        self,
+        folder: str | os.PathLike[str],
+        snapshot: FolderSnapshot,
+        dependencies: Iterable[str | os.PathLike[str]],
+    ) -> None:
+        """Store a snapshot for given folder.
+
+        Args:
+            folder: The project folder.
+            snapshot: The snapshot to store.
+            dependencies: Files and folders the snapshot was created from.
+        """
+        paths = [*dependencies, *get_environment_paths()]
+        snapshot.signature = get_signature(paths)
+        try:
+            data = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # noqa: BLE001
+            logger.warning("Could not serialize metadata snapshot for %s", folder)
+            return
+        # write to a temporary file first so that parallel runs never see partial files
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        pathlib.Path(tmp_name).replace(self.get_file(folder))
+
+    def clear(self) -> None:
+        """Remove all snapshots."""
+        for file in self.cache_dir.glob("*.pickle"):
+            file.unlink(missing_ok=True)
+
+
+def get_environment_paths() -> list[str]:
+    """Return the folders whose modification times reflect the installed distributions."""
+    folders = (pathlib.Path(p).absolute() for p in sys.path if p)
+    return sorted({os.fspath(folder) for folder in folders if folder.is_dir()})
+
+
+def get_signature(paths: Iterable[str | os.PathLike[str]]) -> dict[str, str]:
+    """Return the current state of given files and folders.
+
+    The state consists of modification time and size. For files, a hash of
+    the content is included as well.
+
+    Args:
+        paths: Files and folders to check.
+    """
+    signature: dict[str, str] = {}
+    for path in paths:
+        key = os.fspath(path)
+        file = pathlib.Path(key)
+        try:
+            stat = file.stat()
+        except OSError:
+            signature[key] = "missing"
+            continue
+        state = f"{stat.st_mtime_ns}:{stat.st_size}"
+        if file.is_file():
+            state += f":{hashlib.sha256(file.read_bytes()).hexdigest()}"
+        signature[key] = state
+    return signature
@@ -4,7 +4,7 @@ import collections
 import contextlib
 import functools
 from importlib import metadata
-from typing import Any
+from typing import Any, Self
 
 import clinspector
 import epregistry
@@ -28,7 +28,32 @@ class PackageInfo:
         self.package_name = pkg_name
         self.distribution = metadata.distribution(pkg_name)
         logger.debug("Loaded package info: '%s'", pkg_name)
-        self.metadata: dict[str, Any] = self.distribution.metadata.json
+        self._set_metadata(self.distribution.metadata.json)
+
+    @classmethod
+    def from_metadata(
+        cls,
+        pkg_name: str,
+        metadata_json: dict[str, Any],
+        requires: list[str],
+    ) -> Self:
+        """Create a PackageInfo from previously collected metadata.
+
+        The distribution only gets looked up when it is accessed.
+
+        Args:
+            pkg_name: Name of the package
+            metadata_json: The distribution metadata (in JSON-compatible form)
+            requires: The requirement strings of the distribution
+        """
+        info = cls.__new__(cls)
+        info.package_name = pkg_name
+        info.requires = requires
+        info._set_metadata(metadata_json)
+        return info
+
+    def _set_metadata(self, metadata_json: dict[str, Any]) -> None:
+        self.metadata: dict[str, Any] = metadata_json
         self.classifiers: list[str] = self.metadata.get("classifier") or []  # type: ignore[assignment]
         self.version: str = self.metadata.get("version") or ""  # type: ignore[assignment]
         self.name: str = self.metadata.get("name") or ""  # type: ignore[assignment]
@@ -41,6 +66,16 @@ class PackageInfo:
     def __hash__(self):
         return hash(self.package_name)
 
+    @functools.cached_property
+    def distribution(self) -> metadata.Distribution:
+        """The distribution object from importlib.metadata."""
+        return metadata.distribution(self.package_name)
+
+    @functools.cached_property
+    def requires(self) -> list[str]:
+        """The requirement strings of the distribution."""
+        return self.distribution.requires or []
+
     @functools.cached_property
     def urls(self) -> structures.CaseInsensitiveDict[str]:
         """A dictionary containing the type of URL and and URL itself.
@@ -67,8 +102,7 @@ class PackageInfo:
 
     @functools.cached_property
     def _required_deps(self) -> list[packagehelpers.Dependency]:
-        requires = self.distribution.requires
-        return [packagehelpers.get_dependency(i) for i in requires] if requires else []
+        return [packagehelpers.get_dependency(i) for i in self.requires]
 
     @functools.cached_property
     def license_name(self) -> str | None:
@@ -171,10 +205,7 @@ class PackageInfo:
     def required_packages(self) -> dict[PackageInfo, packagehelpers.Dependency]:
         from mknodes.info import packageregistry
 
-        requires = self.distribution.requires
-        modules: set[str] = (
-            {packagehelpers.get_dependency(i).name for i in requires} if requires else set()
-        )
+        modules = {packagehelpers.get_dependency(i).name for i in self.requires}
         packages = {}
         for mod in modules:
             with contextlib.suppress(Exception):
@@ -73,13 +73,21 @@ class PackageRegistry(MutableMapping[str, packageinfo.PackageInfo], metaclass=AB
         Args:
             mod_name: Name of the module
         """
-        mapping = epregistry.get_packages_distributions()
-        pkg_name = mapping[mod_name][0] if mod_name in mapping else mod_name
-        pkg_name = pkg_name.lower()
+        pkg_name = self.get_key(mod_name)
         if pkg_name not in self._packages:
             self._packages[pkg_name] = packageinfo.PackageInfo(pkg_name)
         return self._packages[pkg_name]
 
+    def get_key(self, mod_name: str) -> str:
+        """Return the registry key (the lowercased distribution name) for given module.
+
+        Args:
+            mod_name: Name of the module
+        """
+        mapping = epregistry.get_packages_distributions()
+        pkg_name = mapping[mod_name][0] if mod_name in mapping else mod_name
+        return pkg_name.lower()
+
     @property
     def inventory_urls(self) -> set[str]:
         """Return a set of inventory urls for all loaded packages."""
@@ -0,0 +1,100 @@
+"""On-disk bytecode cache for the templates of node environments."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+
+import jinja2
+from jinja2 import bccache
+
+from mknodes.utils import log
+
+
+logger = log.get_logger(__name__)
+
+# environment settings which change the generated code
+ENV_SETTINGS = (
+    "block_start_string",
+    "block_end_string",
+    "variable_start_string",
+    "variable_end_string",
+    "comment_start_string",
+    "comment_end_string",
+    "line_statement_prefix",
+    "line_comment_prefix",
+    "trim_blocks",
+    "lstrip_blocks",
+    "newline_sequence",
+    "keep_trailing_newline",
+    "optimized",
+    "is_async",
+)
+
+
+class TemplateBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """Stores compiled template code in a directory, keyed by template source.
+
+    Jinja keys its bytecode cache by template name and only uses a source
+    checksum to reject outdated entries. Node classes share template names
+    (every nodefile has an `output/markdown/template` entry), so entries get
+    keyed by a hash of the source and the code-relevant environment settings
+    instead. An edited template therefore gets a new entry, outdated entries are
+    never loaded again and can be removed via `clear()`.
+
+    Entries get written to a temporary file first and renamed afterwards,
+    so the directory can be shared by parallel builds and worker processes.
+    The Python and Jinja versions are checked when loading an entry.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        """Constructor.
+
+        Args:
+            directory: Directory to store the compiled templates in.
+        """
+        path = pathlib.Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        super().__init__(os.fspath(path), pattern="%s.jinja")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.directory!r})"
+
+    def get_bucket(
+        self,
+        environment: jinja2.Environment,
+        name: str,
+        filename: str | None,
+        source: str,
+    ) -> bccache.Bucket:
+        key = get_bucket_key(environment, name, filename, source)
+        bucket = bccache.Bucket(environment, key, self.get_source_checksum(source))
+        try:
+            self.load_bytecode(bucket)
+        except Exception:  # noqa: BLE001
+            logger.debug("Could not load bytecode for template %r", name)
+            bucket.reset()
+        return bucket
+
+
+def get_bucket_key(
+    environment: jinja2.Environment,
+    name: str,
+    filename: str | None,
+    source: str,
+) -> str:
+    """Return the cache key for a template.
+
+    Args:
+        environment: Environment compiling the template.
+        name: Name of the template.
+        filename: Path of the template file (if any).
+        source: Template source.
+    """
+    settings = tuple(getattr(environment, attr, None) for attr in ENV_SETTINGS)
+    extensions = sorted(environment.extensions)
+    digest = hashlib.sha256()
+    digest.update(repr((settings, extensions, name, filename)).encode())
+    digest.update(source.encode())
+    return digest.hexdigest()
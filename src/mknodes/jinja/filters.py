@@ -13,35 +13,34 @@ if TYPE_CHECKING:
 
     import mknodes as mk
     from mknodes.info.linkprovider import LinkableType
-    from mknodes.jinja.nodeenvironment import NodeEnvironment
     from mknodes.utils.resources import JSFile, JSText
 
 
-@jinja2.pass_environment
-async def get_link(env: NodeEnvironment, target: LinkableType, title: str | None = None) -> str:
+@jinja2.pass_context
+async def get_link(context: runtime.Context, target: LinkableType, title: str | None = None) -> str:
     """Return a markdown link for given target.
 
     Target can be a class, a module, a MkPage, MkNav or a string.
 
     Args:
-        env: jinja environment
+        context: The template context
         target: The thing to link to
         title: The title to use for the link
     """
-    return await env.node.ctx.links.get_link(target, title)
+    return await context["node"].ctx.links.get_link(target, title)
 
 
-@jinja2.pass_environment
-async def get_url(env: NodeEnvironment, target: LinkableType) -> str:
+@jinja2.pass_context
+async def get_url(context: runtime.Context, target: LinkableType) -> str:
     """Return a markdown link for given target.
 
     Target can be a class, a module, a MkPage, MkNav or a string.
 
     Args:
-        env: jinja environment
+        context: The template context
         target: The thing to link to
     """
-    return await env.node.ctx.links.get_url(target)
+    return await context["node"].ctx.links.get_url(target)
 
 
 async def to_html(node: mk.MkNode) -> str:
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
+import contextvars
+import dataclasses
 import functools
+import hashlib
 import inspect
 import pathlib
+import re
+import threading
 from typing import TYPE_CHECKING, Any
+import weakref
 
 import jinja2
 import jinjarope
@@ -15,7 +22,8 @@ from mknodes.utils import coroutines, log
 
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator, MutableMapping
+    import types
 
     from jinja2.runtime import Context
 
@@ -24,6 +32,188 @@ if TYPE_CHECKING:
 
 logger = log.get_logger(__name__)
 
+JINJA_MARKERS = ("{{", "{%", "{#")
+NEWLINE_REGEX = re.compile(r"(\r\n|\r|\n)")
+TEMPLATE_CACHE_SIZE = 256
+"""Number of compiled template strings to keep (shared by all node environments)."""
+CLASS_ENVIRONMENT_CACHE_SIZE = 512
+"""Number of class environments (node class / context loader pairs) to keep."""
+
+# content hash -> compiled template code
+_compiled_strings: collections.OrderedDict[bytes, types.CodeType] = collections.OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def has_jinja_syntax(text: str) -> bool:
+    """Return True if given text contains Jinja markers and needs to be rendered.
+
+    Args:
+        text: Text to check
+    """
+    return any(marker in text for marker in JINJA_MARKERS)
+
+
+@dataclasses.dataclass
+class _RenderScope:
+    """The node currently rendering, its template globals and the nodes created."""
+
+    node: mk.MkNode
+    globals: MutableMapping[str, Any]
+    rendered_nodes: list[mk.MkNode] = dataclasses.field(default_factory=list)
+
+
+_render_scope: contextvars.ContextVar[_RenderScope | None] = contextvars.ContextVar(
+    "node_render_scope", default=None
+)
+
+
+def _get_parent(ctx: Context) -> mk.MkNode | None:
+    if (scope := _render_scope.get()) is not None:
+        return scope.node
+    return ctx.get("node")
+
+
+def _collect(node: mk.MkNode) -> None:
+    if (scope := _render_scope.get()) is not None:
+        scope.rendered_nodes.append(node)
+
+
+def _make_node_filter(kls_name: str) -> Callable[..., mk.MkNode]:
+    import mknodes as mk
+
+    def wrapped(ctx: Context, *args: Any, **kwargs: Any) -> mk.MkNode:
+        kls = getattr(mk, kls_name)
+        parent = _get_parent(ctx)
+        try:
+            node = kls(*args, parent=parent, **kwargs)
+        except Exception as e:  # noqa: BLE001
+            # Create error message with signature
+            sig = inspect.signature(kls.__init__)
+            params = []
+            for param_name, param in sig.parameters.items():
+                if param_name in ("self", "parent"):
+                    continue
+                if param.kind == inspect.Parameter.VAR_KEYWORD:
+                    params.append(f"**{param_name}")
+                elif param.kind == inspect.Parameter.VAR_POSITIONAL:
+                    params.append(f"*{param_name}")
+                elif param.default is inspect.Parameter.empty:
+                    params.append(f"{param_name}")
+                else:
+                    params.append(f"{param_name}={param.default!r}")
+            signature_str = f"{kls_name}({', '.join(params)})"
+
+            error_msg = (
+                f"Failed to create {kls_name} node in Jinja template.\n"
+                f"Error: {type(e).__name__}: {e}\n"
+                f"Signature: {signature_str}\n"
+                f"Called with args={args!r}, kwargs={kwargs!r}"
+            )
+            logger.error(error_msg)  # noqa: TRY400
+
+            # Create MkText node with error message
+            node = mk.MkText(error_msg, parent=parent)
+        _collect(node)
+        return node
+
+    return jinja2.pass_context(wrapped)
+
+
+def _make_wrapped_class(klass: type[mk.MkNode]) -> type[mk.MkNode]:
+    class _WrappedMkNode(klass):  # type: ignore[valid-type, misc]
+        def __post_init__(self) -> None:
+            if (scope := _render_scope.get()) is not None:
+                self.parent = scope.node
+                scope.rendered_nodes.append(self)
+
+    functools.update_wrapper(_WrappedMkNode, klass, updated=[])
+    # we add <locals> here so that the classes get filtered in iter_subclasses
+    _WrappedMkNode.__qualname__ = "<locals>." + _WrappedMkNode.__qualname__
+    return _WrappedMkNode
+
+
+def _make_scoped_method(name: str, base: jinjarope.Environment) -> Callable[..., Any]:
+    """Wrap an environment method so that it runs in the env of the node rendering."""
+
+    def scoped(*args: Any, **kwargs: Any) -> Any:
+        scope = _render_scope.get()
+        env = scope.node.env if scope is not None else base
+        return getattr(env, name)(*args, **kwargs)
+
+    return scoped
+
+
+@functools.cache
+def get_base_environment() -> jinjarope.Environment:
+    """Return the process-wide environment shared by all NodeEnvironments.
+
+    It holds the filters, globals and the template cache. The node filters and
+    wrapped node classes look up the node currently rendering, so they can be
+    shared as well.
+    """
+    import mknodes as mk
+
+    env = jinjarope.Environment(enable_async=True)
+    node_filters = {name: _make_node_filter(name) for name in mk.__all__}
+    env.filters.update(node_filters)  # pyright: ignore[reportArgumentType]
+    wrapped = {name: _make_wrapped_class(getattr(mk, name)) for name in mk.__all__}
+    env.globals["mk"] = wrapped  # pyright: ignore[reportArgumentType]
+    # these are bound to the base env by jinjarope, which has no node to render for
+    for name in ("render_template", "render_string", "render_file", "evaluate"):
+        env.filters[name] = _make_scoped_method(name, env)
+    env.tests["template"] = _make_scoped_method("__contains__", env)
+    return env
+
+
+def set_bytecode_cache(cache: jinja2.BytecodeCache | None) -> None:
+    """Set the bytecode cache used for templates loaded by node environments.
+
+    Compiled templates then get reused across processes and builds
+    (see `TemplateBytecodeCache`). Pass None to disable the bytecode cache.
+
+    Args:
+        cache: The bytecode cache to use.
+    """
+    get_base_environment().bytecode_cache = cache
+    # class environments copied the old value, recreate them lazily
+    get_class_environment.cache_clear()
+
+
+def get_bytecode_cache() -> jinja2.BytecodeCache | None:
+    """Return the bytecode cache used for templates loaded by node environments."""
+    return get_base_environment().bytecode_cache
+
+
+@functools.lru_cache(maxsize=CLASS_ENVIRONMENT_CACHE_SIZE)
+def get_class_environment(
+    kls: type[mk.MkNode],
+    loader: jinja2.BaseLoader | None = None,
+) -> jinjarope.Environment:
+    """Return the environment loading the templates for given node class.
+
+    Templates get looked up in the nodefile of the class, the given loader
+    (usually from the context config), the folder of the class and via fsspec.
+    Loaded templates are cached in the (shared) template cache of the base
+    environment, the cache key contains the loader.
+
+    Args:
+        kls: Node class
+        loader: Loader of the project context.
+    """
+    path = inspectfilters.get_file(kls)  # type: ignore[arg-type]
+    class_path = pathlib.Path(path or "").parent.as_posix()
+    loaders = [
+        loader or jinjarope.FileSystemLoader("docs/"),
+        jinjarope.FileSystemLoader(class_path),
+        jinjarope.FsSpecProtocolPathLoader(),
+    ]
+    if nodefile := kls.get_nodefile():
+        loaders.insert(0, jinjarope.NestedDictLoader(nodefile._data))
+    base = get_base_environment()
+    env = base.overlay(loader=jinjarope.ChoiceLoader(loaders))
+    env.cache = base.cache
+    return env
+
 
 class NodeEnvironment(jinjarope.Environment):
     """Jinja Node environment.
@@ -33,6 +223,12 @@ class NodeEnvironment(jinjarope.Environment):
     - Sets the parent for the filters
     - Puts node context in jinja namespace
     - collects rendered nodes
+
+    Node environments are cheap overlays of a shared base environment
+    (see `get_base_environment`): compiled templates are shared between all
+    nodes, globals and filters are layered on top of the base ones, so they
+    can get modified per node. The node-specific variables are passed as
+    template globals to every render call (so imported templates see them too).
     """
 
     def __init__(self, node: mk.MkNode, **kwargs: Any) -> None:
@@ -40,104 +236,74 @@ class NodeEnvironment(jinjarope.Environment):
 
         Args:
             node: Node this environment belongs to.
-            kwargs: Optional keyword arguments passed to parent
+            kwargs: Optional environment settings to override
         """
-        super().__init__(enable_async=True, **kwargs)
+        # like jinja2.Environment.overlay, without re-binding extensions
+        base = get_base_environment()
+        self.__dict__.update(base.__dict__)
+        self.overlayed = True
+        self.linked_to = base
+        self.globals = collections.ChainMap({}, base.globals)  # type: ignore[assignment]
+        self.filters = collections.ChainMap({}, base.filters)  # type: ignore[assignment]
+        if kwargs:
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+            # compiled templates depend on the settings, so dont share them
+            self.cache = jinja2.environment.create_cache(400)
+            self.template_cache = weakref.WeakValueDictionary()
+        self._shared_cache = not kwargs
         self.node = node
         self.rendered_nodes: list[mk.MkNode] = list()
         self.rendered_children: list[mk.MkNode] = list()
-
-        import mknodes as mk
-
-        self._node_filters: dict[str, Callable[..., mk.MkNode]] = {}
-        self._wrapped_klasses: dict[str, type[_WrappedMkNode]] = {}
-
-        for kls_name in mk.__all__:
-            klass: Any = getattr(mk, kls_name)
-
-            class _WrappedMkNode(klass):
-                def __post_init__(_self) -> None:  # noqa: N805
-                    _self.parent = self.node
-                    self.rendered_nodes.append(_self)
-
-            functools.update_wrapper(_WrappedMkNode, klass, updated=[])
-            # we add <locals> here so that the classes get filtered in iter_subclasses
-            _WrappedMkNode.__qualname__ = "<locals>." + _WrappedMkNode.__qualname__
-            self._wrapped_klasses[kls_name] = _WrappedMkNode
-
-            def wrapped(
-                ctx: Context,  # pyright: ignore[reportUnusedParameter]
-                *args: Any,
-                kls_name: str = kls_name,
-                **kwargs: Any,
-            ) -> mk.MkNode:
-                kls = getattr(mk, kls_name)
-                try:
-                    node = kls(*args, parent=self.node, **kwargs)
-                    self.rendered_nodes.append(node)
-                except Exception as e:  # noqa: BLE001
-                    # Create error message with signature
-                    sig = inspect.signature(kls.__init__)
-                    params = []
-                    for param_name, param in sig.parameters.items():
-                        if param_name in ("self", "parent"):
-                            continue
-                        if param.kind == inspect.Parameter.VAR_KEYWORD:
-                            params.append(f"**{param_name}")
-                        elif param.kind == inspect.Parameter.VAR_POSITIONAL:
-                            params.append(f"*{param_name}")
-                        elif param.default is inspect.Parameter.empty:
-                            params.append(f"{param_name}")
-                        else:
-                            params.append(f"{param_name}={param.default!r}")
-                    signature_str = f"{kls_name}({', '.join(params)})"
-
-                    error_msg = (
-                        f"Failed to create {kls_name} node in Jinja template.\n"
-                        f"Error: {type(e).__name__}: {e}\n"
-                        f"Signature: {signature_str}\n"
-                        f"Called with args={args!r}, kwargs={kwargs!r}"
-                    )
-                    logger.error(error_msg)  # noqa: TRY400
-
-                    # Create MkText node with error message
-                    error_node = mk.MkText(error_msg, parent=self.node)
-                    self.rendered_nodes.append(error_node)
-                    return error_node
-                else:
-                    return node
-
-            self._node_filters[kls_name] = jinja2.pass_context(wrapped)
         self.setup_environment()
 
     def setup_environment(self) -> None:
-        """Set up the environment by adding node/context specific filters / globals.
+        """Set up the loader for the node class (and the current context)."""
+        self._class_env = get_class_environment(type(self.node), self.node.ctx.env_config.loader)
+        self.loader = self._class_env.loader
+
+    def get_node_variables(self) -> dict[str, Any]:
+        """Return the node-specific template variables."""
+        return {
+            "parent_page": self.node.parent_page,
+            "parent_nav": i[-1] if (i := self.node.parent_navs) else None,
+            "node": self.node,
+            "file": self.node.get_nodefile(),
+            **self.node.ctx.as_dict(),
+        }
+
+    def _load_template(
+        self,
+        name: str,
+        globals: MutableMapping[str, Any] | None,  # noqa: A002
+    ) -> jinja2.Template:
+        if self._shared_cache:
+            # templates are owned (and cached) by the class environment
+            template = self._class_env._load_template(name, globals)
+        else:
+            template = super()._load_template(name, globals)
+        if (scope := _render_scope.get()) is None or scope.node is not self.node:
+            return template
+        # bind the node globals to a copy, the cached template is shared
+        bound = object.__new__(type(template))
+        bound.__dict__.update(template.__dict__)
+        bound.globals = collections.ChainMap(scope.globals, template.globals)
+        bound._module = None  # pyright: ignore[reportPrivateUsage]
+        return bound
 
-        Mainly this adds wrapper functions / classes for all the MkNodes in order
-        to auto-set the node parent (and that way the context) and to collect
-        the rendered nodes.
-        """
-        path = inspectfilters.get_file(self.node.__class__)  # type: ignore[arg-type]
-        class_path = pathlib.Path(path or "").parent.as_posix()
-
-        loaders = [
-            self.node.ctx.env_config.loader or jinjarope.FileSystemLoader("docs/"),
-            jinjarope.FileSystemLoader(class_path),
-            jinjarope.FsSpecProtocolPathLoader(),
-        ]
-        nodefile = self.node.get_nodefile()
-        if nodefile:
-            loader = jinjarope.NestedDictLoader(nodefile._data)
-            loaders.insert(0, loader)
-        self.loader = jinjarope.ChoiceLoader(loaders)
-
-        self.filters.update(self._node_filters)
-        self.globals["parent_page"] = self.node.parent_page  # pyright: ignore[reportArgumentType]
-        self.globals["parent_nav"] = i[-1] if (i := self.node.parent_navs) else None  # pyright: ignore[reportArgumentType]
-        self.globals["node"] = self.node  # pyright: ignore[reportArgumentType]
-        self.globals["file"] = nodefile  # pyright: ignore[reportArgumentType]
-        self.globals["mk"] = self._wrapped_klasses  # pyright: ignore[reportArgumentType]
-        self.globals |= self.node.ctx.as_dict()
+    @contextlib.contextmanager
+    def _bind_node(self) -> Iterator[MutableMapping[str, Any]]:
+        """Bind the node for the duration of a render call, yielding the template globals."""
+        self.setup_environment()
+        node_globals = collections.ChainMap(self.get_node_variables(), self.globals)
+        scope = _RenderScope(self.node, node_globals)
+        token = _render_scope.set(scope)
+        try:
+            yield node_globals
+        finally:
+            _render_scope.reset(token)
+            self.rendered_nodes = scope.rendered_nodes
+            self.rendered_children = [i for i in scope.rendered_nodes if i.parent is self.node]
 
     # def get_extra_paths(self) -> list[str]:
     #     paths = [self.class_path]
@@ -178,18 +344,14 @@ class NodeEnvironment(jinjarope.Environment):
             parent_template: The name of the parent template importing this template
             kwargs: Additional variables for the render call
         """
-        self.rendered_nodes = []
-        self.setup_environment()
-        with self._patch_asyncio_run():
-            result = super().render_template(
+        with self._bind_node(), self._patch_asyncio_run():
+            return super().render_template(
                 template_name,
                 variables=variables,
                 block_name=block_name,
                 parent_template=parent_template,
                 **kwargs,
             )
-        self.rendered_children = [i for i in self.rendered_nodes if i.parent == self.node]
-        return result
 
     async def render_template_async(
         self,
@@ -210,17 +372,14 @@ class NodeEnvironment(jinjarope.Environment):
             parent_template: The name of the parent template importing this template
             kwargs: Additional variables for the render call
         """
-        self.rendered_nodes = []
-        self.setup_environment()
-        result = await super().render_template_async(
-            template_name,
-            variables=variables,
-            block_name=block_name,
-            parent_template=parent_template,
-            **kwargs,
-        )
-        self.rendered_children = [i for i in self.rendered_nodes if i.parent == self.node]
-        return result
+        with self._bind_node():
+            return await super().render_template_async(
+                template_name,
+                variables=variables,
+                block_name=block_name,
+                parent_template=parent_template,
+                **kwargs,
+            )
 
     def render_string(
         self,
@@ -237,12 +396,16 @@ class NodeEnvironment(jinjarope.Environment):
             variables: Extra variables for the environment
             kwargs: Additional variables for the render call
         """
-        self.rendered_nodes = []
-        self.setup_environment()
-        with self._patch_asyncio_run():
-            result = super().render_string(string, variables, **kwargs)
-        self.rendered_children = [i for i in self.rendered_nodes if i.parent == self.node]
-        return result
+        if self._shared_cache and not has_jinja_syntax(string):
+            return self._render_plain(string)
+        variables = (variables or {}) | kwargs
+        with self._bind_node() as node_globals, self._patch_asyncio_run():
+            template = self._from_string(string, node_globals, variables)
+            try:
+                return template.render(**variables)
+            except Exception as e:
+                msg = f"Error when rendering \n{string}\n (extra globals: {variables})"
+                raise RuntimeError(msg) from e
 
     async def render_string_async(
         self,
@@ -259,11 +422,61 @@ class NodeEnvironment(jinjarope.Environment):
             variables: Extra variables for the environment
             kwargs: Additional variables for the render call
         """
+        if self._shared_cache and not has_jinja_syntax(string):
+            return self._render_plain(string)
+        variables = (variables or {}) | kwargs
+        with self._bind_node() as node_globals:
+            template = self._from_string(string, node_globals, variables)
+            try:
+                return await template.render_async(**variables)
+            except Exception as e:
+                msg = f"Error when rendering \n{string}\n (extra globals: {variables})"
+                raise RuntimeError(msg) from e
+
+    def _render_plain(self, string: str) -> str:
+        """Return what Jinja would render for a string without any Jinja syntax."""
         self.rendered_nodes = []
-        self.setup_environment()
-        result = await super().render_string_async(string, variables, **kwargs)
-        self.rendered_children = [i for i in self.rendered_nodes if i.parent == self.node]
-        return result
+        self.rendered_children = []
+        # Jinja normalizes newlines and drops a single trailing one
+        lines = NEWLINE_REGEX.split(string)[::2]
+        if not self.keep_trailing_newline and lines[-1] == "":
+            del lines[-1]
+        return self.newline_sequence.join(lines)
+
+    def _from_string(
+        self,
+        string: str,
+        globals: MutableMapping[str, Any],  # noqa: A002
+        variables: dict[str, Any],
+    ) -> jinja2.Template:
+        """Create a template for given string, reusing compiled code if possible.
+
+        Compiled code is only shared if the environment settings are.
+
+        Args:
+            string: Template source
+            globals: Template globals
+            variables: Render variables (only used for the error message)
+        """
+        key = hashlib.blake2b(string.encode(), digest_size=16).digest()
+        code = None
+        if self._shared_cache:
+            with _compiled_lock:
+                code = _compiled_strings.get(key)
+                if code is not None:
+                    _compiled_strings.move_to_end(key)
+        if code is None:
+            try:
+                code = self.compile(string)
+            except jinja2.TemplateSyntaxError as e:
+                msg = f"Error when evaluating \n{string}\n (extra globals: {variables})"
+                raise SyntaxError(msg) from e
+            if self._shared_cache:
+                with _compiled_lock:
+                    _compiled_strings[key] = code
+                    if len(_compiled_strings) > TEMPLATE_CACHE_SIZE:
+                        _compiled_strings.popitem(last=False)
+        return self.template_class.from_code(self, code, globals, None)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Any, Self
 
 from mknodes.basenodes import mknode
 from mknodes.pages import metadata as metadata_, mkpage, pagetemplate
-from mknodes.utils import inspecthelpers, log, reprhelpers
+from mknodes.utils import inspecthelpers, log, pathhelpers, reprhelpers
 
 
 if TYPE_CHECKING:
@@ -30,6 +30,8 @@ class MkNav(mknode.MkNode):
     """
 
     ICON = "material/navigation-outline"
+    # changes of the nav registry are not tracked
+    RENDER_CACHE = False
 
     def __init__(
         self,
@@ -51,7 +53,7 @@ class MkNav(mknode.MkNode):
 
         self.title = section
         self.filename = filename
-        self.nav = navigation.Navigation()
+        self.nav = navigation.Navigation(on_change=self._notify_changed)
         """Navigation object containing all child items."""
         self.route = navrouter.NavRouter(self)
         """Router used for decorator routing."""
@@ -112,8 +114,7 @@ class MkNav(mknode.MkNode):
     @property
     def resolved_file_path(self) -> str:
         """Returns the resulting section/subsection/../filename.xyz path."""
-        path = "/".join(self.resolved_parts) + "/" + self.filename
-        return path.lstrip("/")
+        return pathhelpers.get_resolved_file_path(self.resolved_parts, self.filename)
 
     def add_nav(self, section: str) -> MkNav:
         """Create a Sub-Nav, register it to given Nav and return it.
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import concurrent.futures
+import dataclasses
 import inspect
 import pathlib
 from typing import TYPE_CHECKING, Any
@@ -10,6 +11,7 @@ from anyenv import run_sync
 from mknodes.basenodes import mklink
 from mknodes.navs import navbuilder
 from mknodes.pages import mkpage
+from mknodes.utils import pathhelpers
 
 
 if TYPE_CHECKING:
@@ -21,6 +23,16 @@ if TYPE_CHECKING:
     type PendingFn = Callable[[], None] | Callable[[], Awaitable[None]]
 
 
+@dataclasses.dataclass
+class NavTree:
+    """Nav dict and literate navs of a whole node tree."""
+
+    nav_dict: dict[str, Any]
+    """Nested dictionary for the MkDocs nav section."""
+    navs: list[tuple[mknav.MkNav, str, str]]
+    """(nav, resolved file path, literate nav) for every nav of the tree, in preorder."""
+
+
 class Navigation:
     """An object representing a website structure.
 
@@ -28,7 +40,19 @@ class Navigation:
     Supports lazy execution of decorated route functions (sync and async).
     """
 
-    def __init__(self, *, max_workers: int | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        on_change: Callable[[], None] | None = None,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            max_workers: Maximum number of threads for executing pending registrations
+            on_change: Callback invoked whenever items get added or removed
+        """
+        self.on_change = on_change
         self._data: dict[tuple[Any, ...], mknav.MkNav | mkpage.MkPage | mklink.MkLink] = {}
         self._index_page: mkpage.MkPage | None = None
         self._pending: list[PendingFn] = []
@@ -70,6 +94,11 @@ class Navigation:
         """Add a pending registration to be executed lazily."""
         self._pending.append(register_fn)
         self._materialized = False
+        self._changed()
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
 
     @property
     def index_page(self) -> mkpage.MkPage | None:
@@ -78,6 +107,7 @@ class Navigation:
     @index_page.setter
     def index_page(self, value: mkpage.MkPage | None) -> None:
         self._index_page = value
+        self._changed()
 
     def __setitem__(
         self,
@@ -88,6 +118,7 @@ class Navigation:
         if isinstance(index, str):
             index = (index,)
         self._data[index] = node
+        self._changed()
 
     def __getitem__(
         self, index: tuple[Any, ...] | str
@@ -102,6 +133,7 @@ class Navigation:
         if isinstance(index, str):
             index = (index,)
         del self._data[index]
+        self._changed()
 
     def __contains__(self, index: tuple[Any, ...] | str) -> bool:
         self._ensure_materialized()
@@ -192,6 +224,53 @@ class Navigation:
         return "".join(nav.build_literate_nav())
 
 
+def build_nav_tree(root: mknav.MkNav) -> NavTree:
+    """Compute the nav dict and the literate navs of all navs in a single pass.
+
+    Equivalent to calling `to_nav_dict` on the root and `to_literate_nav` on every nav,
+    but the resolved paths get passed down while walking the tree instead of being
+    recomputed from the ancestors of every node.
+
+    Args:
+        root: Root nav of the tree.
+    """
+    from mknodes.navs import mknav as mknav_module
+
+    navs: list[tuple[mknav.MkNav, str, str]] = []
+
+    def walk(nav: mknav.MkNav, parts: tuple[str, ...]) -> dict[str, Any]:
+        navigation = nav.nav
+        navigation._ensure_materialized()
+        if nav.title:
+            parts = (*parts, nav.title)
+        path = pathhelpers.get_resolved_file_path(parts, nav.filename)
+        navs.append((nav, path, navigation.to_literate_nav()))
+        dct: dict[str, Any] = {}
+        if idx := navigation._index_page:
+            dct[idx.title] = pathlib.Path(_get_page_path(idx, parts)).as_posix()
+        for path, item in navigation._data.items():
+            data = dct
+            for part in path[:-1]:
+                data = data.setdefault(part, {})
+            match item:
+                case mknav_module.MkNav():
+                    data[path[-1]] = walk(item, parts)
+                case mkpage.MkPage():
+                    data[path[-1]] = _get_page_path(item, parts)
+                case mklink.MkLink():
+                    data[path[-1]] = str(item.target)
+        return dct
+
+    return NavTree(nav_dict=walk(root, ()), navs=navs)
+
+
+def _get_page_path(page: mkpage.MkPage, parts: tuple[str, ...]) -> str:
+    """Return the resolved file path of a page whose parent navs resolve to parts."""
+    if page._is_homepage:
+        return "index.md"
+    return pathhelpers.get_resolved_file_path(parts, page.path)
+
+
 if __name__ == "__main__":
     import mknodes as mk
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from jinjarope import inspectfilters
 
@@ -8,6 +8,10 @@ from mknodes.nodemods import mod, parallax, scrollreveal
 from mknodes.utils import log, reprhelpers, resources
 
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
 logger = log.get_logger(__name__)
 
 
@@ -16,9 +20,18 @@ class ModManager:
         self,
         mods: list[mod.Mod] | None = None,
         css_classes: list[str] | None = None,
+        on_change: Callable[[], None] | None = None,
     ) -> None:
+        """Constructor.
+
+        Args:
+            mods: Mods to add
+            css_classes: CSS classes to add
+            on_change: Callback invoked whenever mods or css classes get added
+        """
         self.mods = mods or []
         self._css_classes = css_classes or []
+        self.on_change = on_change
 
     def __hash__(self):
         return sum(hash(i) for i in self.css_classes)
@@ -35,12 +48,17 @@ class ModManager:
             self._css_classes.append(other)
         else:
             self.mods.append(other)
+        self._changed()
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
 
     def get_resources(self) -> resources.Resources:
-        req = resources.Resources()
+        req = resources.ResourceAccumulator()
         for m in self.mods:
-            req.merge(m.get_resources())
-        return req
+            req.add(m.get_resources())
+        return req.to_resources()
 
     @property
     def css_classes(self) -> list[str]:
@@ -64,7 +82,7 @@ class ModManager:
         for kls in inspectfilters.list_subclasses(mod.Mod):
             if kls.__name__ == "mod_name":
                 instance = kls(**kwargs)
-                self.mods.append(instance)
+                self.append(instance)
                 return instance
         msg = f"Mod {mod_name} does not exist"
         raise ValueError(msg)
@@ -93,7 +111,7 @@ class ModManager:
             delay=delay,
             transition=transition,
         )
-        self.mods.append(effect)
+        self.append(effect)
 
     def add_scroll_effect(
         self,
@@ -119,7 +137,7 @@ class ModManager:
             reset=reset,
             duration=duration,
         )
-        self.mods.append(effect)
+        self.append(effect)
 
 
 if __name__ == "__main__":
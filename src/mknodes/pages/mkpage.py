@@ -141,8 +141,7 @@ class MkPage(mkcontainer.MkContainer):
         """Returns the resulting section/subsection/../filename.xyz path."""
         if self._is_homepage:
             return "index.md"
-        path = "/".join(self.resolved_parts) + "/" + self.path
-        return path.lstrip("/")
+        return pathhelpers.get_resolved_file_path(self.resolved_parts, self.path)
 
     async def get_url(self) -> str:
         return await self.ctx.links.get_url(self)
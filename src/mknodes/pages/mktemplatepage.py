@@ -55,12 +55,12 @@ class MkTemplatePage(mkpage.MkPage):
         )
 
         # Collect resources from rendered children (already created by render above)
-        aggregated = await self._build_node_resources()
+        aggregated = resources.ResourceAccumulator(await self._build_node_resources())
         for child in self.env.rendered_children:
             child_content = await child.get_content()
-            aggregated.merge(child_content.resources)
+            aggregated.add(child_content.resources)
 
-        return resources.NodeContent(markdown=md, resources=aggregated)
+        return resources.NodeContent(markdown=md, resources=aggregated.to_resources())
 
     async def to_md_unprocessed(self) -> str:
         content = await self.get_content()
@@ -9,7 +9,7 @@ from typing import Any, Literal
 from jinjarope import htmlfilters, textfilters, utils
 
 from mknodes.basenodes import mkimage
-from mknodes.utils import log, resources
+from mknodes.utils import coroutines, log, resources
 
 
 logger = log.get_logger(__name__)
@@ -114,17 +114,18 @@ class MkBadge(mkimage.MkImage):
         return f"{color},#fff" if self.use_gitlab_style else f"#fff,{color}"
 
     async def get_data(self) -> str:
-        return await asyncio.to_thread(
-            get_badge,
-            label=self.label,
-            value=self.value,
-            font_size=self.font_size,
-            font_name=self.font_name,
-            num_padding_chars=self.num_padding_chars,
-            badge_color=self.badge_color,
-            text_color=self.text_color,
-            use_gitlab_style=self.use_gitlab_style,
-        )
+        async with coroutines.io_slot(type(self).__name__):
+            return await asyncio.to_thread(
+                get_badge,
+                label=self.label,
+                value=self.value,
+                font_size=self.font_size,
+                font_name=self.font_name,
+                num_padding_chars=self.num_padding_chars,
+                badge_color=self.badge_color,
+                text_color=self.text_color,
+                use_gitlab_style=self.use_gitlab_style,
+            )
 
     @property
     def path(self) -> str:
@@ -10,7 +10,7 @@ from typing import Any, Literal, TYPE_CHECKING
 from git_changelog import cli
 
 from mknodes.basenodes import mktext
-from mknodes.utils import helpers, log, resources
+from mknodes.utils import coroutines, helpers, log, resources
 
 if TYPE_CHECKING:
     import os
@@ -109,14 +109,15 @@ class MkChangelog(mktext.MkText):
             cfg := self.ctx.metadata.pyproject_file.tool.get("git-changelog")
         ):
             filter_commits = cfg.get("filter-commits")
-        return await asyncio.to_thread(
-            get_changelog,
-            repository=str(self.repository),
-            template=self.template,
-            convention=self.convention,
-            sections=tuple(self.sections) if self.sections else None,
-            filter_commits=filter_commits,
-        )
+        async with coroutines.io_slot(type(self).__name__):
+            return await asyncio.to_thread(
+                get_changelog,
+                repository=str(self.repository),
+                template=self.template,
+                convention=self.convention,
+                sections=tuple(self.sections) if self.sections else None,
+                filter_commits=filter_commits,
+            )
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ from typing import Any, TYPE_CHECKING
 from upathtools import to_upath
 
 from mknodes.basenodes import mktext
-from mknodes.utils import log, resources
+from mknodes.utils import coroutines, log, resources
 from anyio import functools as anyio_functools
 
 if TYPE_CHECKING:
@@ -98,12 +98,13 @@ class MkLlm(mktext.MkText):
         context_items = self._process_extra_files()
         combined_context = "\n".join(filter(None, [self._context, *context_items])) or None
 
-        return await complete_llm(
-            self.user_prompt,
-            self.system_prompt or "",
-            model=self._model,
-            context=combined_context or "",
-        )
+        async with coroutines.io_slot(type(self).__name__):
+            return await complete_llm(
+                self.user_prompt,
+                self.system_prompt or "",
+                model=self._model,
+                context=combined_context or "",
+            )
 
 
 if __name__ == "__main__":
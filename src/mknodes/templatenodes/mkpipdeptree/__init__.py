@@ -9,7 +9,7 @@ import types
 from typing import Any, Literal
 
 from mknodes.basenodes import mkdiagram
-from mknodes.utils import helpers, log, resources
+from mknodes.utils import coroutines, helpers, log, resources
 
 
 logger = log.get_logger(__name__)
@@ -119,9 +119,10 @@ class MkPipDepTree(mkdiagram.MkDiagram):
                 return self._package
 
     async def get_mermaid_code(self) -> str:
-        return await asyncio.to_thread(
-            get_mermaid, self.package, local_only=self.local_only, user_only=self.user_only
-        )
+        async with coroutines.io_slot(type(self).__name__):
+            return await asyncio.to_thread(
+                get_mermaid, self.package, local_only=self.local_only, user_only=self.user_only
+            )
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ import types
 from typing import Any, TYPE_CHECKING
 
 from mknodes.basenodes import mknode
-from mknodes.utils import inspecthelpers, log, resources
+from mknodes.utils import coroutines, inspecthelpers, log, resources
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
@@ -108,14 +108,15 @@ class MkPyDeps(mknode.MkNode):
                 return self.ctx.metadata.distribution_name
 
     async def get_svg(self) -> str:
-        content = await asyncio.to_thread(
-            get_dependency_svg,
-            self.module,
-            max_bacon=self.max_bacon,
-            max_module_depth=self.max_module_depth,
-            only_cycles=self.only_cycles,
-            clusters=self.clusters,
-        )
+        async with coroutines.io_slot(type(self).__name__):
+            content = await asyncio.to_thread(
+                get_dependency_svg,
+                self.module,
+                max_bacon=self.max_bacon,
+                max_module_depth=self.max_module_depth,
+                only_cycles=self.only_cycles,
+                clusters=self.clusters,
+            )
         return insert_links(content, self.ctx.links.inv_manager)  # type: ignore  # pyright: ignore[reportArgumentType]
 
     async def to_md_unprocessed(self) -> str:
@@ -3,28 +3,262 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import concurrent.futures
+import contextlib
+import contextvars
+import threading
 from typing import TYPE_CHECKING, Any
+import weakref
 
 
 if TYPE_CHECKING:
-    from collections.abc import Coroutine
+    from collections.abc import AsyncIterator, Coroutine, Iterator
 
 # Store original asyncio.run to avoid recursion when patched
 _original_asyncio_run = asyncio.run
 
+START_TIMEOUT = 0.05
+"""Seconds a runner loop may take to start a coroutine before it counts as blocked."""
+
+
+class LoopRunner:
+    """Runs coroutines on a persistent event loop in a dedicated daemon thread.
+
+    Compared to `asyncio.run`, no event loop (and no thread) needs to be set up
+    per call, so running small coroutines synchronously is cheap.
+    """
+
+    def __init__(self, name: str = "mknodes-loop") -> None:
+        """Constructor.
+
+        Args:
+            name: Name of the thread running the loop.
+        """
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, running={self.is_running})"
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop of this runner (gets started on first access)."""
+        with self._lock:
+            if self._loop is None or not self.is_running:
+                self._loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run_forever,
+                    args=(self._loop, ready),
+                    name=self.name,
+                    daemon=True,
+                )
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    @staticmethod
+    def _run_forever(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def run[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run given coroutine on the loop and block until it is done.
+
+        The coroutine runs within a copy of the current context,
+        so context variables are passed through.
+
+        Args:
+            coro: Coroutine to run.
+        """
+        # the scheduling callback runs in a copy of the calling context,
+        # which the task inherits.
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def try_run[T](
+        self,
+        coro: Coroutine[Any, Any, T],
+        start_timeout: float = START_TIMEOUT,
+    ) -> tuple[bool, T | None]:
+        """Run given coroutine on the loop if the loop starts it in time.
+
+        Returns a tuple of (ran, result).
+
+        Calls from several threads run concurrently on the loop. A coroutine
+        on the loop may block it though (for example by waiting for a thread
+        which calls this method), so if the coroutine does not get started within
+        `start_timeout` seconds, it gets withdrawn and is not run at all.
+
+        Args:
+            coro: Coroutine to run.
+            start_timeout: Seconds to wait for the loop to start the coroutine.
+        """
+        claimed = threading.Lock()
+        started = threading.Event()
+
+        async def run_if_claimed() -> T:
+            if not claimed.acquire(blocking=False):
+                raise asyncio.CancelledError  # withdrawn, coro runs elsewhere
+            started.set()
+            return await coro
+
+        future = asyncio.run_coroutine_threadsafe(run_if_claimed(), self.loop)
+        if not started.wait(start_timeout) and claimed.acquire(blocking=False):
+            # the loop did not get to it, it will cancel the wrapper once it does
+            return False, None
+        return True, future.result()
+
+    def stop(self) -> None:
+        """Stop the loop and wait for the thread to finish."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and thread is not None and thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+
+_runners: list[LoopRunner] = []
+_runners_lock = threading.Lock()
+MAX_RUNNERS = 4
+"""Maximum number of shared loop runners (for nested sync calls)."""
+
+
+_blocked_loops: contextvars.ContextVar[tuple[asyncio.AbstractEventLoop, ...]] = (
+    contextvars.ContextVar("blocked_loops", default=())
+)
+"""Loops waiting for a `run_sync` call further up the call chain."""
+
+
+def get_runner(index: int = 0) -> LoopRunner:
+    """Return the shared loop runner with given index.
+
+    Args:
+        index: Index of the runner.
+    """
+    with _runners_lock:
+        while len(_runners) <= index:
+            _runners.append(LoopRunner(f"mknodes-loop-{len(_runners)}"))
+        return _runners[index]
+
 
 def run_sync[T](coro: Coroutine[Any, Any, T]) -> T:
-    """Run a coroutine synchronously, handling nested event loops."""
+    """Run a coroutine synchronously, handling nested event loops.
+
+    The coroutine runs on a shared, persistent background loop, concurrent
+    calls from several threads share the same loop. That works from plain sync
+    code as well as from within a running event loop. Nested calls (from within
+    a runner loop) use the next runner. A runner loop may also be blocked by
+    code waiting for the current thread (like a thread pool), if it does not
+    start the coroutine in time, the next runner is tried. If no runner is
+    available, the coroutine runs on a private loop instead.
+    """
     try:
-        _loop = asyncio.get_running_loop()
+        loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
     except RuntimeError:
-        # No event loop running, safe to use asyncio.run
+        loop = None
+    blocked = _blocked_loops.get()
+    token = _blocked_loops.set((*blocked, loop)) if loop else None
+    try:
+        for index in range(MAX_RUNNERS):
+            runner = get_runner(index)
+            if runner._loop is loop or runner._loop in blocked:
+                continue
+            ran, result = runner.try_run(coro)
+            if ran:
+                return result  # type: ignore[return-value]
+    finally:
+        if token:
+            _blocked_loops.reset(token)
+    if loop is None:
         return _original_asyncio_run(coro)
-    else:
-        # Already in an event loop - need nest_asyncio or similar
-        # For now, try to create a new loop in a thread
-        import concurrent.futures
-
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            future = pool.submit(_original_asyncio_run, coro)
-            return future.result()
+    # asyncio.run cannot be used in a thread with a running loop
+    ctx = contextvars.copy_context()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(ctx.run, _original_asyncio_run, coro).result()
+
+
+@atexit.register
+def _stop_runners() -> None:
+    for runner in _runners:
+        runner.stop()
+
+
+class IOLimiter:
+    """Bounds concurrent I/O operations, separately for each category.
+
+    Every category (usually a node class name) gets its own semaphore, so that
+    many slow operations of one kind (like LLM calls) cannot starve other
+    I/O-heavy nodes when all pages are scheduled on a single event loop.
+
+    The limiter is passed on to nested `run_sync` calls, which run on other
+    loops. asyncio semaphores are bound to a loop, so every loop gets its own
+    set of semaphores (this also keeps a nested call from waiting for a slot
+    held by the blocked outer call).
+    """
+
+    def __init__(self, limit: int = 8) -> None:
+        """Constructor.
+
+        Args:
+            limit: Maximum number of concurrent operations per category.
+        """
+        self.limit = limit
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(limit={self.limit})"
+
+    def get_semaphore(self, category: str) -> asyncio.Semaphore:
+        """Return the semaphore for given category on the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            if category not in semaphores:
+                semaphores[category] = asyncio.Semaphore(self.limit)
+            return semaphores[category]
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[None]:
+        """Use this limiter for all tasks created within the context."""
+        token = _io_limiter.set(self)
+        try:
+            yield
+        finally:
+            _io_limiter.reset(token)
+
+
+_io_limiter: contextvars.ContextVar[IOLimiter | None] = contextvars.ContextVar(
+    "io_limiter", default=None
+)
+
+
+@contextlib.asynccontextmanager
+async def io_slot(category: str) -> AsyncIterator[None]:
+    """Acquire a slot for an I/O-bound operation of given category.
+
+    This is a no-op unless an IOLimiter is active for the current context.
+
+    Args:
+        category: Category of the operation (usually the node class name)
+    """
+    limiter = _io_limiter.get()
+    if limiter is None:
+        yield
+        return
+    async with limiter.get_semaphore(category):
+        yield
@@ -0,0 +1,202 @@
+"""Stable structural fingerprints for nodes and arbitrary objects."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import pathlib
+import pickle
+import sys
+import types
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from mknodes.basenodes import mknode
+
+
+EXCLUDED_ATTRS = frozenset({
+    "_parent",
+    "_ctx",
+    "env",
+    "_render_cache",
+    "_render_version",
+    "_fingerprint",
+})
+"""Node attributes which do not contribute to the fingerprint."""
+
+_MAX_OBJECT_DEPTH = 6
+
+
+class UnstableFingerprintError(ValueError):
+    """Raised when the state of an object cannot be captured in a fingerprint."""
+
+
+def fingerprint(obj: Any) -> str:
+    """Return a stable string fingerprint for given object.
+
+    MkNodes are fingerprinted by their (cached) structural node fingerprint,
+    modules, classes and module-level functions by their qualified name and source
+    file mtime. Closures and lambdas additionally include their code, defaults and
+    the contents of their closure cells. Objects without accessible state get
+    fingerprinted by their pickled representation.
+
+    Args:
+        obj: Object to fingerprint.
+
+    Raises:
+        UnstableFingerprintError: The object (or a nested one) has no stable
+                                  representation, so it should not be cached.
+    """
+    return _fingerprint(obj, set(), 0)
+
+
+def get_node_fingerprint(node: mknode.MkNode, seen: set[int] | None = None) -> str:
+    """Compute the Merkle-style fingerprint of given node.
+
+    The fingerprint is a hash of the node class and its attributes, where child
+    nodes contribute their own fingerprint. Parent and context do not count,
+    so identical subtrees get the same fingerprint wherever they are located.
+
+    Args:
+        node: Node to fingerprint.
+        seen: Ids of objects currently being fingerprinted (to break cycles).
+    """
+    seen = set() if seen is None else seen
+    kls = type(node)
+    attrs = {k: v for k, v in vars(node).items() if k not in EXCLUDED_ATTRS}
+    # annotations get created lazily (also while rendering), an empty node changes nothing
+    if "annotations" in attrs and not attrs["annotations"]:
+        del attrs["annotations"]
+    seen.add(id(node))
+    try:
+        attr_fingerprint = _fingerprint(attrs, seen, 0)
+    finally:
+        seen.discard(id(node))
+    text = f"{kls.__module__}.{kls.__qualname__}{attr_fingerprint}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _source_stamp(obj: Any) -> str:
+    file = getattr(obj, "__file__", None)
+    if file is None and (code := getattr(obj, "__code__", None)):
+        file = code.co_filename
+    if file is None and (module := getattr(obj, "__module__", None)):
+        file = getattr(sys.modules.get(module), "__file__", None)
+    try:
+        return f"{file}@{pathlib.Path(file).stat().st_mtime_ns}" if file else ""
+    except OSError:
+        return str(file)
+
+
+def _is_module_level(fn: types.FunctionType) -> bool:
+    return fn.__closure__ is None and "<" not in fn.__qualname__
+
+
+def _code_digest(code: types.CodeType, seen: set[int], depth: int) -> str:
+    consts = [
+        _code_digest(c, seen, depth)
+        if isinstance(c, types.CodeType)
+        else _fingerprint(c, seen, depth)
+        for c in code.co_consts
+    ]
+    text = f"{code.co_code.hex()}:{code.co_names}:{','.join(consts)}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _function_state(fn: types.FunctionType, seen: set[int], depth: int) -> str:
+    """Fingerprint what a nested function captured: code, defaults and closure cells."""
+    if id(fn) in seen:
+        return "<ref>"
+    seen.add(id(fn))
+    try:
+        cells = []
+        for cell in fn.__closure__ or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:  # cell not assigned yet
+                cells.append("<empty>")
+                continue
+            cells.append(_fingerprint(value, seen, depth + 1))
+        defaults = _fingerprint([fn.__defaults__, fn.__kwdefaults__], seen, depth + 1)
+        return f"{_code_digest(fn.__code__, seen, depth + 1)}{defaults}[{','.join(cells)}]"
+    finally:
+        seen.discard(id(fn))
+
+
+def _pickle_digest(obj: Any) -> str:
+    try:
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        msg = f"Cannot fingerprint {type(obj).__qualname__} object"
+        raise UnstableFingerprintError(msg) from e
+    return hashlib.sha256(data).hexdigest()
+
+
+def _iter_slots(kls: type) -> tuple[str, ...]:
+    slots = kls.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
+
+
+def _get_state(obj: Any) -> dict[str, Any] | None:
+    """Return the attributes of an object (including slots) or None if there are none."""
+    slots = [
+        name
+        for kls in type(obj).__mro__
+        for name in _iter_slots(kls)
+        if name not in ("__dict__", "__weakref__")
+    ]
+    if not slots:
+        return vars(obj) if hasattr(obj, "__dict__") else None
+    state = dict(getattr(obj, "__dict__", {}))
+    for name in slots:
+        if hasattr(obj, name):
+            state[name] = getattr(obj, name)
+    return state
+
+
+def _fingerprint(obj: Any, seen: set[int], depth: int) -> str:  # noqa: PLR0911
+    from mknodes.basenodes import mknode
+
+    match obj:
+        case None | bool() | int() | float() | str() | bytes():
+            return repr(obj)
+        case types.ModuleType():
+            return f"module:{obj.__name__}:{_source_stamp(obj)}"
+        case type() | types.FunctionType() | types.BuiltinFunctionType() | types.MethodType():
+            name = f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', '')}"
+            text = f"callable:{name}:{_source_stamp(obj)}"
+            if isinstance(obj, types.FunctionType) and not _is_module_level(obj):
+                # captured state (closure cells, defaults) is not part of the name
+                text += f"@{_function_state(obj, seen, depth)}"
+            elif isinstance(obj, types.MethodType):
+                text += f"@{_fingerprint(obj.__self__, seen, depth + 1)}"
+            return text
+    if id(obj) in seen:
+        return "<ref>"
+    if isinstance(obj, mknode.MkNode):
+        return f"node:{obj.get_fingerprint(seen)}"
+    seen.add(id(obj))
+    try:
+        kls_name = f"{type(obj).__module__}.{type(obj).__qualname__}"
+        match obj:
+            case dict():
+                items = sorted((repr(k), _fingerprint(v, seen, depth + 1)) for k, v in obj.items())
+                return f"{kls_name}{{{','.join(f'{k}:{v}' for k, v in items)}}}"
+            case list() | tuple():
+                return f"{kls_name}[{','.join(_fingerprint(i, seen, depth + 1) for i in obj)}]"
+            case set() | frozenset():
+                items = sorted(_fingerprint(i, seen, depth + 1) for i in obj)
+                return f"{kls_name}[{','.join(items)}]"
+        if dataclasses.is_dataclass(obj) and depth < _MAX_OBJECT_DEPTH:
+            # dataclass reprs can be shortened, so use the field values
+            values = {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+            return f"{kls_name}{_fingerprint(values, seen, depth + 1)}"
+        if type(obj).__repr__ is not object.__repr__:
+            return f"{kls_name}:{obj!r}"
+        if depth < _MAX_OBJECT_DEPTH and (state := _get_state(obj)) is not None:
+            return f"{kls_name}{_fingerprint(state, seen, depth + 1)}"
+        # state not accessible (or nested too deeply), the pickle payload captures it
+        return f"{kls_name}#{_pickle_digest(obj)}"
+    finally:
+        seen.discard(id(obj))
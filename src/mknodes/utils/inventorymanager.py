@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import abc
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import io
 import itertools
@@ -214,6 +215,36 @@ class Inventory(BaseInventory):
         return posixpath.join(self.base_url, val.uri)
 
 
+def load_inv_file(
+    path: str | os.PathLike[str],
+    base_url: str | None = None,
+    domains: list[str] | None = None,
+) -> BaseInventory | None:
+    """Load an inventory file from a path or URL.
+
+    Returns None if there is no file at given URL.
+
+    Args:
+        path: Path or URL to the inventory file
+        base_url: Base URL (required when inventory file is local)
+        domains: Domains to include
+    """
+    import urllib.error
+
+    path = str(path)
+    if helpers.is_url(path):
+        logger.debug("Downloading %r...", path)
+        try:
+            return Inventory.from_url(path, base_url=base_url, domains=domains)
+        except urllib.error.HTTPError:
+            logger.debug("No file for %r...", path)
+            return None
+    if base_url:
+        return Inventory.from_file(path, domains=domains, base_url=base_url)
+    msg = "Base URL needed for loading from file."
+    raise ValueError(msg)
+
+
 class InventoryManager(Mapping[str, InventoryItem], metaclass=abc.ABCMeta):
     # TODO: might be worth using collections.ChainMap, or just merging all inv files.
 
@@ -226,23 +257,31 @@ class InventoryManager(Mapping[str, InventoryItem], metaclass=abc.ABCMeta):
         base_url: str | None = None,
         domains: list[str] | None = None,
     ) -> None:
-        import urllib.error
-
-        path = str(path)
-        if helpers.is_url(path):
-            logger.debug("Downloading %r...", path)
-            try:
-                inv = Inventory.from_url(path, base_url=base_url, domains=domains)
-                self.inv_files.append(inv)
-            except urllib.error.HTTPError:
-                logger.debug("No file for %r...", path)
-                return
-        elif base_url:
-            inv = Inventory.from_file(path, domains=domains, base_url=base_url)
+        if (inv := load_inv_file(path, base_url=base_url, domains=domains)) is not None:
             self.inv_files.append(inv)
-        else:
-            msg = "Base URL needed for loading from file."
-            raise ValueError(msg)
+
+    def add_inv_files(
+        self,
+        paths: Mapping[str, str | None],
+        domains: list[str] | None = None,
+        max_workers: int = 8,
+    ) -> None:
+        """Add multiple inventory files, downloading them concurrently.
+
+        The inventories keep the order of the given mapping.
+
+        Args:
+            paths: Mapping of path / URL -> base URL
+            domains: Domains to include
+            max_workers: Maximum number of concurrent downloads
+        """
+
+        def load(item: tuple[str, str | None]) -> BaseInventory | None:
+            return load_inv_file(item[0], base_url=item[1], domains=domains)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            invs = list(pool.map(load, paths.items()))
+        self.inv_files.extend(inv for inv in invs if inv is not None)
 
     def __getitem__(
         self, name: str | type | types.FunctionType | types.MethodType
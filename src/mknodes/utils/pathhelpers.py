@@ -10,6 +10,7 @@ from mknodes.utils.downloadhelpers import download
 
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     import os
 
     import upath
@@ -40,6 +41,16 @@ def find_cfg_for_folder(
     return None
 
 
+def get_resolved_file_path(parts: Sequence[str], filename: str) -> str:
+    """Return the path of a file within the nav sections given by parts.
+
+    Args:
+        parts: Section names (see `MkNode.resolved_parts`)
+        filename: Path of the file relative to the section
+    """
+    return ("/".join(parts) + "/" + filename).lstrip("/")
+
+
 @functools.cache
 def load_file_cached(path: str | os.PathLike[str]) -> str:
     return download(str(path)).decode()
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import abc
 import collections.abc
+import copy
 import dataclasses
 from typing import TYPE_CHECKING, Any, ClassVar, Literal, Self
 
-from jinjarope import iterfilters, serializefilters, utils
+from jinjarope import utils
 
 from mknodes.utils import helpers, reprhelpers
 
@@ -299,6 +300,17 @@ class Resources(collections.abc.Mapping[str, Any], metaclass=abc.ABCMeta):
                     msg = f"Invalid resource type: {type(resource)}"
                     raise ValueError(msg)
 
+    def copy(self) -> Resources:
+        """Return a copy of this bundle which can be changed independently."""
+        return Resources(
+            css=list(self.css),
+            markdown_extensions=copy.deepcopy(self.markdown_extensions),
+            plugins=list(self.plugins),
+            js=list(self.js),
+            assets=list(self.assets),
+            packages=list(self.packages),
+        )
+
     @property
     def js_files(self) -> list[JSText]:
         """All JavaScript files of this resource bundle."""
@@ -327,29 +339,13 @@ class Resources(collections.abc.Mapping[str, Any], metaclass=abc.ABCMeta):
             other: The resources to merge into this one.
             _additive: Merge strategy. Either additive or replace.
         """
-
-        def merge_extensions(
-            dicts: list[dict[str, dict[str, Any]]],
-        ) -> list[dict[str, dict[str, Any]]]:
-            seen: set[str] = set()
-            result: list[dict[str, dict[str, Any]]] = []
-            dicts = [{k: dct[k]} for dct in dicts for k in dct]
-            for dct in dicts:
-                dct = dict(sorted(dct.items()))
-                if (stringed := str(dct)) not in seen:
-                    seen.add(stringed)
-                    result.append(dct)
-            return result
-
-        if other_exts := other["markdown_extensions"]:
-            exts = [self.markdown_extensions, other_exts]
-            merged = merge_extensions(exts)
-            self.markdown_extensions = serializefilters.merge(*merged)
-        self.css = iterfilters.reduce_list(self.css + other["css"])
-        self.plugins = iterfilters.reduce_list(self.plugins + other["plugins"])
-        self.js = iterfilters.reduce_list(self.js + other["js"])
-        self.assets = iterfilters.reduce_list(self.assets + other["assets"])
-        self.packages = iterfilters.reduce_list(self.packages + other["packages"])
+        merged = ResourceAccumulator(self, other).to_resources()
+        self.markdown_extensions = merged.markdown_extensions
+        self.css = merged.css
+        self.plugins = merged.plugins
+        self.js = merged.js
+        self.assets = merged.assets
+        self.packages = merged.packages
         return self
 
 
@@ -357,6 +353,109 @@ CSSType = CSSFile | CSSText
 JSType = JSFile | JSText
 
 
+LIST_FIELDS = ("css", "plugins", "js", "assets", "packages")
+
+
+class ResourceAccumulator:
+    """Merges resource bundles in time proportional to the size of each added bundle.
+
+    List resources are kept in insertion-ordered, hash-based sets. Configs of the
+    same extension get deep-merged, later configs winning (like `Resources.merge`).
+    The merged config of each extension is tracked by a structural hash, so adding
+    a config equal to it is a single comparison.
+
+    Examples:
+        ``` py
+        aggregated = ResourceAccumulator(own_resources)
+        for child_resources in children:
+            aggregated.add(child_resources)
+        merged = aggregated.to_resources()
+        ```
+    """
+
+    def __init__(self, *bundles: collections.abc.Mapping[Hashable, Any] | Resources) -> None:
+        """Constructor.
+
+        Args:
+            bundles: Resource bundles to add initially.
+        """
+        self._extensions: dict[str, dict[str, Any]] = {}
+        self._extension_keys: dict[str, Hashable] = {}
+        self._items: dict[str, dict[Hashable, Any]] = {name: {} for name in LIST_FIELDS}
+        for bundle in bundles:
+            self.add(bundle)
+
+    def __repr__(self) -> str:
+        counts = {k: len(v) for k, v in self._items.items() if v}
+        return reprhelpers.get_repr(self, markdown_extensions=len(self._extensions), **counts)
+
+    def add(self, other: collections.abc.Mapping[Hashable, Any] | Resources) -> Self:
+        """Add a resource bundle.
+
+        Args:
+            other: The resources to add.
+        """
+        for name, config in other["markdown_extensions"].items():
+            key = _get_structural_key(config)
+            if key == self._extension_keys.get(name):
+                continue
+            if (existing := self._extensions.get(name)) is not None:
+                config = _merge_config(existing, config)
+                key = _get_structural_key(config)
+            self._extensions[name] = config
+            self._extension_keys[name] = key
+        for field in LIST_FIELDS:
+            items = self._items[field]
+            for item in other[field]:
+                items.setdefault(_get_item_key(item), item)
+        return self
+
+    def to_resources(self) -> Resources:
+        """Return the accumulated resources as a new Resources instance."""
+        return Resources(
+            markdown_extensions=dict(self._extensions),
+            **{field: list(items.values()) for field, items in self._items.items()},
+        )
+
+
+def _get_item_key(item: Any) -> Hashable:
+    try:
+        hash(item)
+    except TypeError:
+        return (type(item), _get_structural_key(item))
+    return item
+
+
+def _get_structural_key(obj: Any) -> Hashable:
+    """Return a hashable structural representation of (nested) config data."""
+    match obj:
+        case dict():
+            return tuple((k, _get_structural_key(v)) for k, v in sorted(obj.items(), key=str))
+        case list() | tuple():
+            return tuple(_get_structural_key(i) for i in obj)
+        case set() | frozenset():
+            return frozenset(_get_structural_key(i) for i in obj)
+    try:
+        hash(obj)
+    except TypeError:
+        return repr(obj)
+    return obj
+
+
+def _merge_config(target: dict[str, Any], source: dict[str, Any]) -> dict[str, Any]:
+    """Deep-merge source into a copy of target (dicts get merged, lists extended)."""
+    result = dict(target)
+    for k, v in source.items():
+        match result.get(k), v:
+            case dict() as old, dict():
+                result[k] = _merge_config(old, v)
+            case list() as old, list():
+                result[k] = old + [i for i in v if i not in old]
+            case _:
+                result[k] = v
+    return result
+
+
 @dataclasses.dataclass
 class NodeContent:
     """Result of rendering a node - markdown and resources combined."""
@@ -13,3 +13,21 @@ def test_data_dir():
 @pytest.fixture(scope="session")
 def resources_dir():
     return pathlib.Path(__file__).parent.parent / "mknodes/resources/"
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """A project folder containing a pyproject file and a git repo with one commit."""
+    import git
+
+    folder = tmp_path / "project"
+    folder.mkdir()
+    repo = git.Repo.init(folder)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test User")
+        config.set_value("user", "email", "test@example.com")
+    (folder / "pyproject.toml").write_text("[project]\nname = 'mknodes'\n")
+    repo.index.add(["pyproject.toml"])
+    repo.index.commit("feat: initial commit")
+    yield folder
+    repo.close()
@@ -1,8 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+
 import pytest
 
 import mknodes as mk
+from mknodes.basenodes import mknode
+from mknodes.build import (
+    ArchiveExporter,
+    BuildProfiler,
+    DocBuilder,
+    MarkdownExporter,
+    builder,
+    cache,
+)
+from mknodes.info import grifferegistry
+from mknodes.jinja import nodeenvironment
+from mknodes.utils import coroutines
 
 
 def test_build():
@@ -13,5 +29,190 @@ def test_build():
     bld.on_root(nav)
 
 
+async def test_incremental_build(tmp_path):
+    nav = mk.MkNav()
+    page_1 = nav.add_page("Page 1")
+    page_1 += mk.MkText("Some text")
+    page_2 = nav.add_page("Page 2")
+    page_2 += mk.MkAdmonition("Some admonition")
+
+    first = await DocBuilder(cache_dir=tmp_path).build(nav)
+    assert first.cache_stats
+    assert len(first.cache_stats.misses) == 2  # noqa: PLR2004
+    assert not first.cache_stats.hits
+
+    page_2 += mk.MkText("More text")
+    second = await DocBuilder(cache_dir=tmp_path).build(nav)
+    assert second.cache_stats
+    assert second.cache_stats.hits == [page_1.resolved_file_path]
+    assert second.cache_stats.misses == [page_2.resolved_file_path]
+    assert second.files[page_1.resolved_file_path] == first.files[page_1.resolved_file_path]
+
+
+def test_page_key_ignores_head_commit(tmp_path):
+    nav = mk.MkNav()
+    page = nav.add_page("Page")
+    page += mk.MkText("Some text")
+    build_cache = cache.BuildCache(tmp_path)
+    key = build_cache.get_key(page, render_jinja=True)
+    page.ctx.git.current_sha = "0" * 40
+    assert build_cache.get_key(page, render_jinja=True) == key
+
+
+async def test_build_caches_get_restored(tmp_path):
+    nav = mk.MkNav()
+    page = nav.add_page("Page")
+    page += mk.MkText("Some text")
+    doc_builder = DocBuilder(cache_dir=tmp_path)
+    assert nodeenvironment.get_bytecode_cache() is None
+    await doc_builder.build(nav)
+    assert nodeenvironment.get_bytecode_cache() is None
+    assert grifferegistry.registry.cache is None
+    async for _result in DocBuilder(cache_dir=tmp_path).iter_build(nav):
+        assert nodeenvironment.get_bytecode_cache() is not None
+    assert nodeenvironment.get_bytecode_cache() is None
+    assert grifferegistry.registry.cache is None
+
+
+async def test_async_executor_matches_thread_executor():
+    nav = mk.MkNav()
+    for i in range(5):
+        page = nav.add_page(f"Page {i}")
+        page += mk.MkAdmonition(f"Admonition {i}")
+    threaded = await DocBuilder().build(nav)
+    single_loop = await DocBuilder(executor="async", max_workers=2).build(nav)
+    assert single_loop.files == threaded.files
+    assert single_loop.page_count == threaded.page_count
+
+
+class MkSyncBadge(mk.MkText):
+    """Renders a badge via the sync bridge while holding an I/O slot of its category."""
+
+    async def to_md_unprocessed(self) -> str:
+        async with coroutines.io_slot("MkBadge"):
+            return str(mk.MkBadge("build", "passing", parent=self))
+
+
+def test_async_executor_with_sync_rendered_io_nodes():
+    nav = mk.MkNav()
+    for i in range(3):
+        page = nav.add_page(f"Page {i}")
+        page += MkSyncBadge()
+        page += mk.MkBadge("page", str(i))
+    doc_builder = DocBuilder(executor="async", io_concurrency=1)
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(asyncio.run(doc_builder.build(nav))),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(60)
+    assert results, "build deadlocked"
+    assert results[0].page_count == 3  # noqa: PLR2004
+
+
+async def test_streaming_export_matches_export(tmp_path):
+    nav = mk.MkNav()
+    for i in range(3):
+        page = nav.add_page(f"Page {i}")
+        page += mk.MkText(f"Text {i}")
+    exporter = MarkdownExporter()
+    await exporter.export(await DocBuilder().build(nav), tmp_path / "regular")
+    results = DocBuilder(max_workers=2).iter_build(nav)
+    count = await exporter.export_stream(
+        results, tmp_path / "streamed", nav_structure=nav.nav.to_nav_dict()
+    )
+    regular = {p.relative_to(tmp_path / "regular") for p in (tmp_path / "regular").rglob("*")}
+    streamed = {p.relative_to(tmp_path / "streamed") for p in (tmp_path / "streamed").rglob("*")}
+    assert regular == streamed
+    assert count == 4  # 3 pages + root nav  # noqa: PLR2004
+
+
+async def test_profiler(tmp_path):
+    nav = mk.MkNav()
+    page = nav.add_page("Page")
+    page += mk.MkText("Some text")
+    original = mknode.MkNode.get_content
+    with BuildProfiler() as profiler:
+        await DocBuilder().build(nav)
+    assert mknode.MkNode.get_content is original
+    assert profiler.page_stats[page.resolved_file_path].calls == 1
+    assert profiler.node_stats["MkText.to_md_unprocessed"].output_size > 0
+    json_path, stack_path = profiler.write(tmp_path / "profile")
+    assert json_path.exists()
+    assert stack_path.read_text()
+
+
+async def test_incremental_export(tmp_path):
+    nav = mk.MkNav()
+    page_1 = nav.add_page("Page 1")
+    page_1 += mk.MkText("Some text")
+    page_2 = nav.add_page("Page 2")
+    exporter = MarkdownExporter(incremental=True)
+    await exporter.export(await DocBuilder().build(nav), tmp_path)
+    assert not exporter.stats.skipped
+    page_1_file = tmp_path / page_1.resolved_file_path
+    mtime = page_1_file.stat().st_mtime_ns
+    old_page_2_file = tmp_path / page_2.resolved_file_path
+    assert old_page_2_file.exists()
+
+    page_2.title = "Renamed"
+    await exporter.export(await DocBuilder().build(nav), tmp_path)
+    assert page_1_file.stat().st_mtime_ns == mtime
+    assert exporter.stats.skipped
+    assert exporter.stats.deleted == 2  # old page + sidecar  # noqa: PLR2004
+    assert not old_page_2_file.exists()
+    assert (tmp_path / page_2.resolved_file_path).exists()
+
+
+async def test_metadata_index(tmp_path):
+    nav = mk.MkNav()
+    pages = [nav.add_page(f"Page {i}") for i in range(3)]
+    for i, page in enumerate(pages):
+        page += mk.MkTable({"Column": [str(i)]})
+    exporter = MarkdownExporter(metadata_format="index")
+    await exporter.export(await DocBuilder().build(nav), tmp_path)
+    assert not list(tmp_path.rglob("*.meta.yaml"))
+    index = json.loads((tmp_path / ".mknodes.index.json").read_text())
+    assert len(index["files"]) == 4  # 3 pages + root nav  # noqa: PLR2004
+    files = [index["files"][page.resolved_file_path] for page in pages]
+    refs = [file["markdown_extensions"] for file in files]
+    # all pages share the same extensions, so they reference the same entries
+    assert refs[0] == refs[1] == refs[2]
+    page_refs = {i for ids in files[0].values() for i in ids}
+    assert len(index["entries"]) == len(page_refs)
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".tar.gz"])
+async def test_archive_export_is_reproducible(tmp_path, suffix: str):
+    nav = mk.MkNav()
+    for i in range(3):
+        page = nav.add_page(f"Page {i}")
+        page += mk.MkText(f"Text {i}")
+    exporter = ArchiveExporter()
+    await exporter.export(await DocBuilder().build(nav), tmp_path / f"first{suffix}")
+    results = DocBuilder(max_workers=2).iter_build(nav)
+    structure = nav.nav.to_nav_dict()
+    await exporter.export_stream(results, tmp_path / f"second{suffix}", nav_structure=structure)
+    first = (tmp_path / f"first{suffix}").read_bytes()
+    assert first == (tmp_path / f"second{suffix}").read_bytes()
+
+
+def test_partition_pages():
+    nav = mk.MkNav()
+    pages = [nav.add_page(f"Page {i}") for i in range(3)]
+    for section in ["A", "B"]:
+        subnav = nav.add_nav(section)
+        pages += [subnav.add_page(f"Page {i}") for i in range(4)]
+    partitions = builder.partition_pages(pages, 3)
+    assert len(partitions) == 3  # noqa: PLR2004
+    assert sorted(p for part in partitions for p in part) == sorted(
+        page.resolved_file_path for page in pages
+    )
+    # sections stay together as long as they fit into a fair share
+    for part in partitions:
+        assert len({path.split("/")[0] for path in part if "/" in path}) <= 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
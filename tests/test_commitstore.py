@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import pickle
+
+import git
+import pytest
+
+from mknodes.info import commitstore, gitrepository
+
+
+@pytest.fixture
+def repo(git_repo):
+    repository = git.Repo(git_repo)
+    yield repository
+    repository.close()
+
+
+def test_initial_parse(repo, tmp_path):
+    file = tmp_path / "commits.pickle"
+    store = commitstore.CommitStore.load(repo, path=file)
+    assert file.exists()
+    assert len(store) == 1
+    assert store[0].hexsha == repo.head.commit.hexsha
+    assert store[0].summary == "feat: initial commit"
+    assert store[0].author_name == "Test User"
+    assert store[0].author_email == "test@example.com"
+
+
+def test_incremental_update(repo, tmp_path):
+    file = tmp_path / "commits.pickle"
+    commitstore.CommitStore.load(repo, path=file)
+    repo.index.commit("fix: second")
+    repo.index.commit("fix: third")
+    persisted = pickle.loads(file.read_bytes())
+    assert persisted.update(repo) == 2  # noqa: PLR2004
+    store = commitstore.CommitStore.load(repo, path=file)
+    assert [c.summary for c in store] == ["fix: third", "fix: second", "feat: initial commit"]
+    assert store.shas == [c.hexsha for c in repo.iter_commits()]
+
+
+def test_rewritten_history_gets_parsed_again(repo, tmp_path):
+    file = tmp_path / "commits.pickle"
+    repo.index.commit("fix: second")
+    old_sha = commitstore.CommitStore.load(repo, path=file)[0].hexsha
+    repo.git.commit("--amend", "--allow-empty", "-m", "fix: amended")
+    persisted = pickle.loads(file.read_bytes())
+    assert persisted.update(repo) == 2  # noqa: PLR2004
+    store = commitstore.CommitStore.load(repo, path=file)
+    assert [c.summary for c in store] == ["fix: amended", "feat: initial commit"]
+    assert old_sha not in store.shas
+
+
+def test_tags(repo, tmp_path):
+    first = repo.head.commit
+    second = repo.index.commit("fix: second")
+    repo.create_tag("v1.0.0", ref=first)
+    repo.create_tag("v2.0.0", ref=second, message="Release 2.0.0")
+    repo.create_tag("latest", ref=second)
+    store = commitstore.CommitStore.load(repo, path=tmp_path / "commits.pickle")
+    assert store[1].tags == ("v1.0.0",)
+    assert sorted(store[0].tags) == ["latest", "v2.0.0"]
+
+
+def test_getitem(repo, tmp_path):
+    for i in range(3):
+        repo.index.commit(f"fix: commit {i}")
+    store = commitstore.CommitStore.load(repo, path=tmp_path / "commits.pickle")
+    summaries = [c.summary for c in store]
+    assert store[-1].summary == "feat: initial commit"
+    assert store[-4].summary == summaries[0]
+    assert [c.summary for c in store[1:3]] == summaries[1:3]
+    assert [c.summary for c in store[::-1]] == summaries[::-1]
+    assert [c.summary for c in store[-2:]] == summaries[-2:]
+    with pytest.raises(IndexError):
+        store[4]
+    with pytest.raises(IndexError):
+        store[-5]
+
+
+def test_unwritable_store_gets_ignored(repo, tmp_path, monkeypatch):
+    def save(self, path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(commitstore.CommitStore, "save", save)
+    store = commitstore.CommitStore.load(repo, path=tmp_path / "commits.pickle")
+    assert len(store) == 1
+
+
+def test_failed_save_removes_temp_file(repo, tmp_path, monkeypatch):
+    store = commitstore.CommitStore.load(repo, path=tmp_path / "commits.pickle")
+
+    def replace(self, target):
+        raise PermissionError(target)
+
+    monkeypatch.setattr(commitstore.pathlib.Path, "replace", replace)
+    with pytest.raises(PermissionError):
+        store.save(tmp_path / "store" / "commits.pickle")
+    assert not list((tmp_path / "store").iterdir())
+
+
+def test_version_changes(git_repo):
+    repo = gitrepository.GitRepository(git_repo)
+    repo.create_tag("v1.0.0")
+    repo.index.commit("fix: unreleased")
+    changes = repo.version_changes
+    assert [c.summary for c in changes[None]["fix"]] == ["fix: unreleased"]
+    assert "v1.0.0" not in changes  # the only release commit carries the tag
+
+
+def test_git_context_commits(git_repo):
+    repo = gitrepository.GitRepository(git_repo)
+    context = repo.context
+    assert isinstance(context.commits[0], git.Commit)
+    assert context.commits[0].message == "feat: initial commit"
+    assert context.commit_store[0].hexsha == context.commits[0].hexsha
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
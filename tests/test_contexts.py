@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from mknodes.info import bootstrap, contexts
+
+
+def test_lazy_context_resolves_fields_on_access():
+    calls: list[str] = []
+
+    def get_version() -> str:
+        calls.append("version")
+        return "1.0.0"
+
+    context = contexts.PackageContext.lazy(version=get_version)
+    assert not calls
+    assert context.version == "1.0.0"
+    assert context.version == "1.0.0"
+    assert calls == ["version"]
+    assert context.summary == ""
+    assert list(context.resolved_fields) == ["version"]
+    project = contexts.ProjectContext(metadata=context)
+    assert list(project.get_access_trace()) == ["metadata.version"]
+
+
+def test_lazy_context_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="Unknown fields"):
+        contexts.PackageContext.lazy(not_a_field=lambda: None)
+
+
+def test_bootstrap_records_timings():
+    context_bootstrap = bootstrap.ContextBootstrap(prefetch=["metadata.version"])
+    context = context_bootstrap.run()
+    assert "version" in context.metadata.resolved_fields
+    parts = {"repository", "folder", "theme", "links", "metadata.version", "total"}
+    assert parts <= set(context_bootstrap.timings)
+
+
+def test_bootstrap_rejects_invalid_prefetch_fields():
+    with pytest.raises(ValueError, match="Invalid field"):
+        bootstrap.ContextBootstrap(prefetch=["metadata.not_a_field"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+
+import pytest
+
+import mknodes as mk
+from mknodes.utils import coroutines
+
+
+var: contextvars.ContextVar[int] = contextvars.ContextVar("var", default=0)
+
+
+async def get_value() -> int:
+    await asyncio.sleep(0)
+    return var.get()
+
+
+async def get_nested_value() -> int:
+    return coroutines.run_sync(get_value()) + 1
+
+
+def test_run_sync_reuses_loop():
+    coroutines.run_sync(get_value())
+    loop = coroutines.get_runner().loop
+    coroutines.run_sync(get_value())
+    assert coroutines.get_runner().loop is loop
+
+
+async def test_run_sync_within_running_loop():
+    token = var.set(5)
+    try:
+        assert coroutines.run_sync(get_nested_value()) == 6  # noqa: PLR2004
+    finally:
+        var.reset(token)
+
+
+def run_in_thread(fn, timeout: float = 30):
+    """Run given function in a thread and fail instead of hanging forever."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "run_sync deadlocked"
+    return results[0]
+
+
+async def get_value_via_thread() -> int:
+    return await asyncio.to_thread(coroutines.run_sync, get_value())
+
+
+async def get_nested_value_via_thread() -> int:
+    return coroutines.run_sync(get_value_via_thread()) + 1
+
+
+def test_run_sync_nested_across_threads():
+    result = run_in_thread(lambda: coroutines.run_sync(get_nested_value_via_thread()))
+    assert result == 1
+
+
+async def get_loop() -> asyncio.AbstractEventLoop:
+    await asyncio.sleep(0.01)
+    return asyncio.get_running_loop()
+
+
+def test_run_sync_shares_runner_between_threads():
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        loops = set(pool.map(lambda _: coroutines.run_sync(get_loop()), range(8)))
+    assert loops == {coroutines.get_runner().loop}
+
+
+async def get_limited_value() -> int:
+    async with coroutines.io_slot("test"):
+        await asyncio.sleep(0)
+        return 1
+
+
+async def get_nested_limited_value() -> int:
+    async with coroutines.io_slot("test"):
+        return coroutines.run_sync(get_limited_value()) + 1
+
+
+def test_io_limiter_in_nested_sync_call():
+    async def main() -> int:
+        with coroutines.IOLimiter(1).activate():
+            return sum(await asyncio.gather(*(get_nested_limited_value() for _ in range(3))))
+
+    assert run_in_thread(lambda: asyncio.run(main())) == 6  # noqa: PLR2004
+
+
+def test_run_sync_from_nav_route():
+    nav = mk.MkNav("Routed")
+
+    @nav.route.page("Page")
+    def _(page: mk.MkPage):
+        page += str(mk.MkText("Rendered in route"))
+
+    assert run_in_thread(lambda: str(nav))
+    assert "Rendered in route" in str(nav["Page"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -16,10 +16,13 @@ def test_gitrepository():
     assert repo.get_version_for_commit("fdd6a0f6") == "v0.49.5"  # one commit before bump
     assert repo.get_version_for_commit("82b61f02") == "v0.49.5"  # bump commit
     assert repo.get_version_for_commit("0a12a015") == "v0.49.6"  # one commit after bump
+    assert repo.version_index[repo.commit("82b61f02").hexsha] == "v0.49.5"
     assert repo.main_branch == "main"
     assert repo.repo_name == "mknodes"
     assert repo.repo_url == "https://github.com/phil65/mknodes/"
     assert "v0.49.5" in repo.version_changes
+    assert len(repo.commit_store) == len(repo)
+    assert repo.commit_store[0].hexsha == repo.head.commit.hexsha
     # assert repo.code_repository == "GitHub"
     # assert repo.edit_uri == "edit/main/"
 
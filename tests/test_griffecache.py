@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from mknodes.info import griffecache, grifferegistry
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    folder = tmp_path / "cachedpkg"
+    folder.mkdir()
+    (folder / "__init__.py").write_text(
+        '"""Package."""\n\nfrom cachedpkg.sub import *\n\n\n'
+        'class Child(Base):\n    """Child class."""\n'
+    )
+    (folder / "sub.py").write_text(
+        '__all__ = ["Base"]\n\n\nclass Base:\n    """Base class."""\n\n    attr: int = 1\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield folder
+    sys.modules.pop("cachedpkg", None)
+    sys.modules.pop("cachedpkg.sub", None)
+
+
+def test_module_restored_from_cache(package, tmp_path):
+    cache = griffecache.ModuleCache(tmp_path / "cache")
+    loaded = grifferegistry.GriffeRegistry(cache=cache).get_module("cachedpkg")
+    assert cache.get_file("cachedpkg").exists()
+    restored = grifferegistry.GriffeRegistry(cache=cache).get_module("cachedpkg")
+    assert restored is not loaded
+    assert sorted(restored.members) == sorted(loaded.members)
+    assert restored["Base"].docstring.value == "Base class."
+    assert [base.name for base in restored["Child"].resolved_bases] == ["Base"]
+    assert "attr" in restored["Child"].inherited_members
+
+
+def test_cache_entry_invalidated_by_source_changes(package, tmp_path):
+    cache = griffecache.ModuleCache(tmp_path / "cache")
+    grifferegistry.GriffeRegistry(cache=cache).get_module("cachedpkg")
+    (package / "sub.py").write_text('__all__ = ["Base"]\n\n\nclass Base:\n    """Changed."""\n')
+    assert cache.load("cachedpkg") is None
+
+
+def test_cache_entry_invalidated_by_new_submodules(package, tmp_path):
+    cache = griffecache.ModuleCache(tmp_path / "cache")
+    grifferegistry.GriffeRegistry(cache=cache).get_module("cachedpkg")
+    assert cache.load("cachedpkg") is not None
+    (package / "other.py").write_text('"""Other module."""\n')
+    assert cache.load("cachedpkg") is None
+    module = grifferegistry.GriffeRegistry(cache=cache).get_module("cachedpkg")
+    assert "other" in module.modules
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import jinja2
 import pytest
 
 import mknodes as mk
+from mknodes.jinja import bytecodecache, nodeenvironment
 
 
 async def test_if_mknodes_parent_is_set():
@@ -23,5 +25,72 @@ async def test_correct_child_count_after_multiple_renders():
     assert len(env.rendered_nodes) == 1
 
 
+async def test_node_environments_share_base_environment():
+    page_1, page_2 = mk.MkPage(), mk.MkPage()
+    assert page_1.env.filters.maps[-1] is page_2.env.filters.maps[-1]
+    await page_2.env.render_string_async(r"{{ mk.MkText('test') }}")
+    assert page_2.env.rendered_nodes[-1].parent is page_2
+    assert not page_1.env.rendered_nodes
+
+
+@pytest.mark.parametrize("text", ["plain text\n", "a\r\nb\n\n", "", "{ x }"])
+async def test_plain_text_matches_jinja_output(text: str):
+    page = mk.MkPage()
+    assert not nodeenvironment.has_jinja_syntax(text)
+    expected = jinja2.Environment().from_string(text).render()
+    assert await page.env.render_string_async(text) == expected
+
+
+async def test_compiled_strings_get_reused():
+    page = mk.MkPage()
+    text = "{{ 1 + 1 }}"
+    assert await page.env.render_string_async(text) == "2"
+    size = len(nodeenvironment._compiled_strings)
+    assert await mk.MkPage().env.render_string_async(text) == "2"
+    assert len(nodeenvironment._compiled_strings) == size
+
+
+async def test_render_errors_get_wrapped():
+    page = mk.MkPage()
+    with pytest.raises(RuntimeError, match="Error when rendering"):
+        await page.env.render_string_async("{{ 1 / 0 }}")
+    with pytest.raises(RuntimeError, match="Error when rendering"):
+        page.env.render_string("{{ 1 / 0 }}")
+
+
+def test_node_globals_do_not_leak():
+    page = mk.MkPage()
+    page.env.globals["custom"] = "value"
+    page.env.filters["custom"] = str.upper
+    assert "custom" not in mk.MkPage().env.globals
+    assert "custom" not in mk.MkPage().env.filters
+    assert "custom" not in nodeenvironment.get_base_environment().globals
+    assert page.env.render_string("{{ custom | custom }}") == "VALUE"
+
+
+async def test_imported_macros_see_node_variables(tmp_path):
+    file = tmp_path / "macros.jinja"
+    file.write_text("{% macro title() %}{{ node.__class__.__name__ }}{% endmacro %}")
+    page = mk.MkPage()
+    text = f'{{% import "{file.as_uri()}" as macros %}}{{{{ macros.title() }}}}'
+    assert await page.env.render_string_async(text) == "MkPage"
+    assert page.env.render_string(text) == "MkPage"
+
+
+def test_bytecode_cache_is_keyed_by_source(tmp_path):
+    cache = bytecodecache.TemplateBytecodeCache(tmp_path)
+    templates = {"a": "{{ 1 + 1 }}", "b": "{{ 2 + 2 }}"}
+    for source in templates.values():
+        loader = jinja2.DictLoader({"template": source})
+        env = jinja2.Environment(loader=loader, bytecode_cache=cache)
+        env.get_template("template").render()
+    assert len(list(tmp_path.iterdir())) == len(templates)
+    loader = jinja2.DictLoader({"template": templates["a"]})
+    env = jinja2.Environment(loader=loader, bytecode_cache=cache)
+    bucket = cache.get_bucket(env, "template", None, templates["a"])
+    assert bucket.code is not None
+    assert env.get_template("template").render() == "2"
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+from mknodes.info import folderinfo, metadatasnapshot
+
+
+def test_snapshot_gets_invalidated_by_file_changes(git_repo, tmp_path):
+    cache = metadatasnapshot.SnapshotCache(tmp_path / "cache")
+    config = git_repo / "pyproject.toml"
+    snapshot = folderinfo.FolderInfo(git_repo).get_snapshot()
+    cache.store(git_repo, snapshot, [config, git_repo])
+    assert cache.load(git_repo) == snapshot
+    config.write_text("[project]\nname = 'other'\n")
+    assert cache.load(git_repo) is None
+
+
+def test_folderinfo_restored_from_snapshot(git_repo, tmp_path):
+    snapshot_dir = tmp_path / "snapshots"
+    info = folderinfo.FolderInfo(git_repo, snapshot_dir=snapshot_dir)
+    # snapshots are only written on request, so the fields stay lazy
+    assert "module_name" not in vars(info)
+    assert not list(snapshot_dir.iterdir())
+    info.store_snapshot()
+    restored = folderinfo.FolderInfo(git_repo, snapshot_dir=snapshot_dir)
+    assert "module_name" in vars(restored)
+    assert restored.get_snapshot() == info.get_snapshot()
+    assert restored.context.version == info.context.version
+
+
+def test_snapshot_invalidated_by_new_config_file(git_repo, tmp_path):
+    snapshot_dir = tmp_path / "snapshots"
+    folderinfo.FolderInfo(git_repo, snapshot_dir=snapshot_dir).store_snapshot()
+    assert "module_name" in vars(folderinfo.FolderInfo(git_repo, snapshot_dir=snapshot_dir))
+    (git_repo / "Makefile").write_text("help:\n")
+    info = folderinfo.FolderInfo(git_repo, snapshot_dir=snapshot_dir)
+    assert "module_name" not in vars(info)
+    assert [runner.identifier for runner in info.task_runners] == ["makefile"]
+
+
+def test_repo_name_without_origin_remote(git_repo):
+    assert folderinfo.FolderInfo(git_repo).git.repo_name == "project"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pytest
 
 import mknodes as mk
+from mknodes.navs import navigation
 
 
 TREE_NUM_PAGES = 5
@@ -39,6 +40,19 @@ def test_resolved_path():
     assert subsubnav.resolved_parts == ("subsection", "subsubsection")
 
 
+def test_build_nav_tree(test_data_dir):
+    nav = mk.MkNav()
+    nav.parse.file(test_data_dir / "nav_tree/SUMMARY.md")
+    nav.add_page("Index", is_index=True)
+    tree = navigation.build_nav_tree(nav)
+    assert tree.nav_dict == nav.nav.to_nav_dict()
+    navs = [node for _level, node in nav.iter_nodes() if isinstance(node, mk.MkNav)]
+    assert [id(subnav) for subnav, _path, _md in tree.navs] == [id(i) for i in navs]
+    for subnav, path, literate_nav in tree.navs:
+        assert path == subnav.resolved_file_path
+        assert literate_nav == subnav.nav.to_literate_nav()
+
+
 def test_creating_module_document():
     nav = mk.MkNav()
     subnav = nav.add_nav("subsection")
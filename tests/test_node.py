@@ -3,6 +3,9 @@ from __future__ import annotations
 import pytest
 
 import mknodes as mk
+from mknodes.basenodes import mknode
+from mknodes.info import contexts
+from mknodes.utils import fingerprints, resources
 
 
 def test_equality():
@@ -13,5 +16,108 @@ def test_equality():
     assert node_1 == node_2
 
 
+async def test_local_resources_get_rendered_once():
+    nodes = [mk.MkSpeechBubble("test") for _ in range(3)]
+    first = await nodes[0].get_node_resources()
+    assert "env" in nodes[0].__dict__
+    for node in nodes[1:]:
+        assert await node.get_node_resources() == first
+        assert "env" not in node.__dict__
+
+
+def test_resource_cache_key_includes_all_theme_fields():
+    theme = contexts.ThemeContext(name="material")
+    key = mknode._get_theme_key(theme)
+    theme.admonitions.append("custom")
+    assert mknode._get_theme_key(theme) != key
+
+
+async def test_render_cache_invalidation(monkeypatch):
+    monkeypatch.setattr(mk.MkNode, "RENDER_CACHE", True)
+    text = mk.MkText("a")
+    container = mk.MkContainer([text])
+    assert await container.to_markdown() == "a"
+    assert await container.to_markdown() == "a"
+    text.set_text("b")
+    assert await container.to_markdown() == "b"
+    container.append("c")
+    assert await container.to_markdown() == "b\n\nc"
+    text.add_css_class("test")
+    assert "{: .test}" in await container.to_markdown()
+
+
+async def test_render_cache_returns_copies(monkeypatch):
+    monkeypatch.setattr(mk.MkContainer, "RENDER_CACHE", True)
+    text = mk.MkText("a")
+    container = mk.MkContainer([text])
+    content = await container.get_content()
+    content.resources.css.append(resources.CSSText("a {}", "custom.css"))
+    assert not (await container.get_content()).resources.css
+    # the child does not cache itself, but invalidates its caching parent
+    text.set_text("b")
+    assert (await container.get_content()).markdown == "b"
+
+
+async def test_render_cache_disabled_does_not_track_nodes():
+    text = mk.MkText("a")
+    container = mk.MkContainer([text])
+    await container.to_markdown()
+    assert "_render_version" not in text.__dict__
+    assert "_render_version" not in container.__dict__
+
+
+def test_fingerprint():
+    page_1 = mk.MkPage("a", content=[mk.MkText("shared"), mk.MkText("a")])
+    page_2 = mk.MkPage("b", content=[mk.MkText("shared")])
+    shared_1, shared_2 = page_1.get_items()[0], page_2.get_items()[0]
+    assert shared_1.get_fingerprint() == shared_2.get_fingerprint()
+    assert shared_1 == shared_2
+    old = page_1.get_fingerprint()
+    shared_1.set_text("changed")
+    assert shared_1.get_fingerprint() != shared_2.get_fingerprint()
+    assert page_1.get_fingerprint() != old
+
+
+def test_fingerprint_invalidated_by_in_place_mutators():
+    table = mk.MkTable({"a": ["1"]})
+    page = mk.MkPage("page", content=[table])
+    old_table, old_page = table.get_fingerprint(), page.get_fingerprint()
+    table.add_row(["2"])
+    assert table.get_fingerprint() != old_table
+    assert page.get_fingerprint() != old_page
+    nav = mk.MkNav()
+    old_nav = nav.get_fingerprint()
+    nav.add_page("Page")
+    assert nav.get_fingerprint() != old_nav
+
+
+def test_fingerprint_of_closures_differs():
+    def make(value: int):
+        return lambda: value
+
+    first, second = make(1), make(2)
+    assert fingerprints.fingerprint(first) != fingerprints.fingerprint(second)
+    assert fingerprints.fingerprint(first) == fingerprints.fingerprint(make(1))
+
+
+class Opaque:
+    __slots__ = ()
+
+    def __reduce__(self):
+        raise TypeError
+
+
+def test_unstable_fingerprint():
+    assert fingerprints.fingerprint(object()) == fingerprints.fingerprint(object())
+    with pytest.raises(fingerprints.UnstableFingerprintError):
+        fingerprints.fingerprint([Opaque()])
+    node = mk.MkText("text")
+    node.opaque = Opaque()
+    with pytest.raises(fingerprints.UnstableFingerprintError):
+        node.get_fingerprint()
+    assert node == node  # noqa: PLR0124
+    assert hash(node) == hash(node)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
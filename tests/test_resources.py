@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from mknodes.utils import resources
+
+
+def test_accumulator_deduplicates_in_insertion_order():
+    css_a = resources.CSSFile("a.css")
+    css_b = resources.CSSFile("b.css")
+    first = resources.Resources(css=[css_a], markdown_extensions={"tables": {}})
+    second = resources.Resources(css=[css_b, css_a], markdown_extensions={"tables": {}})
+    merged = resources.ResourceAccumulator(first, second).to_resources()
+    assert merged.css == [css_a, css_b]
+    assert merged.markdown_extensions == {"tables": {}}
+
+
+def test_accumulator_merges_differing_extension_configs():
+    first = resources.Resources(markdown_extensions={"toc": {"permalink": True, "a": [1]}})
+    second = resources.Resources(markdown_extensions={"toc": {"title": "TOC", "a": [1, 2]}})
+    merged = resources.ResourceAccumulator(first, second).to_resources()
+    assert merged.markdown_extensions == {"toc": {"permalink": True, "title": "TOC", "a": [1, 2]}}
+
+
+def test_accumulator_keeps_last_config_winning():
+    first = resources.Resources(markdown_extensions={"toc": {"title": "A"}})
+    second = resources.Resources(markdown_extensions={"toc": {"title": "B"}})
+    merged = resources.ResourceAccumulator(first, second, first).to_resources()
+    assert merged.markdown_extensions == {"toc": {"title": "A"}}
+    res = resources.Resources(markdown_extensions={"toc": {"title": "A"}})
+    res.merge(second).merge(first)
+    assert res.markdown_extensions == merged.markdown_extensions
+
+
+def test_merge_uses_accumulator_semantics():
+    res = resources.Resources(packages=[resources.Package("pkg", extras=["x"])])
+    res.merge(resources.Resources(packages=[resources.Package("pkg", extras=["x"])]))
+    assert len(res.packages) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pytest
+
+import mknodes as mk
+
+
+EXPECTED = """| A | Column B |
+| - | -------- |
+| x | y<br>z   |
+"""
+
+
+def test_table():
+    table = mk.MkTable({"A": ["x"], "Column B": ["y\nz"]})
+    assert str(table) == EXPECTED
+
+
+async def test_cells_get_rendered_once():
+    calls = 0
+
+    class CountingText(mk.MkText):
+        async def to_md_unprocessed(self) -> str:
+            nonlocal calls
+            calls += 1
+            return await super().to_md_unprocessed()
+
+    rows = 20
+    table = mk.MkTable({"A": [CountingText(str(i)) for i in range(rows)]})
+    await table.to_markdown()
+    assert calls == rows
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])